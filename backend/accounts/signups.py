@@ -67,6 +67,17 @@ def _normalize_username(username: str) -> str:
 def _user_doc_ref(uid: str):
     return db.collection("users").document(uid)
 
+def _mark_profiles_dirty():
+    """
+    Bump the meta/profiles_dirty_at marker after a users write, so every
+    matching instance rebuilds its index on the next TTL check.
+    """
+    try:
+        db.collection("meta").document("profiles_dirty_at").set({"updated_at": firestore.SERVER_TIMESTAMP})
+    except Exception as e:
+        # Best effort: the index's max age still picks the write up
+        logger.warning(f"Could not update profile change marker: {e}")
+
 def _is_username_taken(username: str) -> bool:
     """
     Checks if a given username already exists in Firestore.
@@ -112,6 +123,7 @@ def create_user_profile(uid: str, name: str, username: str, email: str):
             "birthday": None
         }
         doc_ref.set(profile_data)
+        _mark_profiles_dirty()
         logger.info(f"New user profile created for {name} ({username})")
         log_user_action(logger, uid, "create_profile", {"name": name, "username": username})
         
@@ -432,6 +444,7 @@ def update_user_profile(uid: str, updates: dict):
             raise ValidationError("No valid fields to update")
         
         doc_ref.update(firestore_updates)
+        _mark_profiles_dirty()
         logger.info(f"Profile updated for user {uid}")
         log_user_action(logger, uid, "update_profile", {"fields": list(firestore_updates.keys())})
         
@@ -493,6 +506,7 @@ def promote_user_to_wayfarer(admin_uid: str, target_uid: str):
         
         # Update target user's status
         target_ref.update({"status": "wayfarer"})
+        _mark_profiles_dirty()
         logger.info(f"User {target_uid} promoted to wayfarer by admin {admin_uid}")
         log_user_action(logger, admin_uid, "promote_to_wayfarer", {"target_uid": target_uid})
         
@@ -66,8 +66,8 @@ def generate_map(
         trailheads_geojson = fetch_trailheads_data(lat, lng, radius)
         
         # Log data fetch results for debugging
-        trail_count = len(osm_geojson.get("features", [])) if osm_geojson else 0
-        trailhead_count = len(trailheads_geojson.get("features", [])) if trailheads_geojson else 0
+        trail_count = len(osm_geojson["features"])
+        trailhead_count = len(trailheads_geojson["features"])
         logger.debug(f"Map request: lat={lat}, lng={lng}, radius={radius}km")
         logger.debug(f"Fetched {trail_count} trails and {trailhead_count} trailheads")
         
@@ -111,8 +111,8 @@ def generate_map_post(request: MapRequest):
         trailheads_geojson = fetch_trailheads_data(request.lat, request.lng, request.radius)
         
         # Log data fetch results for debugging
-        trail_count = len(osm_geojson.get("features", [])) if osm_geojson else 0
-        trailhead_count = len(trailheads_geojson.get("features", [])) if trailheads_geojson else 0
+        trail_count = len(osm_geojson["features"])
+        trailhead_count = len(trailheads_geojson["features"])
         logger.debug(f"Map request (POST): lat={request.lat}, lng={request.lng}, radius={request.radius}km")
         logger.debug(f"Fetched {trail_count} trails and {trailhead_count} trailheads")
         
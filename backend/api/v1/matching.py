@@ -153,7 +153,7 @@ def get_potential_matches(
     exclude_set = set()
     if exclude_swiped:
         exclude_set = swipe_service.get_swiped_users(uid)
-        logger.debug(f"User {uid} has swiped on {len(exclude_set)} users")
+        logger.debug("User %s has swiped on %d users", uid, len(exclude_set))
     
     # Find matches using L2AP
     matches = service.find_matches(
@@ -163,13 +163,13 @@ def get_potential_matches(
         exclude_self=True
     )
     
-    logger.debug(f"Found {len(matches)} matches for user {uid} (before filtering)")
+    logger.debug("Found %d matches for user %s (before filtering)", len(matches), uid)
     
     # Filter out swiped users and enrich with profile data
     potential_matches = []
     for match_uid, similarity in matches:
         if match_uid in exclude_set:
-            logger.debug(f"Excluding {match_uid} (already swiped)")
+            logger.debug("Excluding %s (already swiped)", match_uid)
             continue
         
         if len(potential_matches) >= limit:
@@ -189,9 +189,9 @@ def get_potential_matches(
                 similarity=similarity
             ))
         else:
-            logger.debug(f"Skipping {match_uid} (no profile found)")
+            logger.debug("Skipping %s (no profile found)", match_uid)
     
-    logger.debug(f"Returning {len(potential_matches)} potential matches")
+    logger.debug("Returning %d potential matches", len(potential_matches))
     return GetPotentialMatchesResponse(
         matches=potential_matches,
         has_more=len(matches) > len(potential_matches)
@@ -10,7 +10,6 @@ from ...messaging.service import (
     create_message, 
     get_conversation_messages, 
     get_user_conversations,
-    publish_message,
     get_redis
 )
 from ...schemas.messaging import MessageCreate, MessageOut, ConversationOut
@@ -97,27 +96,9 @@ async def send_message(
     db: Session = Depends(get_db)
 ):
     """Send a message to another user"""
-    # Create message in database
+    # Create message in database (also publishes it to both users' Redis channels)
     message = create_message(db, sender_uid, payload.receiver_uid, payload.content)
     
-    # Publish to Redis for real-time delivery
-    message_data = {
-        "type": "new_message",
-        "message": {
-            "id": message.id,
-            "sender_uid": message.sender_uid,
-            "receiver_uid": message.receiver_uid,
-            "content": message.content,
-            "created_at": message.created_at.isoformat() if message.created_at else None,
-        }
-    }
-    
-    # Publish to receiver's channel
-    publish_message(f"user:{payload.receiver_uid}", message_data)
-    
-    # Also notify sender (for confirmation)
-    publish_message(f"user:{sender_uid}", message_data)
-    
     log_user_action(logger, sender_uid, "send_message", {"receiver_uid": payload.receiver_uid})
     
     return MessageOut(
@@ -125,7 +106,7 @@ async def send_message(
         sender_uid=message.sender_uid,
         receiver_uid=message.receiver_uid,
         content=message.content,
-        created_at=message.created_at.isoformat() if message.created_at else None,
+        created_at=message.created_at_iso(),
     )
 
 @router.get("/conversations", response_model=List[ConversationOut])
@@ -147,7 +128,7 @@ async def get_conversations(
                 sender_uid=last_msg.sender_uid,
                 receiver_uid=last_msg.receiver_uid,
                 content=last_msg.content,
-                created_at=last_msg.created_at.isoformat() if last_msg.created_at else None,
+                created_at=last_msg.created_at_iso(),
             ),
             unread_count=0  # TODO: Implement unread count tracking
         ))
@@ -161,17 +142,18 @@ async def get_messages(
     user_uid: str = Header(..., alias="X-User-UID", description="UID of the current user"),
     limit: int = 50,
     offset: int = 0,
+    before_id: Optional[int] = None,
     db: Session = Depends(get_db)
 ):
-    """Get messages in a conversation between two users"""
-    messages = get_conversation_messages(db, user_uid, other_user_uid, limit, offset)
+    """Get messages in a conversation between two users (pass before_id to load older pages)"""
+    messages = get_conversation_messages(db, user_uid, other_user_uid, limit, offset, before_id)
     return [
         MessageOut(
             id=msg.id,
             sender_uid=msg.sender_uid,
             receiver_uid=msg.receiver_uid,
             content=msg.content,
-            created_at=msg.created_at.isoformat() if msg.created_at else None,
+            created_at=msg.created_at_iso(),
         )
         for msg in messages
     ]
@@ -0,0 +1,151 @@
+"""
+Shared fixtures for the school unit tests (school_unit_tests.py) and the
+L2AP similarity check (test_l2ap_similarity.py)
+
+Prototype stubs are built once per session and shallow-copied per test,
+so each test gets its own object without rebuilding it. Value-only stubs
+are plain SimpleNamespaces and HTTP responses are FakeResponses.
+"""
+
+import copy
+import pytest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+
+class FakeResponse:
+    """Minimal stand-in for a requests.Response"""
+    __slots__ = ("status_code", "_json")
+    
+    def __init__(self, status_code, json_data):
+        self.status_code = status_code
+        self._json = json_data
+    
+    def json(self):
+        return self._json
+
+
+class FakeCollection:
+    """Firestore collection whose add() always returns the same document"""
+    __slots__ = ("_doc_ref",)
+    
+    def __init__(self, doc_ref):
+        self._doc_ref = doc_ref
+    
+    def add(self, data):
+        # Firestore add() returns (update_time, doc_ref)
+        return None, self._doc_ref
+
+
+class FakeFirestore:
+    """Firestore client that hands out a single FakeCollection"""
+    __slots__ = ("_collection",)
+    
+    def __init__(self, collection):
+        self._collection = collection
+    
+    def collection(self, name):
+        return self._collection
+
+
+# Both dates come from a single clock read at import, so a midnight
+# rollover between collection and execution cannot shift one of them
+_NOW = datetime.now()
+FUTURE_DATE = (_NOW + timedelta(days=7)).strftime("%Y-%m-%d")
+PAST_DATE = (_NOW - timedelta(days=1)).strftime("%Y-%m-%d")
+
+
+@pytest.fixture(scope="session")
+def future_date():
+    """Event date one week from now (YYYY-MM-DD)"""
+    return FUTURE_DATE
+
+
+@pytest.fixture(scope="session")
+def past_date():
+    """Event date one day ago (YYYY-MM-DD)"""
+    return PAST_DATE
+
+
+@pytest.fixture(scope="session")
+def _proto_user_record():
+    """Firebase Auth user record returned by auth.create_user"""
+    return SimpleNamespace(uid="test_uid_123", email="john@example.com")
+
+
+@pytest.fixture(scope="session")
+def _proto_login_ok_response():
+    """Successful Firebase Auth REST sign-in response"""
+    return FakeResponse(200, {
+        "localId": "test_uid_123",
+        "idToken": "test_id_token",
+        "refreshToken": "test_refresh_token",
+        "expiresIn": "3600"
+    })
+
+
+@pytest.fixture(scope="session")
+def _proto_login_fail_response():
+    """Failed Firebase Auth REST sign-in responses, one per error message"""
+    responses = {}
+    
+    def build(message):
+        if message not in responses:
+            responses[message] = FakeResponse(400, {"error": {"message": message}})
+        return responses[message]
+    
+    return build
+
+
+@pytest.fixture(scope="session")
+def _proto_user_doc_ref():
+    """Firestore user document reference for an existing profile"""
+    user_doc = SimpleNamespace(exists=True, to_dict=lambda: {
+        "name": "John Doe",
+        "username": "johndoe"
+    })
+    return SimpleNamespace(get=lambda: user_doc)
+
+
+@pytest.fixture(scope="session")
+def _proto_event_doc_ref():
+    """Firestore document reference returned when adding an event"""
+    return SimpleNamespace(id="test_event_123")
+
+
+@pytest.fixture(scope="session")
+def firestore_db_stub(_proto_event_doc_ref):
+    """Firestore client with the add() path pre-wired, built once per session"""
+    return FakeFirestore(FakeCollection(_proto_event_doc_ref))
+
+
+@pytest.fixture(scope="session")
+def prebuilt_index():
+    """L2AP index holding user2 (hiking, camping, photography), built once per session"""
+    # Imported here so the school tests don't pay for loading the matching module
+    from matching.profile_matching import L2APIndex, normalize_interests
+    
+    index = L2APIndex()
+    index.add_document("user2", normalize_interests(["hiking", "camping", "photography"]))
+    return index
+
+
+@pytest.fixture
+def user_record(_proto_user_record):
+    return copy.copy(_proto_user_record)
+
+
+@pytest.fixture
+def login_ok_response(_proto_login_ok_response):
+    return copy.copy(_proto_login_ok_response)
+
+
+@pytest.fixture
+def login_fail_response(_proto_login_fail_response):
+    return lambda message: copy.copy(_proto_login_fail_response(message))
+
+
+@pytest.fixture
+def user_doc_ref(_proto_user_doc_ref):
+    return copy.copy(_proto_user_doc_ref)
+
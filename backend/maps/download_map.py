@@ -1,14 +1,77 @@
-# pip install folium requests
-import math, requests, folium, argparse, html, re
-from folium.plugins import MarkerCluster
+# pip install folium requests ijson numpy
+import math, requests, folium, argparse, html, re, ijson, functools
+import os, json, hashlib, shutil
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from folium.plugins import FastMarkerCluster
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # ------------------------
 # CONFIG
 # ------------------------
-OVERPASS_URL = "https://overpass-api.de/api/interpreter"  # can be swapped to a local instance if self-hosted
+PUBLIC_OVERPASS_URL = "https://overpass-api.de/api/interpreter"
+# Set OVERPASS_URL to point at a self-hosted instance
+OVERPASS_URL = os.environ.get("OVERPASS_URL", PUBLIC_OVERPASS_URL)
+# The public endpoint rate-limits per IP, so only tile requests in parallel against our own instance
+OVERPASS_PARALLEL_TILES = OVERPASS_URL != PUBLIC_OVERPASS_URL
+OVERPASS_TILE_GRID = 2  # split the bbox into GRID x GRID tiles when parallel fetching is allowed
 USGS_TOPO_TILES = "https://basemap.nationalmap.gov/arcgis/rest/services/USGSTopo/MapServer/tile/{z}/{y}/{x}"
 TRAILHEADS_URL = "https://carto.nationalmap.gov/arcgis/rest/services/structures/MapServer/61/query"
 
+USER_AGENT = "TrailMix/1.0 (hiking trail map generator)"
+
+MAP_CACHE_DIR = ".mapcache"  # rendered HTML keyed by content hash, reused across CLI runs
+MAP_CACHE_VERSION = 2  # bump whenever the template, popups or escaping change the rendered HTML
+COORD_CACHE_PRECISION = 5  # ~1m; coordinates are rounded to this before bbox/query caching
+TITLE_MAX_LENGTH = 100
+_TAG_RE = re.compile(r'<[^>]+>')
+
+# Client-side marker builder for FastMarkerCluster.
+# Each data row is [lat, lon, title, icon_color, icon_name, popup_info], where popup_info is
+# {"addr", "source"} for a single trailhead or {"trailheads": [[name, addr], ...]} for a group.
+# Popups are built from those properties when first opened, so no per-marker HTML is shipped.
+TRAILHEAD_MARKER_CALLBACK = """
+function (row) {
+    function el(tag, style, text) {
+        var node = document.createElement(tag);
+        if (style) { node.style.cssText = style; }
+        if (text) { node.textContent = text; }
+        return node;
+    }
+    function field(label, value) {
+        var p = el('p', 'margin: 5px 0;');
+        p.appendChild(el('strong', null, label + ':'));
+        p.appendChild(document.createTextNode(' ' + value));
+        return p;
+    }
+    var icon = L.AwesomeMarkers.icon({icon: row[4], prefix: 'fa', markerColor: row[3]});
+    var marker = L.marker(new L.LatLng(row[0], row[1]), {icon: icon});
+    marker.bindTooltip(row[2]);
+    marker.bindPopup(function () {
+        var info = row[5];
+        var box = el('div', info.trailheads
+            ? 'min-width: 250px; max-height: 300px; overflow-y: auto;'
+            : 'min-width: 200px;');
+        box.appendChild(el('h4', 'margin: 0 0 10px 0; color: #2E8B57;', row[2]));
+        if (info.trailheads) {
+            info.trailheads.forEach(function (t) {
+                var item = el('div', 'border-bottom: 1px solid #ddd; padding: 5px 0;');
+                item.appendChild(el('strong', null, t[0]));
+                item.appendChild(document.createElement('br'));
+                item.appendChild(el('small', null, t[1]));
+                box.appendChild(item);
+            });
+        } else {
+            box.appendChild(field('Address', info.addr));
+            box.appendChild(field('Source', info.source));
+        }
+        return box;
+    }, {maxWidth: 300});
+    return marker;
+}
+"""
+
 # Map style configurations
 MAP_STYLES = {
     "terrain": {
@@ -28,6 +91,30 @@ MAP_STYLES = {
     }
 }
 
+def _build_session():
+    """Shared HTTP session: keep-alive connections plus backoff on rate limits/gateway errors"""
+    session = requests.Session()
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 502, 503, 504],
+        allowed_methods=frozenset(["GET", "POST"]),  # Overpass queries are read-only POSTs
+        respect_retry_after_header=True,
+        raise_on_status=False,  # hand the final response back so raise_for_status reports it
+    )
+    adapter = HTTPAdapter(max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"User-Agent": USER_AGENT})
+    return session
+
+_SESSION = _build_session()
+
+# Shared pool for tiled Overpass queries, so each map request doesn't spin
+# up (and tear down) its own threads; workers start lazily on first use
+_TILE_EXECUTOR = ThreadPoolExecutor(max_workers=OVERPASS_TILE_GRID ** 2, thread_name_prefix="overpass")
+
+@functools.lru_cache(maxsize=64)
 def bbox_from_point(lat, lon, r_km):
     dlat = r_km / 111.32
     dlon = r_km / (111.32 * math.cos(math.radians(lat)))
@@ -89,10 +176,12 @@ def sanitize_title(title):
     """Sanitize title to prevent HTML injection"""
     if not title:
         return ""
+    # Cap the input before doing any work so the regex never scans huge strings
+    title = title[:TITLE_MAX_LENGTH * 2]
     # Remove any HTML tags and escape special characters
-    title = re.sub(r'<[^>]+>', '', title)
+    title = _TAG_RE.sub('', title)
     title = html.escape(title)
-    return title[:100]  # Limit length
+    return title[:TITLE_MAX_LENGTH]  # Limit length
 
 def parse_arguments():
     """Parse command line arguments"""
@@ -120,12 +209,26 @@ def parse_arguments():
     
     return parser.parse_args()
 
+def normalize_feature_collection(data):
+    """
+    Coerce fetched GeoJSON into {"type": "FeatureCollection", "features": [...]}
+    so downstream code can index "features" directly without re-checking it.
+    """
+    if not isinstance(data, dict) or not isinstance(data.get("features"), list):
+        return {"type": "FeatureCollection", "features": []}
+    if data.get("type") == "FeatureCollection":
+        return data
+    return {"type": "FeatureCollection", "features": data["features"]}
+
 def build_map(lat, lng, zoom, style, sanitized_title, osm_geojson, trailheads_geojson):
     """
     Pure-ish function that builds and returns a folium.Map object
     from already-fetched data.
     No network. No disk.
     """
+    osm_geojson = normalize_feature_collection(osm_geojson)
+    trailheads_geojson = normalize_feature_collection(trailheads_geojson)
+    
     m = folium.Map(location=[lat, lng], zoom_start=zoom, tiles=None)
 
     # Add basemap tiles
@@ -140,7 +243,7 @@ def build_map(lat, lng, zoom, style, sanitized_title, osm_geojson, trailheads_ge
     hiking_fg = folium.FeatureGroup(name="OSM Hiking routes").add_to(m)
     
     # Only add GeoJSON if we have valid data
-    if osm_geojson and osm_geojson.get("type") == "FeatureCollection" and osm_geojson.get("features"):
+    if osm_geojson["features"]:
         # Style trails with more visible colors
         def trail_style(feature):
             return {
@@ -151,23 +254,27 @@ def build_map(lat, lng, zoom, style, sanitized_title, osm_geojson, trailheads_ge
                 "fillOpacity": 0.2
             }
         
-        # Build a safe tooltip based on the first feature that actually has properties.
-        # Folium validates tooltip fields against the FIRST feature only.
-        features_list = osm_geojson.get("features", [])
+        # Build a safe tooltip and popup based on the first feature that actually has properties.
+        # Folium validates tooltip/popup fields against the FIRST feature only.
+        features_list = osm_geojson["features"]
         first_with_props_idx = next((i for i, f in enumerate(features_list) if f.get("properties")), None)
 
         tooltip = None
+        popup = None
         if first_with_props_idx is not None:
             first_props_keys = set(features_list[first_with_props_idx]["properties"].keys())
             preferred_order = ["name", "highway", "surface", "sac_scale", "tracktype"]
             fields_for_tooltip = [k for k in preferred_order if k in first_props_keys]
+            popup_order = ["name", "sac_scale", "surface", "network"]
+            fields_for_popup = [k for k in popup_order if k in first_props_keys]
 
-            if fields_for_tooltip:
+            if fields_for_tooltip or fields_for_popup:
                 # Ensure the feature used for validation is first in the collection
                 if first_with_props_idx != 0:
                     features_list = [features_list[first_with_props_idx]] + features_list[:first_with_props_idx] + features_list[first_with_props_idx+1:]
                     osm_geojson = {**osm_geojson, "features": features_list}
 
+            if fields_for_tooltip:
                 aliases_map = {
                     "name": "Trail Name:",
                     "highway": "Type:",
@@ -178,23 +285,24 @@ def build_map(lat, lng, zoom, style, sanitized_title, osm_geojson, trailheads_ge
                 aliases = [aliases_map[k] for k in fields_for_tooltip]
                 tooltip = folium.features.GeoJsonTooltip(fields=fields_for_tooltip, aliases=aliases)
 
+            if fields_for_popup:
+                # Rendered client-side from each feature's properties, so no per-feature Popup objects
+                popup_aliases_map = {
+                    "name": "Name",
+                    "sac_scale": "SAC",
+                    "surface": "Surface",
+                    "network": "Network",
+                }
+                popup_aliases = [popup_aliases_map[k] for k in fields_for_popup]
+                popup = folium.features.GeoJsonPopup(fields=fields_for_popup, aliases=popup_aliases, max_width=320)
+
         folium.GeoJson(
             osm_geojson,
             name="OSM Hiking Trails",
             style_function=trail_style,
-            tooltip=tooltip
+            tooltip=tooltip,
+            popup=popup
         ).add_to(hiking_fg)
-
-        for f in osm_geojson["features"]:
-            props = f.get("properties", {})
-            if props:
-                html_content = (
-                    f"<b>{props.get('name', 'Unnamed Trail')}</b><br>"
-                    f"<b>SAC:</b> {props.get('sac_scale', 'Unknown')} &nbsp; "
-                    f"<b>Surface:</b> {props.get('surface', 'Unknown')} &nbsp; "
-                    f"<b>Network:</b> {props.get('network', 'Unknown')}"
-                )
-                folium.Popup(html_content, max_width=320).add_to(hiking_fg)
     else:
         print("No OSM hiking data found in the specified area.")
 
@@ -218,88 +326,102 @@ def build_map(lat, lng, zoom, style, sanitized_title, osm_geojson, trailheads_ge
     return m
 
 
-def convert_osm_to_geojson(osm_data):
-    """Convert OSM format to GeoJSON format"""
-    if not osm_data or "elements" not in osm_data:
-        return {"type": "FeatureCollection", "features": []}
+def _way_to_feature(way_id, tags, coordinates):
+    """Build a trail LineString feature, or None if the way isn't a usable trail"""
+    # Skip if we don't have enough coordinates
+    if len(coordinates) < 2:
+        return None
+    
+    # Only include ways that are likely trails/paths
+    highway_type = tags.get("highway", "")
+    route_type = tags.get("route", "")
     
+    # Include if it's a pedestrian path type or explicitly marked as hiking
+    if (highway_type in ["footway", "path", "track", "steps", "bridleway"] or
+        route_type == "hiking" or
+        "sac_scale" in tags or
+        "trail_visibility" in tags or
+        tags.get("mountain_pass") == "yes"):
+        
+        return {
+            "type": "Feature",
+            "id": f"way/{way_id}",
+            "geometry": {
+                "type": "LineString",
+                "coordinates": coordinates
+            },
+            "properties": tags
+        }
+    return None
+
+def convert_osm_elements_to_geojson(elements):
+    """
+    Convert an iterable of OSM elements to GeoJSON in a single pass.
+    Works on a streamed element generator, so the full Overpass
+    response never has to be held in memory.
+    """
     features = []
     nodes = {}
+    pending_ways = []  # ways that reference nodes we may not have seen yet
+    node_count = 0
+    way_count = 0
     
-    # First pass: collect all nodes
-    for element in osm_data["elements"]:
-        if element.get("type") == "node":
+    for element in elements:
+        element_type = element.get("type")
+        if element_type == "node":
             node_id = element.get("id")
             lat = element.get("lat")
             lon = element.get("lon")
             if lat is not None and lon is not None:
                 nodes[node_id] = {"lat": lat, "lon": lon}
-    
-    print(f"[Convert] Collected {len(nodes)} nodes")
-    
-    # Second pass: convert ways to LineString features
-    way_count = 0
-    for element in osm_data["elements"]:
-        if element.get("type") == "way":
+                node_count += 1
+        elif element_type == "way":
             way_count += 1
             geometry = element.get("geometry")
-            nodes_list = element.get("nodes", [])
             tags = element.get("tags", {})
             
-            coordinates = []
-            
             # Prefer geometry if available (includes coordinates directly)
             if geometry and isinstance(geometry, list):
                 coordinates = [[coord.get("lon"), coord.get("lat")] 
                              for coord in geometry 
                              if coord.get("lat") is not None and coord.get("lon") is not None]
-            elif nodes_list:
-                # Build coordinates from node references
-                coordinates = []
-                for node_id in nodes_list:
-                    if node_id in nodes:
-                        node = nodes[node_id]
-                        # GeoJSON format: [longitude, latitude]
-                        coordinates.append([node["lon"], node["lat"]])
-            
-            # Skip if we don't have enough coordinates
-            if len(coordinates) < 2:
-                continue
-            
-            # Only include ways that are likely trails/paths
-            highway_type = tags.get("highway", "")
-            route_type = tags.get("route", "")
-            
-            # Include if it's a pedestrian path type or explicitly marked as hiking
-            if (highway_type in ["footway", "path", "track", "steps", "bridleway"] or
-                route_type == "hiking" or
-                "sac_scale" in tags or
-                "trail_visibility" in tags or
-                tags.get("mountain_pass") == "yes"):
-                
-                feature = {
-                    "type": "Feature",
-                    "geometry": {
-                        "type": "LineString",
-                        "coordinates": coordinates
-                    },
-                    "properties": tags
-                }
-                features.append(feature)
+                feature = _way_to_feature(element.get("id"), tags, coordinates)
+                if feature:
+                    features.append(feature)
+            elif element.get("nodes"):
+                pending_ways.append((element.get("id"), tags, element["nodes"]))
+    
+    # Resolve ways built from node references once all nodes are known
+    for way_id, tags, nodes_list in pending_ways:
+        # GeoJSON format: [longitude, latitude]
+        coordinates = [[nodes[node_id]["lon"], nodes[node_id]["lat"]]
+                       for node_id in nodes_list if node_id in nodes]
+        feature = _way_to_feature(way_id, tags, coordinates)
+        if feature:
+            features.append(feature)
     
+    print(f"[Convert] Collected {node_count} nodes")
     print(f"[Convert] Processed {way_count} ways, created {len(features)} trail features")
     return {"type": "FeatureCollection", "features": features}
 
-def fetch_osm_data(lat, lng, radius_km):
-    """Fetch OSM hiking trail data"""
-    bbox = bbox_from_point(lat, lng, radius_km)
-    south, west, north, east = bbox
-    
-    print(f"[OSM] Querying bbox: south={south:.4f}, west={west:.4f}, north={north:.4f}, east={east:.4f}")
-    
+def convert_osm_to_geojson(osm_data):
+    """Convert OSM format to GeoJSON format"""
+    if not osm_data or "elements" not in osm_data:
+        return {"type": "FeatureCollection", "features": []}
+    return convert_osm_elements_to_geojson(osm_data["elements"])
+
+def iter_osm_elements(response):
+    """Incrementally parse Overpass elements from a streamed response"""
+    # Let urllib3 undo any gzip/deflate transfer encoding before ijson sees the bytes
+    response.raw.decode_content = True
+    return ijson.items(response.raw, "elements.item", use_float=True)
+
+@functools.lru_cache(maxsize=64)
+def _osm_query(south, west, north, east):
+    """Build the Overpass QL body for a bbox (memoized per bbox)"""
     # More inclusive query - get all walking/hiking related ways
     # Query multiple trail types and ensure we get geometry
-    overpass_query = f"""
+    return f"""
     [out:json][timeout:60];
     (
       // All pedestrian/hiking paths (most common)
@@ -317,29 +439,66 @@ def fetch_osm_data(lat, lng, radius_km):
     );
     out geom;
     """
+
+def split_bbox(south, west, north, east, grid):
+    """Split a bbox into grid x grid tiles (S W N E each)"""
+    dlat = (north - south) / grid
+    dlon = (east - west) / grid
+    return [
+        (south + i * dlat, west + j * dlon, south + (i + 1) * dlat, west + (j + 1) * dlon)
+        for i in range(grid)
+        for j in range(grid)
+    ]
+
+def _fetch_osm_bbox(south, west, north, east):
+    """Run one Overpass query for a bbox and convert the streamed result to GeoJSON"""
+    response = _SESSION.post(OVERPASS_URL, data=_osm_query(south, west, north, east), timeout=60, stream=True)
     
-    try:
-        print(f"[OSM] Sending query to Overpass API...")
-        response = requests.post(OVERPASS_URL, data=overpass_query, timeout=60)
+    # Close the stream on error too, so the connection goes back to the shared pool
+    with response:
         response.raise_for_status()
-        osm_data = response.json()
-        
-        # Debug: check what we got
-        elements_count = len(osm_data.get("elements", []))
-        ways_count = len([e for e in osm_data.get("elements", []) if e.get("type") == "way"])
-        nodes_count = len([e for e in osm_data.get("elements", []) if e.get("type") == "node"])
-        print(f"[OSM] Received {elements_count} elements ({ways_count} ways, {nodes_count} nodes)")
-        
-        # Convert OSM format to GeoJSON
-        geojson = convert_osm_to_geojson(osm_data)
-        feature_count = len(geojson.get("features", []))
+        # Convert OSM format to GeoJSON while the body is still streaming in
+        return convert_osm_elements_to_geojson(iter_osm_elements(response))
+
+def merge_feature_collections(collections):
+    """Merge tiled results, dropping ways that were returned by more than one tile"""
+    seen = set()
+    features = []
+    for collection in collections:
+        for feature in collection["features"]:
+            feature_id = feature.get("id")
+            if feature_id is not None:
+                if feature_id in seen:
+                    continue
+                seen.add(feature_id)
+            features.append(feature)
+    return {"type": "FeatureCollection", "features": features}
+
+def fetch_osm_data(lat, lng, radius_km):
+    """Fetch OSM hiking trail data"""
+    # Round so floating-point jitter in the center doesn't bust the bbox/query caches
+    lat, lng = round(lat, COORD_CACHE_PRECISION), round(lng, COORD_CACHE_PRECISION)
+    bbox = bbox_from_point(lat, lng, radius_km)
+    south, west, north, east = bbox
+    
+    print(f"[OSM] Querying bbox: south={south:.4f}, west={west:.4f}, north={north:.4f}, east={east:.4f}")
+    
+    try:
+        if OVERPASS_PARALLEL_TILES:
+            tiles = split_bbox(south, west, north, east, OVERPASS_TILE_GRID)
+            print(f"[OSM] Sending {len(tiles)} tiled queries to {OVERPASS_URL}...")
+            geojson = merge_feature_collections(_TILE_EXECUTOR.map(lambda tile: _fetch_osm_bbox(*tile), tiles))
+        else:
+            print(f"[OSM] Sending query to Overpass API...")
+            geojson = _fetch_osm_bbox(south, west, north, east)
+        feature_count = len(geojson["features"])
         
         print(f"[OSM] Converted to {feature_count} GeoJSON features")
         
         if feature_count > 0:
             # Show sample of trail names if available
             sample_names = [f.get("properties", {}).get("name", "Unnamed") 
-                          for f in geojson.get("features", [])[:3] 
+                          for f in geojson["features"][:3] 
                           if f.get("properties", {}).get("name")]
             if sample_names:
                 print(f"[OSM] Sample trail names: {', '.join(sample_names)}")
@@ -347,7 +506,7 @@ def fetch_osm_data(lat, lng, radius_km):
         return geojson
     except requests.RequestException as e:
         print(f"[OSM] Error fetching OSM data: {e}")
-        print(f"[OSM] Response status: {response.status_code if 'response' in locals() else 'N/A'}")
+        print(f"[OSM] Response status: {getattr(e.response, 'status_code', 'N/A')}")
         return {"type": "FeatureCollection", "features": []}
     except Exception as e:
         print(f"[OSM] Error converting OSM data to GeoJSON: {e}")
@@ -357,6 +516,7 @@ def fetch_osm_data(lat, lng, radius_km):
 
 def fetch_trailheads_data(lat, lng, radius_km):
     """Fetch USGS trailheads data with improved error handling"""
+    lat, lng = round(lat, COORD_CACHE_PRECISION), round(lng, COORD_CACHE_PRECISION)
     bbox = bbox_from_point(lat, lng, radius_km)
     south, west, north, east = bbox
     
@@ -371,20 +531,73 @@ def fetch_trailheads_data(lat, lng, radius_km):
     }
     
     try:
-        response = requests.get(TRAILHEADS_URL, params=params, timeout=30)
+        response = _SESSION.get(TRAILHEADS_URL, params=params, timeout=30)
         response.raise_for_status()
-        return response.json()
+        return normalize_feature_collection(response.json())
     except requests.RequestException as e:
         print(f"Error fetching trailheads data: {e}")
         return {"type": "FeatureCollection", "features": []}
 
 def create_enhanced_trailhead_markers(trailheads_geojson, map_obj):
     """Create enhanced trailhead markers with better clustering and positioning"""
-    if not trailheads_geojson.get("features"):
+    features = trailheads_geojson["features"]
+    if not features:
+        return
+    
+    # Group trailheads by proximity for better organization
+    points = []
+    for feat in features:
+        geom = feat.get("geometry", {})
+        if geom and geom.get("type") == "Point":
+            lon, lat = geom["coordinates"]
+            points.append((lat, lon, feat.get("properties", {})))
+    
+    if not points:
         return
     
+    coords = np.array([(lat, lon) for lat, lon, _ in points], dtype=float)
+    
+    # The same trailhead is often registered by several sources; keep the first
+    # record for each (lat, lon, name) with coordinates rounded to ~10m
+    rounded = np.round(coords, 4).astype(str)
+    names = np.array([props.get("NAME") or "" for _, _, props in points], dtype=str)
+    keys = np.char.add(np.char.add(np.char.add(rounded[:, 0], "|"), np.char.add(rounded[:, 1], "|")), names)
+    _, unique_idx = np.unique(keys, return_index=True)
+    if len(unique_idx) < len(points):
+        unique_idx = np.sort(unique_idx)
+        print(f"[Trailheads] Removed {len(points) - len(unique_idx)} duplicate trailheads")
+        points = [points[i] for i in unique_idx]
+        coords = coords[unique_idx]
+    
+    # Nearby trailheads share a key once coordinates are rounded to 2 decimals
+    _, inverse, counts = np.unique(
+        np.round(coords, 2), axis=0, return_inverse=True, return_counts=True
+    )
+    inverse = inverse.reshape(-1)
+    
+    # Lay groups out contiguously and reduce each run to its centroid in one pass
+    sort_idx = np.argsort(inverse, kind="stable")
+    group_starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    centroids = np.add.reduceat(coords[sort_idx], group_starts, axis=0) / counts[:, None]
+    
+    # Build one marker row per group; the markers themselves are created in the browser
+    marker_rows = []
+    for start, count, (center_lat, center_lon) in zip(group_starts, counts, centroids):
+        trailheads = [
+            {'lat': points[i][0], 'lon': points[i][1], 'props': points[i][2]}
+            for i in sort_idx[start:start + count]
+        ]
+        if count == 1:
+            # Single trailhead - create a simple marker
+            marker_rows.append(create_trailhead_marker(trailheads[0]))
+        else:
+            # Multiple trailheads in same area - create a grouped marker
+            marker_rows.append(create_grouped_trailhead_marker(trailheads, center=(center_lat, center_lon)))
+    
     # Create a more sophisticated clustering system
-    cluster = MarkerCluster(
+    FastMarkerCluster(
+        data=marker_rows,
+        callback=TRAILHEAD_MARKER_CALLBACK,
         name="USGS Trailheads",
         options={
             'maxClusterRadius': 50,  # Smaller radius for better clustering
@@ -394,44 +607,10 @@ def create_enhanced_trailhead_markers(trailheads_geojson, map_obj):
             'disableClusteringAtZoom': 15,  # Disable clustering at high zoom
         }
     ).add_to(map_obj)
-    
-    # Group trailheads by proximity for better organization
-    trailhead_groups = {}
-    for feat in trailheads_geojson.get("features", []):
-        geom = feat.get("geometry", {})
-        if geom and geom.get("type") == "Point":
-            lon, lat = geom["coordinates"]
-            props = feat.get("properties", {})
-            
-            # Create a unique identifier for grouping nearby trailheads
-            group_key = f"{round(lat, 2)}_{round(lon, 2)}"
-            
-            if group_key not in trailhead_groups:
-                trailhead_groups[group_key] = []
-            
-            trailhead_groups[group_key].append({
-                'lat': lat,
-                'lon': lon,
-                'props': props
-            })
-    
-    # Create markers for each group
-    for group_key, trailheads in trailhead_groups.items():
-        if len(trailheads) == 1:
-            # Single trailhead - create a simple marker
-            trailhead = trailheads[0]
-            create_trailhead_marker(trailhead, cluster)
-        else:
-            # Multiple trailheads in same area - create a grouped marker
-            create_grouped_trailhead_marker(trailheads, cluster)
 
-def create_trailhead_marker(trailhead, cluster): 
-    """Create a single trailhead marker"""
-    lat, lon = trailhead['lat'], trailhead['lon']
-    props = trailhead['props']
-    
-    name = props.get("NAME") or "Trailhead"
-    addr = ", ".join([
+def _format_address(props):
+    """Join the USGS address fields that are present"""
+    return ", ".join([
         x for x in [
             props.get("ADDRESS"),
             props.get("CITY"),
@@ -439,76 +618,42 @@ def create_trailhead_marker(trailhead, cluster):
             props.get("ZIPCODE"),
         ] if x
     ])
-    source = props.get("SOURCE_ORIGINATOR") or "USGS"
-    
-    # Create a custom icon for trailheads
-    trailhead_icon = folium.Icon(
-        color='green',
-        icon='hiking',
-        prefix='fa'  # Font Awesome icons
-    )
-    
-    popup_content = f"""
-    <div style="min-width: 200px;">
-        <h4 style="margin: 0 0 10px 0; color: #2E8B57;">{name}</h4>
-        <p style="margin: 5px 0;"><strong>Address:</strong> {addr}</p>
-        <p style="margin: 5px 0;"><strong>Source:</strong> {source}</p>
-    </div>
-    """
+
+def create_trailhead_marker(trailhead):
+    """Create the marker data row for a single trailhead"""
+    props = trailhead['props']
+    name = props.get("NAME") or "Trailhead"
+    popup_info = {
+        "addr": _format_address(props),
+        "source": props.get("SOURCE_ORIGINATOR") or "USGS",
+    }
+    # Green Font Awesome "hiking" icon for trailheads
+    return [trailhead['lat'], trailhead['lon'], name, 'green', 'hiking', popup_info]
+
+def create_grouped_trailhead_marker(trailheads, center=None):
+    """Create the marker data row for multiple nearby trailheads"""
+    # Use the precomputed center point when the caller already has it
+    if center is None:
+        center = np.mean([(t['lat'], t['lon']) for t in trailheads], axis=0)
+    center_lat, center_lon = float(center[0]), float(center[1])
     
-    folium.Marker(
-        [lat, lon],
-        tooltip=name,
-        popup=folium.Popup(popup_content, max_width=300),
-        icon=trailhead_icon
-    ).add_to(cluster)
-
-def create_grouped_trailhead_marker(trailheads, cluster):
-    """Create a grouped marker for multiple nearby trailheads"""
-    # Calculate center point
-    center_lat = sum(t['lat'] for t in trailheads) / len(trailheads)
-    center_lon = sum(t['lon'] for t in trailheads) / len(trailheads)
-    
-    # Create a custom icon for grouped trailheads
-    grouped_icon = folium.Icon(
-        color='darkgreen',
-        icon='users',
-        prefix='fa'
+    popup_info = {
+        "trailheads": [
+            [t['props'].get("NAME") or f"Trailhead {i+1}", _format_address(t['props'])]
+            for i, t in enumerate(trailheads)
+        ]
+    }
+    # Dark green Font Awesome "users" icon for grouped trailheads
+    return [center_lat, center_lon, f"Trailheads ({len(trailheads)})", 'darkgreen', 'users', popup_info]
+
+def map_content_hash(lat, lng, zoom, style, sanitized_title, osm_geojson, trailheads_geojson):
+    """Stable hash of every input that affects the rendered map HTML, including the renderer itself"""
+    payload = json.dumps(
+        [MAP_CACHE_VERSION, folium.__version__,
+         lat, lng, zoom, style, sanitized_title, osm_geojson, trailheads_geojson],
+        sort_keys=True, separators=(",", ":"), default=str
     )
-    
-    # Create popup content for all trailheads in the group
-    popup_content = f"""
-    <div style="min-width: 250px; max-height: 300px; overflow-y: auto;">
-        <h4 style="margin: 0 0 10px 0; color: #2E8B57;">Trailheads ({len(trailheads)})</h4>
-    """
-    
-    for i, trailhead in enumerate(trailheads):
-        props = trailhead['props']
-        name = props.get("NAME") or f"Trailhead {i+1}"
-        addr = ", ".join([
-            x for x in [
-                props.get("ADDRESS"),
-                props.get("CITY"),
-                props.get("STATE"),
-                props.get("ZIPCODE"),
-            ] if x
-        ])
-        
-        popup_content += f"""
-        <div style="border-bottom: 1px solid #ddd; padding: 5px 0;">
-            <strong>{name}</strong><br>
-            <small>{addr}</small>
-        </div>
-        """
-    
-    popup_content += "</div>"
-    
-    folium.Marker(
-        [center_lat, center_lon],
-        tooltip=f"Trailheads ({len(trailheads)})",
-        popup=folium.Popup(popup_content, max_width=300),
-        icon=grouped_icon
-    ).add_to(cluster)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
 
 def main():
     """Main function to generate the map"""
@@ -528,6 +673,18 @@ def main():
     print("Fetching USGS trailheads data...")
     trailheads_geojson = fetch_trailheads_data(args.lat, args.lng, args.radius)
     
+    filename = f"hiking_map_{args.lat}_{args.lng}_{args.zoom}_{args.style}.html"
+    
+    # Skip the folium/Jinja2 render entirely if this exact map was rendered before
+    content_hash = map_content_hash(
+        args.lat, args.lng, args.zoom, args.style, sanitized_title, osm_geojson, trailheads_geojson
+    )
+    cached_path = os.path.join(MAP_CACHE_DIR, f"{content_hash}.html")
+    if os.path.exists(cached_path):
+        shutil.copyfile(cached_path, filename)
+        print(f"Map unchanged, reused cached render: {filename}")
+        return
+    
     # Build map
     print("Building map...")
     m = build_map(
@@ -541,9 +698,15 @@ def main():
     )
 
     # Save map to file
-    filename = f"hiking_map_{args.lat}_{args.lng}_{args.zoom}_{args.style}.html"
     m.save(filename)
     print(f"Map saved as: {filename}")
+    
+    # Best-effort: a failed cache write should never fail the run
+    try:
+        os.makedirs(MAP_CACHE_DIR, exist_ok=True)
+        shutil.copyfile(filename, cached_path)
+    except OSError as e:
+        print(f"Could not cache rendered map: {e}")
 
 if __name__ == "__main__":
     main()
@@ -327,6 +327,29 @@ class TestBuildMap:
         # The title should be added as a child element
         assert len(html_element._children) > 0
 
+    def test_build_map_trail_popup_is_geojson_popup(self, sample_osm_geojson, sample_trailheads_geojson):
+        """Test build_map attaches one GeoJsonPopup instead of per-feature popups"""
+        import folium
+        map_obj = build_map(
+            lat=40.0,
+            lng=-105.0,
+            zoom=10,
+            style="terrain",
+            sanitized_title="",
+            osm_geojson=sample_osm_geojson,
+            trailheads_geojson=sample_trailheads_geojson
+        )
+
+        geojson_layers = [
+            child for layer in map_obj._children.values()
+            for child in layer._children.values()
+            if isinstance(child, folium.GeoJson)
+        ]
+        assert len(geojson_layers) == 1
+        popups = [c for c in geojson_layers[0]._children.values() if isinstance(c, folium.features.GeoJsonPopup)]
+        assert len(popups) == 1
+        assert popups[0].fields == ["name", "sac_scale", "surface", "network"]
+
 
 class TestEdgeCases:
     """Test edge cases and error conditions"""
@@ -425,6 +448,23 @@ class TestEnhancedPinPlacement:
         """Test enhanced trailhead markers with sample data"""
         create_enhanced_trailhead_markers(sample_trailheads_geojson, mock_map)
         # Should not raise any errors
+
+    def test_create_enhanced_trailhead_markers_drops_duplicates(self, sample_trailheads_geojson, mock_map):
+        """Test the same trailhead reported twice only produces one marker"""
+        duplicate = json.loads(json.dumps(sample_trailheads_geojson["features"][0]))
+        duplicate["properties"]["SOURCE_ORIGINATOR"] = "Other Source"
+        duplicate["geometry"]["coordinates"] = [-105.00001, 40.00001]
+        data = {
+            "type": "FeatureCollection",
+            "features": sample_trailheads_geojson["features"] + [duplicate]
+        }
+
+        with patch("download_map.FastMarkerCluster") as mock_cluster:
+            create_enhanced_trailhead_markers(data, mock_map)
+
+        rows = mock_cluster.call_args.kwargs["data"]
+        assert sorted(row[2] for row in rows) == ["Test Trailhead 1", "Test Trailhead 2"]
+        assert all(row[5]["source"] == "USGS" for row in rows)
     
     def test_create_trailhead_marker(self, mock_map):
         """Test creating a single trailhead marker"""
@@ -441,7 +481,7 @@ class TestEnhancedPinPlacement:
             }
         }
         
-        create_trailhead_marker(trailhead, mock_map)
+        create_trailhead_marker(trailhead)
         # Should not raise any errors
     
     def test_create_grouped_trailhead_marker(self, mock_map):
@@ -459,7 +499,7 @@ class TestEnhancedPinPlacement:
             }
         ]
         
-        create_grouped_trailhead_marker(trailheads, mock_map)
+        create_grouped_trailhead_marker(trailheads)
         # Should not raise any errors
 
 
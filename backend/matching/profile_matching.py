@@ -8,23 +8,52 @@ Based on: "L2AP: Fast Cosine Similarity Search With Prefix L2-Norm Bounds"
 (Anastasiu & Karypis, ICDE 2014)
 """
 
-import math
-import heapq
 import time
+import threading
 import traceback
 from typing import Dict, List, Tuple, Optional, Set
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
+import numpy as np
 import firebase_admin
 from firebase_admin import firestore
 import os
+import sys
 import json
 from pathlib import Path
 
 from ..utils.logging_utils import get_logger
 from ..exceptions import NotFoundError, DatabaseError
 
+try:
+    from numba import njit
+except ImportError:
+    # numba is optional; candidate generation falls back to NumPy masks
+    njit = None
+
 logger = get_logger(__name__)
 
+# On-disk index snapshot, reloaded with np.load(mmap_mode="r") on cold start
+INDEX_SNAPSHOT_DIR = os.environ.get("MATCHING_INDEX_DIR", ".matchindex")
+INDEX_META_FILE = "index_meta.json"
+INDEX_ARRAYS = (
+    "posting_doc_ids", "posting_val_codes", "val_codebook", "posting_prefix_norms", "feature_offsets",
+    "doc_pscore", "doc_max_values", "doc_norms", "doc_feature_ids", "doc_feature_offsets",
+)
+
+# Opt-in MinHash-LSH candidate prefilter, built once the index holds
+# MATCHING_LSH_MIN_DOCS profiles (unset: never). It is approximate: users
+# sharing few interests with the query may be missed.
+LSH_MIN_DOCS = int(os.environ["MATCHING_LSH_MIN_DOCS"]) if os.environ.get("MATCHING_LSH_MIN_DOCS") else None
+LSH_NUM_PERM = 64
+LSH_THRESHOLD = 0.3
+
+# Single Firestore doc bumped on every users write; a TTL rebuild is skipped
+# while it still holds the value the index was built from
+PROFILES_DIRTY_DOC = ("meta", "profiles_dirty_at")
+# Hard limit on index age, so writes that never bump the marker (console
+# edits, deletes, other tools) are still picked up
+INDEX_MAX_AGE_SECONDS = int(os.environ.get("MATCHING_INDEX_MAX_AGE", "3600"))
+
 # Initialize Firestore - use the same db instance from signups
 try:
     from backend.accounts.signups import db
@@ -61,27 +90,21 @@ def normalize_interests(interests: List[str]) -> Dict[str, float]:
     if not interests:
         return {}
     
-    # Deduplicate and normalize: convert to lowercase, strip whitespace, remove empty strings
-    # Use a set to deduplicate, then convert back to dict for consistent ordering
+    # Deduplicate and normalize: convert to lowercase, strip whitespace, remove empty strings.
+    # Interned so every profile shares one string per interest and the
+    # feature_to_id lookups compare by pointer.
     unique_interests = set()
     for interest in interests:
         normalized = interest.lower().strip()
         if normalized:  # Only add non-empty strings
-            unique_interests.add(normalized)
+            unique_interests.add(sys.intern(normalized))
     
     if not unique_interests:
         return {}
     
-    # Binary weighting: each unique interest gets weight 1
-    vector = {interest: 1.0 for interest in unique_interests}
-    
-    # Unit normalize: ||v||₂ = 1
-    # For n unique interests, each gets weight 1/√n
-    norm = math.sqrt(sum(v * v for v in vector.values()))
-    if norm > 0:
-        vector = {k: v / norm for k, v in vector.items()}
-    
-    return vector
+    # Binary weighting unit-normalized: for n unique interests each gets 1/√n
+    weight = float(1.0 / np.sqrt(len(unique_interests)))
+    return {interest: weight for interest in unique_interests}
 
 
 def get_profile_vector(profile_data: dict) -> Dict[str, float]:
@@ -104,27 +127,213 @@ def get_profile_vector(profile_data: dict) -> Dict[str, float]:
 # 2. L2AP Index Structure
 # ─────────────────────────
 
+class MinHashLSH:
+    """
+    Banded MinHash index over documents' interest sets, used to narrow
+    l2ap_knn to documents likely to reach a Jaccard similarity of about
+    `threshold` with the query.
+    
+    Feature ids are already contiguous integers, so each feature's
+    `num_perm` hash values are simply a seeded random table row.
+    """
+    
+    _MIX = np.uint64(0x9E3779B97F4A7C15)
+    
+    def __init__(self, num_perm: int = LSH_NUM_PERM, threshold: float = LSH_THRESHOLD, seed: int = 1):
+        # Pick rows per band r (bands b = num_perm // r) so the S-curve
+        # midpoint (1/b)^(1/r) lands closest to the threshold
+        self.rows = min(
+            (r for r in range(1, num_perm + 1)),
+            key=lambda r: abs((1.0 / (num_perm // r)) ** (1.0 / r) - threshold)
+        )
+        self.bands = num_perm // self.rows
+        self.num_perm = num_perm
+        self.seed = seed
+        self.feature_hashes = np.zeros((0, num_perm), dtype=np.uint32)
+        self.band_keys: List[np.ndarray] = []
+        self.band_docs: List[np.ndarray] = []
+        self.n_docs = 0
+    
+    def _band_keys(self, signatures: np.ndarray) -> np.ndarray:
+        """Combine each band's rows into one uint64 key per document."""
+        keys = np.zeros((len(signatures), self.bands), dtype=np.uint64)
+        for row in range(self.rows):
+            with np.errstate(over="ignore"):
+                keys = keys * self._MIX + signatures[:, row::self.rows][:, :self.bands].astype(np.uint64)
+        return keys
+    
+    def build(self, n_features: int, doc_feature_ids: np.ndarray, doc_feature_offsets: np.ndarray,
+              chunk_docs: int = 4096):
+        """
+        Build the band tables from documents' feature ids in CSR form.
+        
+        Args:
+            n_features: Number of interned features
+            doc_feature_ids: Concatenated feature ids of all documents
+            doc_feature_offsets: CSR offsets (len = n_docs + 1)
+        """
+        rng = np.random.default_rng(self.seed)
+        self.feature_hashes = rng.integers(0, 2 ** 32, size=(n_features, self.num_perm), dtype=np.uint32)
+        self.n_docs = len(doc_feature_offsets) - 1
+        
+        lengths = np.diff(doc_feature_offsets)
+        docs = np.flatnonzero(lengths)
+        keys = np.zeros((len(docs), self.bands), dtype=np.uint64)
+        # Chunked so the (postings x num_perm) hash gather stays small
+        for lo in range(0, len(docs), chunk_docs):
+            chunk = docs[lo:lo + chunk_docs]
+            starts = doc_feature_offsets[chunk]
+            ends = doc_feature_offsets[chunk + 1]
+            flat = np.concatenate([doc_feature_ids[a:b] for a, b in zip(starts.tolist(), ends.tolist())])
+            seg_starts = np.concatenate(([0], np.cumsum(ends - starts)[:-1]))
+            signatures = np.minimum.reduceat(self.feature_hashes[flat], seg_starts, axis=0)
+            keys[lo:lo + chunk_docs] = self._band_keys(signatures)
+        
+        self.band_keys = []
+        self.band_docs = []
+        for band in range(self.bands):
+            order = np.argsort(keys[:, band], kind="stable")
+            self.band_keys.append(keys[order, band])
+            self.band_docs.append(docs[order].astype(np.int32))
+    
+    def candidates(self, feature_ids: np.ndarray, n_docs: int) -> np.ndarray:
+        """
+        Boolean mask of documents sharing at least one band with the query.
+        Documents added after build() are always candidates.
+        
+        Args:
+            feature_ids: Query feature ids (unknown ones, -1 or newer than
+                the hash table, are ignored)
+            n_docs: Current number of internal documents
+        """
+        mask = np.zeros(n_docs, dtype=np.bool_)
+        mask[self.n_docs:] = True
+        known = feature_ids[(feature_ids >= 0) & (feature_ids < len(self.feature_hashes))]
+        if not len(known):
+            return mask
+        
+        signature = self.feature_hashes[known].min(axis=0)[np.newaxis, :]
+        query_keys = self._band_keys(signature)[0]
+        for band_keys, band_docs, key in zip(self.band_keys, self.band_docs, query_keys):
+            lo = np.searchsorted(band_keys, key, side="left")
+            hi = np.searchsorted(band_keys, key, side="right")
+            mask[band_docs[lo:hi]] = True
+        return mask
+
+
+class _ScratchBuffers:
+    """Per-thread, per-index query buffers, kept zeroed between queries."""
+    
+    __slots__ = ("scores", "exclude_mask")
+    
+    def __init__(self, n_docs: int):
+        self.scores = np.zeros(n_docs, dtype=np.float32)
+        self.exclude_mask = np.zeros(n_docs, dtype=np.bool_)
+
+
 class L2APIndex:
     """
     L2AP inverted index for fast k-NN search.
     
+    Interest strings are interned into contiguous integer feature ids and
+    user UIDs into contiguous internal document indices, so both the
+    per-document norm math and the query accumulation run in NumPy.
+    
     Stores:
-    - Inverted index: feature -> [(doc_id, value, ||prefix||₂), ...]
+    - Inverted index: feature_id -> (doc_idx[], value_code[], ||prefix||₂[])
+      as parallel arrays sorted by decreasing value. Values are stored as
+      uint8 codes into val_codebook: binary-weighted vectors only ever hold
+      1/√n, so there are few distinct values.
     - Per-document metadata: doc_id -> (pscore, max_feature_value, ||vector||₂)
     """
     
     def __init__(self):
-        # Inverted index: feature -> list of (doc_id, value, prefix_norm)
-        self.inverted_index: Dict[str, List[Tuple[str, float, float]]] = defaultdict(list)
+        # Feature interning: interest string <-> contiguous integer id
+        self.feature_to_id: Dict[str, int] = {}
+        self.id_to_feature: List[str] = []
+        
+        # Document interning: user UID <-> internal document index
+        self.uid_to_id: Dict[str, int] = {}
+        self.id_to_uid: List[str] = []
+        
+        # Inverted index: feature_id -> (doc_idx int32[], value_code uint8[], prefix_norm float32[])
+        self.inverted_index: Dict[int, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+        
+        # Distinct posting values; codes widen to uint16 past 256 entries
+        self.val_codebook: np.ndarray = np.zeros(0, dtype=np.float32)
+        self._val_codes: Dict[float, int] = {}
+        self._code_dtype = np.uint8
+        
+        # Postings added since the last finalize(), merged into inverted_index lazily
+        self._pending: Dict[int, List[Tuple[int, float, float]]] = defaultdict(list)
+        self._pending_pscore: Dict[int, float] = {}
         
         # Document metadata: doc_id -> (pscore, max_value, norm)
         self.doc_metadata: Dict[str, Tuple[float, float, float]] = {}
         
+        # pscore per internal document index, for vectorized verification
+        self.doc_pscore: np.ndarray = np.zeros(0, dtype=np.float32)
+        
         # Feature frequency for ordering
-        self.feature_freq: Dict[str, int] = defaultdict(int)
+        self.feature_freq: Dict[int, int] = defaultdict(int)
+        
+        # Feature ids each document was indexed under, so removal only
+        # touches that document's posting lists
+        self.uid_to_features: Dict[str, List[int]] = {}
+        
+        # Opt-in MinHash-LSH prefilter, built once there are lsh_min_docs documents (None: never)
+        self.lsh: Optional[MinHashLSH] = None
+        self.lsh_min_docs = LSH_MIN_DOCS
         
         # All document IDs
         self.doc_ids: Set[str] = set()
+        
+        # Per-thread query buffers reused across queries
+        self._scratch = threading.local()
+    
+    def scratch_buffers(self) -> _ScratchBuffers:
+        """
+        Return this thread's zeroed score/exclude buffers sized to the number
+        of internal documents. Callers must reset the entries they set
+        before the next query.
+        """
+        buffers = getattr(self._scratch, "buffers", None)
+        if buffers is None or len(buffers.scores) != len(self.id_to_uid):
+            buffers = _ScratchBuffers(len(self.id_to_uid))
+            self._scratch.buffers = buffers
+        return buffers
+    
+    def get_feature_id(self, feature: str) -> int:
+        """
+        Return the integer id for a feature, assigning a new one if unseen.
+        """
+        feature_id = self.feature_to_id.get(feature)
+        if feature_id is None:
+            feature_id = len(self.id_to_feature)
+            self.feature_to_id[feature] = feature_id
+            self.id_to_feature.append(feature)
+        return feature_id
+    
+    def vectorize(self, vector: Dict[str, float], add_features: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Convert a sparse dict vector into (feature_ids, values) arrays sorted
+        by decreasing value.
+        
+        Args:
+            vector: Sparse vector
+            add_features: Assign ids to unseen features. Otherwise unseen
+                features get id -1 (they still count towards the norm).
+            
+        Returns:
+            Tuple of (int32 feature ids, float32 values)
+        """
+        if add_features:
+            ids = np.fromiter((self.get_feature_id(f) for f in vector), dtype=np.int32, count=len(vector))
+        else:
+            ids = np.fromiter((self.feature_to_id.get(f, -1) for f in vector), dtype=np.int32, count=len(vector))
+        vals = np.fromiter(vector.values(), dtype=np.float32, count=len(vector))
+        order = np.argsort(-vals, kind="stable")
+        return ids[order], vals[order]
     
     def add_document(self, doc_id: str, vector: Dict[str, float]):
         """
@@ -137,41 +346,137 @@ class L2APIndex:
         if not vector:
             return
         
+        # Features sorted by value (descending) for prefix ordering
+        ids, vals = self.vectorize(vector, add_features=True)
+        
         # Calculate vector norm
-        vector_norm = math.sqrt(sum(v * v for v in vector.values()))
+        vector_norm = float(np.sqrt(vals @ vals))
         if vector_norm == 0:
             return
         
-        # Find max feature value
-        max_value = max(vector.values()) if vector else 0.0
-        
-        # Sort features by value (descending) for prefix ordering
-        sorted_features = sorted(vector.items(), key=lambda x: x[1], reverse=True)
+        max_value = float(vals[0])
         
-        # Calculate prefix norms: ||prefix_j||₂ for each position j
-        prefix_norms = {}
-        running_norm_sq = 0.0
-        for i, (feature, value) in enumerate(sorted_features):
-            running_norm_sq += value * value
-            prefix_norms[i] = math.sqrt(running_norm_sq)
+        # Prefix norms: ||prefix_j||₂ for each position j
+        prefix_norms = np.sqrt(np.cumsum(vals * vals))
         
-        # Calculate pscore (prefix upper bound)
-        # pscore = max over all features of (value * ||prefix||₂)
-        pscore = 0.0
-        for i, (feature, value) in enumerate(sorted_features):
-            prefix_norm = prefix_norms.get(i, 0.0)
-            bound = value * prefix_norm
-            pscore = max(pscore, bound)
+        # pscore (prefix upper bound) = max over features of (value * ||prefix||₂)
+        pscore = float(np.max(vals * prefix_norms))
         
         # Store metadata
+        doc_idx = self.uid_to_id.get(doc_id)
+        if doc_idx is None:
+            doc_idx = len(self.id_to_uid)
+            self.uid_to_id[doc_id] = doc_idx
+            self.id_to_uid.append(doc_id)
         self.doc_metadata[doc_id] = (pscore, max_value, vector_norm)
+        self.uid_to_features[doc_id] = ids.tolist()
+        self._pending_pscore[doc_idx] = pscore
         self.doc_ids.add(doc_id)
         
-        # Build inverted index (ordered by decreasing value)
-        for i, (feature, value) in enumerate(sorted_features):
-            prefix_norm = prefix_norms.get(i, 0.0)
-            self.inverted_index[feature].append((doc_id, value, prefix_norm))
-            self.feature_freq[feature] += 1
+        # Stage postings; finalize() merges them into the sorted arrays
+        for feature_id, value, prefix_norm in zip(ids.tolist(), vals.tolist(), prefix_norms.tolist()):
+            self._pending[feature_id].append((doc_idx, value, prefix_norm))
+            self.feature_freq[feature_id] += 1
+    
+    def remove_document(self, doc_id: str):
+        """
+        Remove a document's postings and metadata from the index.
+        The internal document index is kept so a re-add reuses it.
+        
+        Args:
+            doc_id: Document identifier (user UID)
+        """
+        if doc_id not in self.doc_ids:
+            return
+        self.finalize()
+        doc_idx = self.uid_to_id[doc_id]
+        
+        for feature_id in self.uid_to_features.pop(doc_id, ()):
+            postings = self.inverted_index.get(feature_id)
+            if postings is None:
+                continue
+            doc_idxs, val_codes, prefix_norms = postings
+            keep = doc_idxs != doc_idx
+            if keep.all():
+                continue
+            if not keep.any():
+                del self.inverted_index[feature_id]
+            else:
+                self.inverted_index[feature_id] = (doc_idxs[keep], val_codes[keep], prefix_norms[keep])
+            self.feature_freq[feature_id] -= 1
+        
+        self.doc_metadata.pop(doc_id, None)
+        self.doc_ids.discard(doc_id)
+        self._pending_pscore.pop(doc_idx, None)
+        if doc_idx < len(self.doc_pscore):
+            self.doc_pscore[doc_idx] = 0.0
+    
+    def encode_values(self, values: List[float]) -> np.ndarray:
+        """
+        Map posting values to codes into val_codebook, adding new entries.
+        
+        Args:
+            values: Posting values (float32-exact)
+            
+        Returns:
+            Array of codes
+        """
+        codes = []
+        added = []
+        for value in values:
+            code = self._val_codes.get(value)
+            if code is None:
+                code = len(self._val_codes)
+                self._val_codes[value] = code
+                added.append(value)
+            codes.append(code)
+        
+        if added:
+            self.val_codebook = np.concatenate((self.val_codebook, np.array(added, dtype=np.float32)))
+            if len(self.val_codebook) > np.iinfo(self._code_dtype).max + 1:
+                self._code_dtype = np.uint16 if len(self.val_codebook) <= 1 << 16 else np.uint32
+                for feature_id, (doc_idxs, val_codes, prefix_norms) in self.inverted_index.items():
+                    self.inverted_index[feature_id] = (doc_idxs, val_codes.astype(self._code_dtype), prefix_norms)
+        return np.array(codes, dtype=self._code_dtype)
+    
+    def finalize(self):
+        """
+        Merge staged postings into the struct-of-arrays inverted index,
+        keeping each posting list sorted by decreasing value.
+        """
+        if not self._pending and not self._pending_pscore:
+            return
+        
+        # Grow the per-document arrays to cover newly interned documents
+        missing = len(self.id_to_uid) - len(self.doc_pscore)
+        if missing > 0:
+            self.doc_pscore = np.concatenate((self.doc_pscore, np.zeros(missing, dtype=np.float32)))
+        for doc_idx, pscore in self._pending_pscore.items():
+            self.doc_pscore[doc_idx] = pscore
+        self._pending_pscore.clear()
+        
+        for feature_id, postings in self._pending.items():
+            doc_idxs = np.fromiter((p[0] for p in postings), dtype=np.int32, count=len(postings))
+            val_codes = self.encode_values([p[1] for p in postings])
+            prefix_norms = np.fromiter((p[2] for p in postings), dtype=np.float32, count=len(postings))
+            
+            # Sort only the new postings (usually one, after a profile update)
+            neg_vals = -self.val_codebook[val_codes]
+            order = np.argsort(neg_vals, kind="stable")
+            doc_idxs, val_codes, prefix_norms = doc_idxs[order], val_codes[order], prefix_norms[order]
+            
+            existing = self.inverted_index.get(feature_id)
+            if existing is not None:
+                # Merge into the already-sorted list instead of re-sorting it;
+                # side="right" keeps existing postings ahead of equal new ones
+                positions = np.searchsorted(-self.val_codebook[existing[1]], neg_vals[order], side="right")
+                doc_idxs = np.insert(existing[0], positions, doc_idxs)
+                val_codes = np.insert(existing[1], positions, val_codes)
+                prefix_norms = np.insert(existing[2], positions, prefix_norms)
+            
+            self.inverted_index[feature_id] = (doc_idxs, val_codes, prefix_norms)
+        
+        self._pending.clear()
     
     def build_index(self, profiles: Dict[str, dict]):
         """
@@ -180,20 +485,276 @@ class L2APIndex:
         Args:
             profiles: Dictionary mapping doc_id -> profile_data
         """
+        self.feature_to_id.clear()
+        self.id_to_feature.clear()
+        self.uid_to_id.clear()
+        self.id_to_uid.clear()
         self.inverted_index.clear()
+        self.val_codebook = np.zeros(0, dtype=np.float32)
+        self._val_codes.clear()
+        self._code_dtype = np.uint8
+        self._pending.clear()
+        self._pending_pscore.clear()
         self.doc_metadata.clear()
+        self.uid_to_features.clear()
+        self.doc_pscore = np.zeros(0, dtype=np.float32)
         self.feature_freq.clear()
         self.doc_ids.clear()
+        self.lsh = None
         
-        # Add all documents
+        # Flatten every document's (feature id, value) pairs; this is the only
+        # per-document Python work, everything below is bulk NumPy
+        doc_uids: List[str] = []
+        lengths: List[int] = []
+        feature_ids: List[int] = []
+        values: List[float] = []
         for doc_id, profile_data in profiles.items():
             vector = get_profile_vector(profile_data)
-            if vector:
-                self.add_document(doc_id, vector)
+            if not vector:
+                continue
+            doc_uids.append(doc_id)
+            lengths.append(len(vector))
+            feature_ids.extend(self.get_feature_id(feature) for feature in vector)
+            values.extend(vector.values())
+        
+        if not doc_uids:
+            return
+        
+        n_docs = len(doc_uids)
+        feature_ids = np.array(feature_ids, dtype=np.int32)
+        vals = np.array(values, dtype=np.float32)
+        doc_of = np.repeat(np.arange(n_docs, dtype=np.int32), lengths)
+        doc_starts = np.zeros(n_docs, dtype=np.int64)
+        np.cumsum(lengths[:-1], out=doc_starts[1:])
+        
+        # Within each document, order features by decreasing value (stable)
+        order = np.lexsort((-vals, doc_of))
+        feature_ids, vals = feature_ids[order], vals[order]
+        
+        # Segmented prefix norms: global cumsum minus each document's offset
+        running_sq = np.cumsum(vals.astype(np.float64) ** 2)
+        before_doc = np.concatenate(([0.0], running_sq))[doc_starts]
+        prefix_norms = np.sqrt(running_sq - before_doc[doc_of]).astype(np.float32)
+        doc_ends = doc_starts + np.asarray(lengths) - 1
+        doc_norms = prefix_norms[doc_ends]
+        doc_max_values = vals[doc_starts]
+        doc_pscores = np.maximum.reduceat(vals * prefix_norms, doc_starts)
+        
+        # Intern documents and store metadata, skipping all-zero vectors
+        # like add_document does
+        kept = np.flatnonzero(doc_norms > 0)
+        flat_features = feature_ids.tolist()
+        for doc_idx, lo, hi, pscore, max_value, norm in zip(
+            kept.tolist(), doc_starts[kept].tolist(), (doc_ends[kept] + 1).tolist(),
+            doc_pscores[kept].tolist(), doc_max_values[kept].tolist(), doc_norms[kept].tolist()
+        ):
+            doc_id = doc_uids[doc_idx]
+            self.uid_to_id[doc_id] = len(self.id_to_uid)
+            self.id_to_uid.append(doc_id)
+            self.doc_ids.add(doc_id)
+            self.doc_metadata[doc_id] = (pscore, max_value, norm)
+            self.uid_to_features[doc_id] = flat_features[lo:hi]
+        self.doc_pscore = doc_pscores[kept].astype(np.float32)
+        internal_ids = np.full(n_docs, -1, dtype=np.int32)
+        internal_ids[kept] = np.arange(len(kept), dtype=np.int32)
+        
+        posting_docs = internal_ids[doc_of]
+        live = posting_docs >= 0
+        feature_ids, vals, prefix_norms, posting_docs = (
+            feature_ids[live], vals[live], prefix_norms[live], posting_docs[live]
+        )
+        
+        # Group postings by feature, decreasing value, ties in document order
+        order = np.lexsort((-vals, feature_ids))
+        feature_ids, vals = feature_ids[order], vals[order]
+        prefix_norms, posting_docs = prefix_norms[order], posting_docs[order]
+        
+        codebook, val_codes = np.unique(vals, return_inverse=True)
+        self.val_codebook = codebook.astype(np.float32)
+        self._val_codes = {value: code for code, value in enumerate(self.val_codebook.tolist())}
+        if len(codebook) > 1 << 16:
+            self._code_dtype = np.uint32
+        elif len(codebook) > 1 << 8:
+            self._code_dtype = np.uint16
+        val_codes = val_codes.astype(self._code_dtype)
+        
+        # Each posting list is a view into the grouped arrays
+        features, starts, counts = np.unique(feature_ids, return_index=True, return_counts=True)
+        for feature_id, lo, count in zip(features.tolist(), starts.tolist(), counts.tolist()):
+            hi = lo + count
+            self.inverted_index[feature_id] = (posting_docs[lo:hi], val_codes[lo:hi], prefix_norms[lo:hi])
+            self.feature_freq[feature_id] = count
+        
+        if self.lsh_enabled_for(len(self.id_to_uid)):
+            doc_feature_offsets = np.zeros(len(kept) + 1, dtype=np.int64)
+            np.cumsum(np.asarray(lengths)[kept], out=doc_feature_offsets[1:])
+            self.build_lsh(np.array([f for features in self.uid_to_features.values() for f in features], dtype=np.int32),
+                           doc_feature_offsets)
+    
+    def lsh_enabled_for(self, n_docs: int) -> bool:
+        """Whether the opt-in LSH prefilter should be built for an index of n_docs documents."""
+        return self.lsh_min_docs is not None and n_docs >= self.lsh_min_docs
+    
+    def build_lsh(self, doc_feature_ids: np.ndarray, doc_feature_offsets: np.ndarray):
+        """
+        Build the MinHash-LSH prefilter from documents' feature ids in CSR
+        form (document order = internal doc index).
+        """
+        self.lsh = MinHashLSH()
+        self.lsh.build(len(self.id_to_feature), doc_feature_ids, doc_feature_offsets)
+        logger.info(f"Built MinHash-LSH prefilter over {len(self.id_to_uid)} profiles "
+                    f"({self.lsh.bands} bands x {self.lsh.rows} rows)")
+    
+    def save(self, directory: str, snapshot_at: float, profiles_marker: Optional[float] = None):
+        """
+        Write the index as CSR-style .npy arrays plus a JSON sidecar with the
+        feature/uid tables, so load() can memory-map it.
+        
+        Args:
+            directory: Snapshot directory
+            snapshot_at: Epoch seconds; profile writes before this are in the index
+            profiles_marker: profiles_dirty_at value the index was built from
+        """
+        self.finalize()
+        n_features = len(self.id_to_feature)
+        n_docs = len(self.id_to_uid)
+        
+        # Postings concatenated in feature id order with CSR offsets
+        counts = np.zeros(n_features, dtype=np.int64)
+        parts = []
+        for feature_id in sorted(self.inverted_index):
+            postings = self.inverted_index[feature_id]
+            counts[feature_id] = len(postings[0])
+            parts.append(postings)
+        feature_offsets = np.zeros(n_features + 1, dtype=np.int64)
+        np.cumsum(counts, out=feature_offsets[1:])
+        
+        doc_max_values = np.zeros(n_docs, dtype=np.float32)
+        doc_norms = np.zeros(n_docs, dtype=np.float32)
+        for doc_id, (_, max_value, norm) in self.doc_metadata.items():
+            doc_idx = self.uid_to_id[doc_id]
+            doc_max_values[doc_idx] = max_value
+            doc_norms[doc_idx] = norm
+        
+        doc_features = [self.uid_to_features.get(uid, []) for uid in self.id_to_uid]
+        doc_feature_offsets = np.zeros(n_docs + 1, dtype=np.int64)
+        np.cumsum([len(f) for f in doc_features], out=doc_feature_offsets[1:])
+        
+        arrays = {
+            "posting_doc_ids": np.concatenate([p[0] for p in parts]) if parts else np.zeros(0, dtype=np.int32),
+            "posting_val_codes": np.concatenate([p[1] for p in parts]) if parts else np.zeros(0, dtype=self._code_dtype),
+            "val_codebook": self.val_codebook,
+            "posting_prefix_norms": np.concatenate([p[2] for p in parts]) if parts else np.zeros(0, dtype=np.float32),
+            "feature_offsets": feature_offsets,
+            "doc_pscore": self.doc_pscore,
+            "doc_max_values": doc_max_values,
+            "doc_norms": doc_norms,
+            "doc_feature_ids": np.fromiter(
+                (f for features in doc_features for f in features), dtype=np.int32, count=int(doc_feature_offsets[-1])
+            ),
+            "doc_feature_offsets": doc_feature_offsets,
+        }
+        meta = {
+            "snapshot_at": snapshot_at,
+            "profiles_marker": profiles_marker,
+            "features": self.id_to_feature,
+            "uids": self.id_to_uid,
+            "n_postings": int(feature_offsets[-1]),
+        }
+        
+        # Each file is swapped in atomically; the sidecar goes last and load()
+        # checks the array shapes against it, so a torn write is ignored
+        os.makedirs(directory, exist_ok=True)
+        for name, array in arrays.items():
+            path = os.path.join(directory, f"{name}.npy")
+            with open(path + ".tmp", "wb") as f:
+                np.save(f, array)
+            os.replace(path + ".tmp", path)
+        meta_path = os.path.join(directory, INDEX_META_FILE)
+        with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(meta_path + ".tmp", meta_path)
+    
+    @classmethod
+    def load(cls, directory: str) -> Optional[Tuple["L2APIndex", float, Optional[float]]]:
+        """
+        Load a snapshot written by save(). Posting arrays stay memory-mapped
+        (read-only); posting lists changed later are replaced by in-memory copies.
+        
+        Args:
+            directory: Snapshot directory
+            
+        Returns:
+            (index, snapshot_at, profiles_marker) or None if there is no usable snapshot
+        """
+        meta_path = os.path.join(directory, INDEX_META_FILE)
+        if not os.path.exists(meta_path):
+            return None
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            arrays = {
+                name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+                for name in INDEX_ARRAYS
+            }
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable index snapshot in {directory}: {e}")
+            return None
+        
+        if "profiles_marker" not in meta:
+            # Written before snapshots recorded the marker, so its freshness is unknown
+            logger.warning(f"Ignoring index snapshot without a profile change marker in {directory}")
+            return None
+        
+        n_features = len(meta["features"])
+        n_docs = len(meta["uids"])
+        if (len(arrays["feature_offsets"]) != n_features + 1
+                or len(arrays["posting_doc_ids"]) != meta["n_postings"]
+                or len(arrays["posting_val_codes"]) != meta["n_postings"]
+                or len(arrays["doc_pscore"]) != n_docs
+                or len(arrays["doc_feature_offsets"]) != n_docs + 1):
+            logger.warning(f"Ignoring inconsistent index snapshot in {directory}")
+            return None
         
-        # Sort inverted index postings by decreasing value (for efficiency)
-        for feature in self.inverted_index:
-            self.inverted_index[feature].sort(key=lambda x: x[1], reverse=True)
+        index = cls()
+        index.id_to_feature = [sys.intern(feature) for feature in meta["features"]]
+        index.feature_to_id = {feature: i for i, feature in enumerate(index.id_to_feature)}
+        index.id_to_uid = list(meta["uids"])
+        index.uid_to_id = {uid: i for i, uid in enumerate(index.id_to_uid)}
+        
+        offsets = arrays["feature_offsets"]
+        for feature_id in np.flatnonzero(np.diff(offsets)).tolist():
+            lo, hi = int(offsets[feature_id]), int(offsets[feature_id + 1])
+            index.inverted_index[feature_id] = (
+                arrays["posting_doc_ids"][lo:hi],
+                arrays["posting_val_codes"][lo:hi],
+                arrays["posting_prefix_norms"][lo:hi],
+            )
+            index.feature_freq[feature_id] = hi - lo
+        
+        index.val_codebook = np.array(arrays["val_codebook"])
+        index._val_codes = {value: code for code, value in enumerate(index.val_codebook.tolist())}
+        index._code_dtype = arrays["posting_val_codes"].dtype.type
+        
+        # doc_pscore is written to on removal, so it gets a private copy
+        index.doc_pscore = np.array(arrays["doc_pscore"])
+        doc_feature_ids = arrays["doc_feature_ids"]
+        doc_feature_offsets = arrays["doc_feature_offsets"].tolist()
+        for doc_idx in np.flatnonzero(arrays["doc_norms"]).tolist():
+            doc_id = index.id_to_uid[doc_idx]
+            index.doc_ids.add(doc_id)
+            index.doc_metadata[doc_id] = (
+                float(index.doc_pscore[doc_idx]),
+                float(arrays["doc_max_values"][doc_idx]),
+                float(arrays["doc_norms"][doc_idx]),
+            )
+            lo, hi = doc_feature_offsets[doc_idx], doc_feature_offsets[doc_idx + 1]
+            index.uid_to_features[doc_id] = doc_feature_ids[lo:hi].tolist()
+        
+        if index.lsh_enabled_for(len(index.doc_ids)):
+            index.build_lsh(doc_feature_ids, arrays["doc_feature_offsets"])
+        
+        return index, float(meta["snapshot_at"]), meta["profiles_marker"]
     
     def get_ordered_features(self, vector: Dict[str, float]) -> List[Tuple[str, float]]:
         """
@@ -212,6 +773,55 @@ class L2APIndex:
 # 3. L2AP k-NN Query
 # ─────────────────────────
 
+def _accumulate_postings(doc_idxs, doc_val_codes, val_codebook, doc_prefix_norms, query_value, rs4, theta,
+                         admit_new, exclude_mask, accumulator):
+    """
+    Accumulate one query feature's postings into the dense accumulator,
+    applying the rs4 admit/drop bounds per posting. New candidates are
+    only admitted when admit_new is set; documents flagged in exclude_mask
+    are skipped. Compiled with numba when it is installed.
+    """
+    for j in range(doc_idxs.shape[0]):
+        doc_idx = doc_idxs[j]
+        if exclude_mask[doc_idx]:
+            continue
+        remaining_bound = rs4 * doc_prefix_norms[j]
+        
+        # New candidates must be able to reach theta (Cauchy-Schwarz)
+        if accumulator[doc_idx] == 0 and (not admit_new or remaining_bound < theta):
+            continue
+        
+        accumulator[doc_idx] += query_value * val_codebook[doc_val_codes[j]]
+        
+        # Early pruning: if current score + remaining bound < theta, drop
+        if accumulator[doc_idx] + remaining_bound < theta:
+            accumulator[doc_idx] = 0
+
+
+if njit is not None:
+    _accumulate_postings_kernel = njit(cache=True, fastmath=True, nogil=True)(_accumulate_postings)
+else:
+    _accumulate_postings_kernel = None
+
+
+def warm_up_kernel():
+    """
+    Compile the numba accumulation kernel ahead of the first query.
+    No-op when numba is not installed.
+    """
+    if _accumulate_postings_kernel is None:
+        return
+    _accumulate_postings_kernel(
+        np.zeros(1, dtype=np.int32),
+        np.zeros(1, dtype=np.uint8),
+        np.ones(1, dtype=np.float32),
+        np.ones(1, dtype=np.float32),
+        1.0, 1.0, 0.5, True,
+        np.zeros(1, dtype=np.bool_),
+        np.zeros(1, dtype=np.float32)
+    )
+
+
 def l2ap_knn(
     query_vector: Dict[str, float],
     index: L2APIndex,
@@ -220,7 +830,7 @@ def l2ap_knn(
     exclude_doc_ids: Optional[Set[str]] = None
 ) -> List[Tuple[str, float]]:
     """
-    Find k nearest neighbors using L2AP algorithm with dynamic threshold.
+    Find k nearest neighbors using L2AP algorithm.
     
     Args:
         query_vector: Query vector (normalized)
@@ -232,76 +842,128 @@ def l2ap_knn(
     Returns:
         List of (doc_id, similarity) tuples, sorted by similarity (descending)
     """
-    if not query_vector:
+    if not query_vector or k <= 0:
         return []
     
     if exclude_doc_ids is None:
         exclude_doc_ids = set()
     
-    # Initialize heap (min-heap of size k)
-    heap: List[Tuple[float, str]] = []  # (similarity, doc_id) - min-heap
+    index.finalize()
     
-    # Dynamic threshold: starts at t_min, updates to kth best
+    # Pruning threshold
     theta = t_min
     
-    # Accumulator for candidate scores
-    accumulator: Dict[str, float] = defaultdict(float)
+    # Dense accumulator for candidate scores and exclusion mask, indexed by
+    # internal doc index. Both are reused across queries; only the entries
+    # this query set are reset.
+    scratch = index.scratch_buffers()
+    accumulator = scratch.scores
+    exclude_mask = scratch.exclude_mask
+    touched: List[np.ndarray] = []
+    
+    # Excluded documents are masked out before they ever reach the accumulator
+    excluded = [index.uid_to_id[doc_id] for doc_id in exclude_doc_ids if doc_id in index.uid_to_id]
+    exclude_mask[excluded] = True
+    filter_excluded = bool(excluded)
     
-    # Get query features ordered by decreasing value (suffix to prefix)
-    query_features = index.get_ordered_features(query_vector)
+    # Query features (unknown ones map to -1 but still count towards the norms)
+    query_ids, query_vals = index.vectorize(query_vector)
     
-    # Calculate remaining prefix norms for query (rs₄)
-    query_prefix_norms = {}
-    running_norm_sq = 0.0
-    for i, (feature, value) in enumerate(query_features):
-        running_norm_sq += value * value
-        query_prefix_norms[i] = math.sqrt(running_norm_sq)
+    if index.lsh is not None:
+        # Large index: only score documents the LSH prefilter returns. This
+        # mask is per-query, so the scratch one is restored right away and
+        # nothing needs resetting afterwards.
+        lsh_exclude = ~index.lsh.candidates(query_ids, len(index.id_to_uid))
+        lsh_exclude |= exclude_mask
+        exclude_mask[excluded] = False
+        exclude_mask = lsh_exclude
+        excluded = []
+        filter_excluded = True
+    query_postings = [index.inverted_index.get(feature_id) for feature_id in query_ids.tolist()]
     
-    # Reverse to get suffix norms (remaining norm after position i)
-    query_suffix_norms = {}
-    total_norm_sq = sum(v * v for v in query_vector.values())
-    running_suffix_sq = total_norm_sq
-    for i, (feature, value) in enumerate(query_features):
-        query_suffix_norms[i] = math.sqrt(running_suffix_sq)
-        running_suffix_sq -= value * value
+    # MaxScore bounds: a feature adds at most query_value * its largest
+    # posting value (postings are sorted, so that's the first one). Process
+    # features by decreasing max contribution.
+    max_contributions = np.array(
+        [0.0 if postings is None else query_value * float(index.val_codebook[postings[1][0]])
+         for query_value, postings in zip(query_vals.tolist(), query_postings)],
+        dtype=np.float32
+    )
+    order = np.argsort(-max_contributions, kind="stable")
+    query_vals = query_vals[order]
+    query_postings = [query_postings[i] for i in order.tolist()]
+    remaining_max = np.cumsum(max_contributions[order][::-1])[::-1]
+    
+    # Suffix norms (rs₄): remaining norm from position i onwards
+    query_sq = query_vals * query_vals
+    query_suffix_norms = np.sqrt(np.cumsum(query_sq[::-1])[::-1])
     
     # ─────────────────────────
     # Candidate Generation Phase
     # ─────────────────────────
     
-    for i, (query_feature, query_value) in enumerate(query_features):
-        # Remaining suffix norm bound (rs₄)
-        rs4 = query_suffix_norms.get(i, 0.0)
-        
+    # Upper bound on any accumulated score so far
+    best_partial = 0.0
+    
+    for postings, query_value, rs4, remaining in zip(
+        query_postings, query_vals.tolist(), query_suffix_norms.tolist(), remaining_max.tolist()
+    ):
         # Prune if remaining norm can't reach theta (Cauchy-Schwarz)
         if rs4 < theta:
             break
         
+        if theta > 0 and best_partial + remaining < theta:
+            # No candidate, seen or unseen, can still reach theta
+            if touched:
+                accumulator[np.concatenate(touched)] = 0
+            exclude_mask[excluded] = False
+            return []
+        
         # Process postings for this feature
-        if query_feature not in index.inverted_index:
+        if postings is None:
             continue
+        doc_idxs, doc_val_codes, doc_prefix_norms = postings
         
-        for doc_id, doc_value, doc_prefix_norm in index.inverted_index[query_feature]:
-            if doc_id in exclude_doc_ids:
-                continue
-            
-            # Check if this is a new candidate
-            is_new_candidate = doc_id not in accumulator or accumulator[doc_id] == 0
-            
-            if is_new_candidate:
-                # Check if candidate can reach theta using remaining suffix bound
-                # Using Cauchy-Schwarz: remaining similarity ≤ rs4 * ||doc_prefix||₂
-                if rs4 * doc_prefix_norm < theta:
-                    continue
-            
-            # Accumulate dot product
-            accumulator[doc_id] += query_value * doc_value
-            
+        # Documents first seen here score at most the remaining max contributions
+        admit_new = remaining >= theta
+        
+        if _accumulate_postings_kernel is not None:
+            _accumulate_postings_kernel(
+                doc_idxs, doc_val_codes, index.val_codebook, doc_prefix_norms,
+                query_value, rs4, theta, admit_new, exclude_mask, accumulator
+            )
+            touched.append(doc_idxs)
+            if theta > 0:
+                best_partial = max(best_partial, float(accumulator[doc_idxs].max()))
+            continue
+        
+        if filter_excluded:
+            allowed = ~exclude_mask[doc_idxs]
+            doc_idxs = doc_idxs[allowed]
+            doc_val_codes = doc_val_codes[allowed]
+            doc_prefix_norms = doc_prefix_norms[allowed]
+        
+        if theta > 0:
+            # Remaining similarity ≤ rs4 * ||doc_prefix||₂ (Cauchy-Schwarz);
+            # new candidates that can't reach theta are not admitted
+            remaining_bound = rs4 * doc_prefix_norms
+            admit = accumulator[doc_idxs] != 0
+            if admit_new:
+                admit |= remaining_bound >= theta
+            doc_idxs = doc_idxs[admit]
+            doc_val_codes = doc_val_codes[admit]
+            remaining_bound = remaining_bound[admit]
+        
+        # Accumulate dot product (doc indices are unique within a posting list)
+        accumulator[doc_idxs] += query_value * index.val_codebook[doc_val_codes]
+        touched.append(doc_idxs)
+        
+        if theta > 0:
             # Early pruning: if current score + remaining bound < theta, drop
-            # Using Cauchy-Schwarz bound for remaining features
-            remaining_bound = rs4 * doc_prefix_norm
-            if accumulator[doc_id] + remaining_bound < theta:
-                accumulator[doc_id] = 0  # Mark for removal
+            dropped = accumulator[doc_idxs] + remaining_bound < theta
+            accumulator[doc_idxs[dropped]] = 0
+            if len(doc_idxs):
+                best_partial = max(best_partial, float(accumulator[doc_idxs].max()))
     
     # ─────────────────────────
     # Verification Phase
@@ -309,45 +971,33 @@ def l2ap_knn(
     
     # The accumulator already contains the full dot product from candidate generation
     # We just need to verify and apply final pruning
+    touched = np.unique(np.concatenate(touched)) if touched else np.zeros(0, dtype=np.int32)
+    candidates = touched[accumulator[touched] != 0]
     
-    for doc_id, dot_product in accumulator.items():
-        if doc_id in exclude_doc_ids:
-            continue
-        
-        if dot_product == 0:
-            continue
-        
-        # Get document metadata
-        if doc_id not in index.doc_metadata:
-            continue
-        
-        pscore, max_value, doc_norm = index.doc_metadata[doc_id]
-        
-        # Pscore filtering: if current score + pscore < theta, can't reach threshold
-        if dot_product + pscore < theta:
-            continue
-        
-        # For unit-normalized vectors, dot product = cosine similarity
-        similarity = dot_product
-        
-        # Additional pruning: check if we can still improve
-        # Using Cauchy-Schwarz: dot(x,y) ≤ ||x||₂ · ||y||₂
-        # Since vectors are unit-normalized, this is always ≤ 1
-        # But we can use tighter bounds if needed
-        
-        # Update heap
-        if len(heap) < k:
-            heapq.heappush(heap, (similarity, doc_id))
-            if len(heap) == k:
-                theta = max(theta, heap[0][0])  # Update theta to kth best
-        elif similarity > heap[0][0]:
-            heapq.heapreplace(heap, (similarity, doc_id))
-            theta = heap[0][0]  # Update theta to new kth best
+    # For unit-normalized vectors, dot product = cosine similarity
+    scores = accumulator[candidates]
+    
+    # Reset the shared buffers for the next query: O(touched), not O(n_docs)
+    accumulator[touched] = 0
+    exclude_mask[excluded] = False
+    
+    # Pscore filtering: if current score + pscore < theta, can't reach threshold
+    reachable = scores + index.doc_pscore[candidates] >= theta
+    candidates = candidates[reachable]
+    scores = scores[reachable]
+    
+    # Top-k selection: partition out the k best, then sort only those
+    if len(scores) > k:
+        top = np.argpartition(scores, -k)[-k:]
+    else:
+        top = np.arange(len(scores))
+    order = top[np.argsort(-scores[top], kind="stable")]
     
     # Return results sorted by similarity (descending)
-    results = [(doc_id, sim) for sim, doc_id in heap]
-    results.sort(key=lambda x: x[1], reverse=True)
-    return results
+    return [
+        (index.id_to_uid[doc_idx], similarity)
+        for doc_idx, similarity in zip(candidates[order].tolist(), scores[order].tolist())
+    ]
 
 
 # ─────────────────────────
@@ -364,7 +1014,18 @@ class ProfileMatchingService:
         self.index = L2APIndex()
         self.index_built = False
         self.index_built_at = None  # Timestamp when index was last built
-        self.index_ttl_seconds = 30  # Rebuild index every 30 seconds to catch updates
+        self.index_ttl_seconds = 30  # Re-check for profile changes every 30 seconds
+        self.index_synced_at = None  # Epoch seconds; profile writes before this are in the index
+        self.index_marker = None  # profiles_dirty_at value the index was built from
+        self.snapshot_dir = INDEX_SNAPSHOT_DIR
+        
+        # Query vectors per uid: uid -> (vector, cached_at), LRU-bounded
+        self._query_vec_cache: "OrderedDict[str, Tuple[Dict[str, float], float]]" = OrderedDict()
+        self.query_vec_ttl_seconds = 60
+        self.query_vec_cache_size = 1024
+        self._query_vec_lock = threading.Lock()
+        
+        warm_up_kernel()
     
     def invalidate_index(self):
         """
@@ -383,42 +1044,29 @@ class ProfileMatchingService:
             uid: User UID
             profile_data: User profile dictionary from Firestore
         """
+        # The user's cached query vector is stale now. The caller's users
+        # write has already bumped profiles_dirty_at for other instances.
+        with self._query_vec_lock:
+            self._query_vec_cache.pop(uid, None)
+        
         if not self.index_built:
             # If index not built, rebuild it
             self.rebuild_index()
             return
         
         # Remove old entry if it exists
-        if uid in self.index.doc_ids:
-            # Remove from inverted index
-            for feature in list(self.index.inverted_index.keys()):
-                self.index.inverted_index[feature] = [
-                    (doc_id, val, pnorm) 
-                    for doc_id, val, pnorm in self.index.inverted_index[feature]
-                    if doc_id != uid
-                ]
-                if not self.index.inverted_index[feature]:
-                    del self.index.inverted_index[feature]
-            
-            # Remove from metadata
-            if uid in self.index.doc_metadata:
-                del self.index.doc_metadata[uid]
-            self.index.doc_ids.discard(uid)
+        self.index.remove_document(uid)
         
         # Add new entry
         vector = get_profile_vector(profile_data)
         if vector:
             self.index.add_document(uid, vector)
-            # Re-sort affected features in inverted index to maintain order
-            for feature in vector.keys():
-                if feature in self.index.inverted_index:
-                    self.index.inverted_index[feature].sort(key=lambda x: x[1], reverse=True)
-            logger.debug(f"Updated user {uid} in matching index")
+            # Merge the new postings into the sorted posting arrays
+            self.index.finalize()
+            logger.debug("Updated user %s in matching index", uid)
         
-        # Invalidate index when interests change to ensure all queries see the latest data
-        # This forces a rebuild on the next query, ensuring consistency
-        # The TTL is a fallback for catching other types of updates
-        self.invalidate_index()
+        # The incremental update is authoritative for this instance; the TTL
+        # rebuild only catches profile writes made outside this process
     
     def rebuild_index(self):
         """
@@ -426,12 +1074,23 @@ class ProfileMatchingService:
         """
         try:
             logger.info("Building L2AP index from Firestore...")
-            users_ref = db.collection("users")
+            started_at = time.time()
+            # Read the marker before the profiles: a write landing during the
+            # stream bumps it again, so the next TTL check rebuilds
+            try:
+                marker = self._read_profiles_marker()
+            except Exception as e:
+                # None only matches a marker that was never bumped; the max age still applies
+                logger.warning(f"Could not read profile change marker: {e}")
+                marker = None
+            # Only "interests" is projected: get_profile_vector reads nothing
+            # else. Add any new field the index depends on to this select().
+            users_query = db.collection("users").select(["interests"])
             profiles = {}
             users_with_interests = 0
             users_without_interests = 0
             
-            for doc in users_ref.stream():
+            for doc in users_query.stream():
                 profile_data = doc.to_dict()
                 uid = doc.id
                 profiles[uid] = profile_data
@@ -439,36 +1098,133 @@ class ProfileMatchingService:
                 interests = profile_data.get("interests", [])
                 if interests and len(interests) > 0:
                     users_with_interests += 1
-                    logger.debug(f"User {uid} has {len(interests)} interests: {interests}")
+                    logger.debug("User %s has %d interests: %s", uid, len(interests), interests)
                 else:
                     users_without_interests += 1
             
-            logger.debug(f"Found {len(profiles)} total users: {users_with_interests} with interests, {users_without_interests} without")
+            logger.debug("Found %d total users: %d with interests, %d without", len(profiles), users_with_interests, users_without_interests)
             
             self.index.build_index(profiles)
             self.index_built = True
             self.index_built_at = time.time()
+            self.index_synced_at = started_at
+            self.index_marker = marker
             logger.info(f"Index built successfully with {len(self.index.doc_ids)} profiles (users with valid interest vectors)")
         except Exception as e:
             logger.error(f"Error building index: {e}", exc_info=True)
             raise DatabaseError(f"Failed to build matching index: {e}")
+        
+        # Best-effort: a missing snapshot only costs the next cold start a rebuild
+        try:
+            self.index.save(self.snapshot_dir, started_at, marker)
+        except OSError as e:
+            logger.warning(f"Could not write index snapshot to {self.snapshot_dir}: {e}")
+    
+    def _load_snapshot(self) -> bool:
+        """
+        Load the on-disk index snapshot if it is within the max age and no
+        profile changed since it was taken.
+        
+        Returns:
+            True if the snapshot is now the live index
+        """
+        loaded = L2APIndex.load(self.snapshot_dir)
+        if loaded is None:
+            return False
+        index, snapshot_at, marker = loaded
+        if time.time() - snapshot_at > INDEX_MAX_AGE_SECONDS:
+            logger.debug("Index snapshot is past the max age, ignoring it")
+            return False
+        if not self._profiles_unchanged(marker):
+            logger.debug("Profiles changed since the index snapshot was taken, ignoring it")
+            return False
+        
+        self.index = index
+        self.index_built = True
+        self.index_built_at = time.time()
+        self.index_synced_at = snapshot_at
+        self.index_marker = marker
+        logger.info(f"Index loaded from snapshot with {len(index.doc_ids)} profiles")
+        return True
+    
+    def _read_profiles_marker(self) -> Optional[float]:
+        """Current profiles_dirty_at value as server epoch seconds (None if it was never bumped)."""
+        marker = db.collection(PROFILES_DIRTY_DOC[0]).document(PROFILES_DIRTY_DOC[1]).get()
+        updated_at = marker.to_dict().get("updated_at") if marker.exists else None
+        return updated_at.timestamp() if updated_at is not None else None
+    
+    def _profiles_unchanged(self, built_marker: Optional[float]) -> bool:
+        """
+        Check whether the profiles_dirty_at marker (a single document read)
+        still holds the value an index was built from. Both values are
+        Firestore server timestamps, so the local clock plays no part.
+        Any read error counts as changed, so callers fall back to a rebuild.
+        """
+        try:
+            return self._read_profiles_marker() == built_marker
+        except Exception as e:
+            logger.warning(f"Could not read profile change marker: {e}")
+            return False
     
     def _should_rebuild_index(self) -> bool:
         """
-        Check if index should be rebuilt based on TTL or if not built.
+        Check if index should be rebuilt. On a cold start the on-disk
+        snapshot is tried first. Once the TTL expires the profile change
+        marker is checked, and the index is only rebuilt if profiles changed
+        or the index is past INDEX_MAX_AGE_SECONDS.
         """
         if not self.index_built:
-            return True
+            return not self._load_snapshot()
         
-        # Rebuild if index is older than TTL
+        # Re-check if index is older than TTL
         if self.index_built_at is not None:
             age_seconds = time.time() - self.index_built_at
             if age_seconds > self.index_ttl_seconds:
-                logger.debug(f"Index is {age_seconds:.1f}s old (TTL: {self.index_ttl_seconds}s), rebuilding...")
+                if self.index_synced_at is None or time.time() - self.index_synced_at > INDEX_MAX_AGE_SECONDS:
+                    logger.debug("Index is past the max age (%ds), rebuilding...", INDEX_MAX_AGE_SECONDS)
+                    return True
+                if self._profiles_unchanged(self.index_marker):
+                    self.index_built_at = time.time()
+                    return False
+                logger.debug("Index is %.1fs old (TTL: %ss) and profiles changed, rebuilding...", age_seconds, self.index_ttl_seconds)
                 return True
         
         return False
     
+    def _get_query_vector(self, uid: str) -> Optional[Dict[str, float]]:
+        """
+        Get a user's interest vector, served from a short-lived LRU cache so
+        repeated queries (e.g. pagination) skip the Firestore read.
+        
+        Args:
+            uid: User UID
+            
+        Returns:
+            Normalized interest vector, or None if the user doesn't exist
+        """
+        now = time.time()
+        with self._query_vec_lock:
+            cached = self._query_vec_cache.get(uid)
+            if cached is not None and now - cached[1] < self.query_vec_ttl_seconds:
+                self._query_vec_cache.move_to_end(uid)
+                return cached[0]
+        
+        user_doc = db.collection("users").document(uid).get()
+        if not user_doc.exists:
+            return None
+        
+        profile_data = user_doc.to_dict()
+        interests = profile_data.get("interests", [])
+        logger.debug("User %s has %d interests: %s", uid, len(interests), interests)
+        vector = get_profile_vector(profile_data)
+        
+        with self._query_vec_lock:
+            self._query_vec_cache[uid] = (vector, now)
+            self._query_vec_cache.move_to_end(uid)
+            while len(self._query_vec_cache) > self.query_vec_cache_size:
+                self._query_vec_cache.popitem(last=False)
+        return vector
+    
     def find_matches(
         self,
         query_uid: str,
@@ -494,31 +1250,23 @@ class ProfileMatchingService:
         
         # Get query user's profile
         try:
-            user_ref = db.collection("users").document(query_uid)
-            user_doc = user_ref.get()
-            
-            if not user_doc.exists:
+            query_vector = self._get_query_vector(query_uid)
+            if query_vector is None:
                 logger.warning(f"User {query_uid} not found in Firestore")
                 return []
             
-            profile_data = user_doc.to_dict()
-            interests = profile_data.get("interests", [])
-            logger.debug(f"User {query_uid} has {len(interests)} interests: {interests}")
-            
-            query_vector = get_profile_vector(profile_data)
-            
             if not query_vector:
-                logger.debug(f"User {query_uid} has no valid interests vector (empty or invalid interests)")
+                logger.debug("User %s has no valid interests vector (empty or invalid interests)", query_uid)
                 return []
             
-            logger.debug(f"Query vector has {len(query_vector)} features: {list(query_vector.keys())[:5]}")
-            logger.debug(f"Index contains {len(self.index.doc_ids)} users")
+            logger.debug("Query vector has %d features: %s", len(query_vector), list(query_vector)[:5])
+            logger.debug("Index contains %d users", len(self.index.doc_ids))
             
             # Find matches
             exclude_set = {query_uid} if exclude_self else set()
             matches = l2ap_knn(query_vector, self.index, k, t_min, exclude_set)
             
-            logger.debug(f"L2AP returned {len(matches)} matches")
+            logger.debug("L2AP returned %d matches", len(matches))
             return matches
             
         except Exception as e:
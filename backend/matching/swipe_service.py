@@ -4,12 +4,16 @@ Service for handling user swipes and mutual matches.
 
 import firebase_admin
 from firebase_admin import firestore
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Optional, Set
+from typing import List, Dict, Optional, Set, Tuple
 import os
+import time
+import redis
 
 from ..utils.logging_utils import get_logger, log_user_action
 from ..exceptions import ValidationError, DatabaseError
+from ..messaging.service import get_redis
 
 logger = get_logger(__name__)
 
@@ -30,9 +34,119 @@ except (ImportError, AttributeError):
     db = firestore.client()
 
 
+# Written by backfill_match_participants once every match has participants;
+# while it is unset the flag is re-read at most this often
+MATCH_BACKFILL_DOC = ("meta", "match_participants_backfilled")
+MATCH_BACKFILL_RECHECK_SECONDS = 60
+
+# Shared pool for independent Firestore queries run side by side; threads
+# start lazily and idle ones are joined at interpreter exit
+_QUERY_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.getenv("SWIPE_EXECUTOR_WORKERS", "16")), thread_name_prefix="swipes"
+)
+
+
+def _swipes_key(user_uid: str) -> str:
+    """Redis set mirroring the UIDs user_uid has swiped on."""
+    return f"swipes:{user_uid}"
+
+
+# TTL shared by swipes:{uid} and seeded:{uid}. Both are always set and
+# refreshed together, so the flag can't outlive the set it vouches for and
+# a lost set falls back to the Firestore swipe index.
+SWIPE_CACHE_TTL = 24 * 3600
+
+
+def _seeded_key(user_uid: str) -> str:
+    """Redis flag set once swipes:{uid} holds every swipe of the user."""
+    return f"seeded:{user_uid}"
+
+
+# Swiped uids are kept in a private index the backend writes (owner-read only
+# in firestore.rules), not on the users doc every client can read.
+# swipe_index/{uid} holds the current page number and how many uids were
+# appended to it; swipe_index/{uid}/pages/{n} holds up to SWIPE_PAGE_SIZE uids.
+SWIPE_INDEX_COLLECTION = "swipe_index"
+SWIPE_PAGE_SIZE = 10000  # keeps each page well under Firestore's 1 MiB document limit
+
+
+def _swipe_index_ref(user_uid: str):
+    """Head document of a user's swipe index."""
+    return db.collection(SWIPE_INDEX_COLLECTION).document(user_uid)
+
+
+def _swipe_page_ref(index_ref, page: int):
+    """One page of a user's swipe index."""
+    return index_ref.collection("pages").document(str(page))
+
+
+def _read_swipe_index(index_ref, transaction=None) -> Dict:
+    """Head document data of a swipe index ({} if the user has none yet)."""
+    snapshot = index_ref.get(transaction=transaction)
+    return (snapshot.to_dict() or {}) if snapshot.exists else {}
+
+
+@firestore.transactional
+def _swipe_index_transaction(transaction, index_ref, target_uids: List[str],
+                             swipe_writes: List[Tuple] = (), mark_complete: bool = False):
+    """
+    Write swipes (if any) and append target_uids to the swipe index
+    atomically. Uids fill the current page; a full page starts the next one.
+    """
+    # Firestore transactions must read before they write
+    index_data = _read_swipe_index(index_ref, transaction)
+    for swipe_ref, swipe_data in swipe_writes:
+        transaction.set(swipe_ref, swipe_data)
+    _append_swiped(transaction, index_ref, index_data, target_uids, mark_complete)
+
+
+def _append_swiped(transaction, index_ref, index_data: Dict, target_uids: List[str], mark_complete: bool = False):
+    """Queue the page and head writes appending target_uids to a swipe index."""
+    page = index_data.get("page", 0)
+    # Counts appends, so a repeated uid fills a page early, never late
+    count = index_data.get("count", 0)
+    remaining = list(target_uids)
+    while remaining:
+        if count >= SWIPE_PAGE_SIZE:
+            page, count = page + 1, 0
+        chunk = remaining[:SWIPE_PAGE_SIZE - count]
+        remaining = remaining[len(chunk):]
+        transaction.set(_swipe_page_ref(index_ref, page), {"uids": firestore.ArrayUnion(chunk)}, merge=True)
+        count += len(chunk)
+    
+    head = {"page": page, "count": count}
+    if mark_complete:
+        head["complete"] = True
+    transaction.set(index_ref, head, merge=True)
+
+
+@firestore.transactional
+def _like_transaction(transaction, swipe_ref, reverse_swipe_ref, match_ref, index_ref,
+                      swipe_data: Dict, match_data: Dict) -> bool:
+    """
+    Record a like (plus its swipe index entry) and, if the target already
+    liked back, the match record, atomically in one transaction.
+    Returns whether it's a match.
+    """
+    # Firestore transactions must read before they write
+    reverse_swipe = reverse_swipe_ref.get(transaction=transaction)
+    index_data = _read_swipe_index(index_ref, transaction)
+    is_match = reverse_swipe.exists and reverse_swipe.to_dict().get("action") == "like"
+    
+    transaction.set(swipe_ref, swipe_data)
+    _append_swiped(transaction, index_ref, index_data, [swipe_data["target_uid"]])
+    if is_match:
+        transaction.set(match_ref, match_data)
+    return is_match
+
+
 class SwipeService:
     """Service for managing swipes and matches."""
     
+    # Set once meta/match_participants_backfilled has been seen
+    _backfill_done = False
+    _backfill_checked_at = 0.0
+    
     def record_swipe(self, user_uid: str, target_uid: str, action: str) -> Dict:
         """
         Record a swipe action (like or pass).
@@ -52,31 +166,37 @@ class SwipeService:
             raise ValidationError("Action must be 'like' or 'pass'")
         
         try:
-            # Record the swipe
             swipe_ref = db.collection("swipes").document(f"{user_uid}_{target_uid}")
-            swipe_ref.set({
+            swipe_data = {
                 "user_uid": user_uid,
                 "target_uid": target_uid,
                 "action": action,
                 "created_at": firestore.SERVER_TIMESTAMP,
-            })
+            }
+            
+            # The swipe index lets get_swiped_users skip scanning swipes
+            index_ref = _swipe_index_ref(user_uid)
             
-            # Check for mutual match
             is_match = False
             if action == "like":
-                # Check if target has also liked this user
+                # Read the reverse swipe, write this swipe and the match (if
+                # mutual) in one transaction so concurrent likes can't race
                 reverse_swipe_ref = db.collection("swipes").document(f"{target_uid}_{user_uid}")
-                reverse_swipe = reverse_swipe_ref.get()
-                
-                if reverse_swipe.exists:
-                    reverse_data = reverse_swipe.to_dict()
-                    if reverse_data.get("action") == "like":
-                        is_match = True
-                        # Create mutual match record
-                        self._create_match(user_uid, target_uid)
+                match_ref, match_data = self._match_record(user_uid, target_uid)
+                is_match = _like_transaction(
+                    db.transaction(), swipe_ref, reverse_swipe_ref, match_ref, index_ref, swipe_data, match_data
+                )
+                if is_match:
+                    logger.info(f"Match created between {user_uid} and {target_uid}")
+                    log_user_action(logger, user_uid, "match_created", {"other_uid": target_uid})
+            else:
+                # A pass can't create a match, so only the swipe index is read
+                _swipe_index_transaction(db.transaction(), index_ref, [target_uid], [(swipe_ref, swipe_data)])
+            
+            self._cache_swipe(user_uid, target_uid)
             
             log_user_action(logger, user_uid, "swipe", {"target_uid": target_uid, "action": action, "is_match": is_match})
-            logger.debug(f"User {user_uid} swiped {action} on {target_uid}, match: {is_match}")
+            logger.debug("User %s swiped %s on %s, match: %s", user_uid, action, target_uid, is_match)
             
             return {
                 "success": True,
@@ -84,31 +204,115 @@ class SwipeService:
                 "message": "It's a match!" if is_match else "Swipe recorded"
             }
             
-        except ValidationError:
-            raise
         except Exception as e:
             logger.error(f"Error recording swipe: {e}", exc_info=True)
             raise DatabaseError(f"Failed to record swipe: {e}")
     
-    def _create_match(self, uid1: str, uid2: str):
-        """Create a mutual match record."""
-        try:
-            # Create match document with sorted UIDs for consistency
-            match_id = "_".join(sorted([uid1, uid2]))
-            match_ref = db.collection("matches").document(match_id)
-            
-            match_ref.set({
-                "user1_uid": uid1,
-                "user2_uid": uid2,
-                "matched_at": firestore.SERVER_TIMESTAMP,
-                "is_active": True,
-            })
+    def record_swipes_bulk(self, user_uid: str, swipes: List[Tuple[str, str]]) -> Dict:
+        """
+        Record many swipes by one user at once (buffered UI swipes, backfills).
+        
+        Passes are pipelined through a Firestore BulkWriter instead of one
+        commit each. Likes still go through record_swipe, since the match
+        check needs the reverse swipe read in a transaction.
+        
+        Args:
+            user_uid: UID of the user performing the swipes
+            swipes: (target_uid, action) pairs, action being "like" or "pass"
             
-            logger.info(f"Match created between {uid1} and {uid2}")
-            log_user_action(logger, uid1, "match_created", {"other_uid": uid2})
-        except Exception as e:
-            logger.error(f"Error creating match: {e}", exc_info=True)
-            raise DatabaseError(f"Failed to create match: {e}")
+        Returns:
+            Dictionary with success status, number recorded and matched UIDs
+        """
+        for target_uid, action in swipes:
+            if user_uid == target_uid:
+                raise ValidationError("Cannot swipe on yourself")
+            if action not in ["like", "pass"]:
+                raise ValidationError("Action must be 'like' or 'pass'")
+        
+        passed = [target_uid for target_uid, action in swipes if action == "pass"]
+        liked = [target_uid for target_uid, action in swipes if action == "like"]
+        
+        if passed:
+            failures = []
+            
+            def on_error(failure, _writer) -> bool:
+                # Keep BulkWriter's own retry policy, just note what gave up
+                if failure.attempts >= 15:
+                    failures.append(failure)
+                    return False
+                return True
+            
+            try:
+                # One swipe index update covers every pass. It goes first:
+                # get_swiped_users trusts the index, so a swipe written
+                # without its index entry would bring the profile back,
+                # while an entry whose swipe write fails only hides it
+                _swipe_index_transaction(db.transaction(), _swipe_index_ref(user_uid), passed)
+                # Mirror the index, so Redis matches it even if a swipe write fails
+                self._cache_swipe(user_uid, *passed)
+                
+                bulk_writer = db.bulk_writer()
+                bulk_writer.on_write_error(on_error)
+                for target_uid in passed:
+                    bulk_writer.set(db.collection("swipes").document(f"{user_uid}_{target_uid}"), {
+                        "user_uid": user_uid,
+                        "target_uid": target_uid,
+                        "action": "pass",
+                        "created_at": firestore.SERVER_TIMESTAMP,
+                    })
+                # Sends the remaining batches and waits for them
+                bulk_writer.close()
+            except Exception as e:
+                logger.error(f"Error recording bulk swipes: {e}", exc_info=True)
+                raise DatabaseError(f"Failed to record swipes: {e}")
+            
+            if failures:
+                raise DatabaseError(f"Failed to record {len(failures)} of {len(passed)} swipes")
+            
+            log_user_action(logger, user_uid, "swipe_bulk", {"action": "pass", "count": len(passed)})
+        
+        matches = [
+            target_uid for target_uid in liked
+            if self.record_swipe(user_uid, target_uid, "like")["is_match"]
+        ]
+        
+        return {
+            "success": True,
+            "recorded": len(swipes),
+            "matches": matches,
+        }
+    
+    def _match_record(self, uid1: str, uid2: str):
+        """Build the mutual match document reference and data."""
+        # Match document id uses sorted UIDs for consistency
+        first_uid, second_uid = (uid1, uid2) if uid1 < uid2 else (uid2, uid1)
+        match_ref = db.collection("matches").document(f"{first_uid}_{second_uid}")
+        match_data = {
+            "user1_uid": uid1,
+            "user2_uid": uid2,
+            # Lets get_matches find a user's matches with one array-contains query
+            "participants": [first_uid, second_uid],
+            "matched_at": firestore.SERVER_TIMESTAMP,
+            "is_active": True,
+        }
+        return match_ref, match_data
+    
+    def _cache_swipe(self, user_uid: str, *target_uids: str):
+        """Mirror recorded swipes into Redis (best effort, Firestore stays authoritative)."""
+        try:
+            pipe = get_redis().pipeline()
+            pipe.sadd(_swipes_key(user_uid), *target_uids)
+            pipe.expire(_swipes_key(user_uid), SWIPE_CACHE_TTL)
+            pipe.expire(_seeded_key(user_uid), SWIPE_CACHE_TTL)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Could not cache swipe in Redis: {e}")
+            # The mirror may now be missing this swipe: stop trusting it so
+            # reads fall back to Firestore until it is seeded again
+            try:
+                get_redis().delete(_seeded_key(user_uid))
+            except redis.RedisError:
+                pass
     
     def get_swiped_users(self, user_uid: str) -> Set[str]:
         """
@@ -121,19 +325,73 @@ class SwipeService:
             Set of target UIDs that have been swiped on
         """
         try:
-            swipes_ref = db.collection("swipes")
-            query = swipes_ref.where("user_uid", "==", user_uid).stream()
-            
+            redis_client = get_redis()
+            if redis_client.exists(_seeded_key(user_uid)):
+                return redis_client.smembers(_swipes_key(user_uid))
+        except redis.RedisError as e:
+            logger.warning(f"Redis unavailable for swiped users, using Firestore: {e}")
+            redis_client = None
+        
+        try:
+            # The head document plus its pages (usually one) from the swipe index
+            index_ref = _swipe_index_ref(user_uid)
+            index_data = _read_swipe_index(index_ref)
             swiped_uids = set()
+            if index_data:
+                page_refs = [_swipe_page_ref(index_ref, page) for page in range(index_data.get("page", 0) + 1)]
+                for page in db.get_all(page_refs):
+                    if page.exists:
+                        swiped_uids.update(page.to_dict().get("uids", []))
+            if index_data.get("complete"):
+                self._seed_swipes(redis_client, user_uid, swiped_uids)
+                return swiped_uids
+            
+            # The index may be missing swipes made before it existed: scan the
+            # swipes once, then mark it complete so later calls take the fast path
+            query = db.collection("swipes").where("user_uid", "==", user_uid).stream()
+            scanned_uids = set()
             for swipe in query:
                 data = swipe.to_dict()
-                swiped_uids.add(data.get("target_uid"))
+                scanned_uids.add(data.get("target_uid"))
+            
+            _swipe_index_transaction(
+                db.transaction(), index_ref, sorted(scanned_uids - swiped_uids), mark_complete=True
+            )
+            swiped_uids |= scanned_uids
+            self._drop_legacy_swiped_set(user_uid)
             
+            self._seed_swipes(redis_client, user_uid, swiped_uids)
             return swiped_uids
         except Exception as e:
             logger.error(f"Error getting swiped users: {e}", exc_info=True)
             return set()
     
+    def _drop_legacy_swiped_set(self, user_uid: str):
+        """Remove the swiped_set that earlier builds kept on the (publicly readable) users doc."""
+        try:
+            db.collection("users").document(user_uid).update({
+                "swiped_set": firestore.DELETE_FIELD,
+                "swiped_set_complete": firestore.DELETE_FIELD,
+            })
+        except Exception as e:
+            # No profile document means nothing to clean up
+            logger.debug("Could not drop legacy swiped_set for %s: %s", user_uid, e)
+    
+    def _seed_swipes(self, redis_client, user_uid: str, swiped_uids: Set[str]):
+        """Load a user's complete swipe set into Redis and flag it as seeded."""
+        if redis_client is None:
+            return
+        try:
+            # Swipes recorded meanwhile were already SADDed, so a union is safe
+            pipe = redis_client.pipeline()
+            if swiped_uids:
+                pipe.sadd(_swipes_key(user_uid), *swiped_uids)
+                pipe.expire(_swipes_key(user_uid), SWIPE_CACHE_TTL)
+            pipe.set(_seeded_key(user_uid), 1, ex=SWIPE_CACHE_TTL)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Could not seed swipes in Redis: {e}")
+    
     def get_matches(self, user_uid: str) -> List[Dict]:
         """
         Get all mutual matches for a user.
@@ -146,36 +404,114 @@ class SwipeService:
         """
         try:
             matches_ref = db.collection("matches")
-            # Query matches where user is either user1 or user2
-            query1 = matches_ref.where("user1_uid", "==", user_uid).where("is_active", "==", True).stream()
-            query2 = matches_ref.where("user2_uid", "==", user_uid).where("is_active", "==", True).stream()
+            if self._participants_backfilled():
+                # Single query on the participants array (composite index
+                # participants array-contains + is_active in firestore.indexes.json)
+                queries = [
+                    matches_ref.where("participants", "array_contains", user_uid).where("is_active", "==", True)
+                ]
+            else:
+                # Older match documents have no participants field until
+                # backfill_match_participants has run, so query both sides
+                queries = [
+                    matches_ref.where("user1_uid", "==", user_uid).where("is_active", "==", True),
+                    matches_ref.where("user2_uid", "==", user_uid).where("is_active", "==", True),
+                ]
             
-            matches = []
-            for match in query1:
-                data = match.to_dict()
-                other_uid = data.get("user2_uid")
-                matches.append({
-                    "match_id": match.id,
-                    "other_uid": other_uid,
-                    "matched_at": data.get("matched_at"),
-                })
+            if len(queries) == 1:
+                results = [queries[0].stream()]
+            else:
+                # Independent queries, so run them concurrently rather than back to back
+                results = list(_QUERY_EXECUTOR.map(lambda query: list(query.stream()), queries))
             
-            for match in query2:
-                data = match.to_dict()
-                other_uid = data.get("user1_uid")
-                matches.append({
-                    "match_id": match.id,
-                    "other_uid": other_uid,
-                    "matched_at": data.get("matched_at"),
-                })
+            matches = []
+            for result in results:
+                for match in result:
+                    data = match.to_dict()
+                    other_uid = data.get("user2_uid") if data.get("user1_uid") == user_uid else data.get("user1_uid")
+                    matches.append({
+                        "match_id": match.id,
+                        "other_uid": other_uid,
+                        "matched_at": data.get("matched_at"),
+                    })
             
             return matches
         except Exception as e:
             logger.error(f"Error getting matches: {e}", exc_info=True)
             return []
     
+    def _participants_backfilled(self) -> bool:
+        """Whether every match document has participants (flag set by backfill_match_participants)."""
+        # The flag never goes back to false, so stop reading it once it is set;
+        # until then one read per MATCH_BACKFILL_RECHECK_SECONDS is enough
+        if self._backfill_done:
+            return True
+        now = time.monotonic()
+        if now - self._backfill_checked_at < MATCH_BACKFILL_RECHECK_SECONDS:
+            return False
+        self._backfill_checked_at = now
+        try:
+            marker = db.collection(MATCH_BACKFILL_DOC[0]).document(MATCH_BACKFILL_DOC[1]).get()
+        except Exception as e:
+            logger.warning(f"Could not read match backfill flag, using legacy match queries: {e}")
+            return False
+        self._backfill_done = marker.exists and bool(marker.to_dict().get("done"))
+        return self._backfill_done
+    
+    def backfill_match_participants(self) -> int:
+        """
+        One-off migration: add the participants field to match documents
+        created before get_matches switched to an array-contains query.
+        
+        Sets the meta/match_participants_backfilled flag when done, which
+        switches get_matches from the two legacy queries to the single one.
+        
+        Returns:
+            Number of match documents updated
+        """
+        try:
+            batch = db.batch()
+            pending = 0
+            updated = 0
+            for match in db.collection("matches").stream():
+                data = match.to_dict()
+                if "participants" in data:
+                    continue
+                batch.update(match.reference, {
+                    "participants": sorted([data.get("user1_uid"), data.get("user2_uid")])
+                })
+                pending += 1
+                updated += 1
+                # Firestore caps a batch at 500 writes
+                if pending == 500:
+                    batch.commit()
+                    batch = db.batch()
+                    pending = 0
+            if pending:
+                batch.commit()
+            db.collection(MATCH_BACKFILL_DOC[0]).document(MATCH_BACKFILL_DOC[1]).set({
+                "done": True,
+                "completed_at": firestore.SERVER_TIMESTAMP,
+            })
+            self._backfill_done = True
+            logger.info(f"Backfilled participants on {updated} match documents")
+            return updated
+        except Exception as e:
+            logger.error(f"Error backfilling match participants: {e}", exc_info=True)
+            raise DatabaseError(f"Failed to backfill match participants: {e}")
+    
     def has_swiped(self, user_uid: str, target_uid: str) -> bool:
         """Check if user has already swiped on target."""
+        try:
+            redis_client = get_redis()
+            if redis_client.sismember(_swipes_key(user_uid), target_uid):
+                return True
+            # A miss is only conclusive once the user's swipes are seeded
+            if redis_client.exists(_seeded_key(user_uid)):
+                return False
+        except redis.RedisError as e:
+            logger.warning(f"Redis unavailable for swipe check, using Firestore: {e}")
+        
         try:
             swipe_ref = db.collection("swipes").document(f"{user_uid}_{target_uid}")
             return swipe_ref.get().exists
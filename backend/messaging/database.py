@@ -2,12 +2,14 @@ import os
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from ..config import get_database_url
+from ..config import get_database_url, get_database_pool_settings
 
 # Get database URL from config loader (reads from secrets/.env or environment variables)
 DATABASE_URL = get_database_url()
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+# Pool sizing is configurable (DB_POOL_SIZE, DB_MAX_OVERFLOW, ...) so it can
+# be matched to the Postgres max_connections of the deployment
+engine = create_engine(DATABASE_URL, pool_pre_ping=True, **get_database_pool_settings())
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
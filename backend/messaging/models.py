@@ -16,12 +16,21 @@ class Message(Base):
         Index('idx_conversation', 'sender_uid', 'receiver_uid', 'created_at'),
     )
     
+    def created_at_iso(self):
+        """created_at as an ISO string, formatted once per value"""
+        # Keyed on the value itself so a refreshed created_at is re-formatted
+        cached = self.__dict__.get("_created_at_iso")
+        if cached is None or cached[0] is not self.created_at:
+            cached = (self.created_at, self.created_at.isoformat() if self.created_at else None)
+            self.__dict__["_created_at_iso"] = cached
+        return cached[1]
+    
     def to_dict(self):
         return {
             "id": self.id,
             "sender_uid": self.sender_uid,
             "receiver_uid": self.receiver_uid,
             "content": self.content,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "created_at": self.created_at_iso(),
         }
 
@@ -1,26 +1,119 @@
 import os
 import json
 import redis
+from datetime import datetime
 from typing import List, Optional, Dict
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_, desc
+from sqlalchemy import or_, and_, desc, case, func, tuple_
 from .models import Message
 from ..config import get_redis_url
+from ..utils.logging_utils import get_logger
+
+logger = get_logger(__name__)
 
 # Redis connection - uses config loader (checks env vars, config.json, then defaults)
 REDIS_URL = get_redis_url()
-redis_client = redis.from_url(REDIS_URL, decode_responses=True)
+# One shared connection pool, sized for concurrent requests (REDIS_MAX_CONNECTIONS)
+redis_client = redis.from_url(
+    REDIS_URL,
+    decode_responses=True,
+    max_connections=int(os.getenv("REDIS_MAX_CONNECTIONS", "64")),
+    socket_keepalive=True
+)
 
 def get_redis():
     """Get Redis client"""
     return redis_client
 
+# Conversation list cache: convs:{uid} is a sorted set of partner uids scored
+# by last message time, last_msg:{uid_a}:{uid_b} (sorted uids) the last
+# message, and convs_seeded:{uid} marks convs:{uid} as complete
+CONVERSATION_CACHE_TTL = 3600
+
+# Writes last_msg only if it is at least as new as the stored message, by
+# (created_at, id), so a rehydrate from an older database read can never
+# move a conversation backwards past a message that landed in the meantime.
+# KEYS[1]: last_msg key; ARGV: message JSON, created_at timestamp, id, TTL
+_SET_LAST_MESSAGE_IF_NEWER = redis_client.register_script("""
+local current = redis.call('GET', KEYS[1])
+if current then
+    local stored = cjson.decode(current)
+    local stored_ts = tonumber(stored['created_at_ts'])
+    local ts = tonumber(ARGV[2])
+    if stored_ts and (stored_ts > ts or (stored_ts == ts and tonumber(stored['id']) > tonumber(ARGV[3]))) then
+        return 0
+    end
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[4])
+return 1
+""")
+
+def _last_message_key(uid1: str, uid2: str) -> str:
+    """Redis key of the last message between two users"""
+    return f"last_msg:{uid1}:{uid2}" if uid1 < uid2 else f"last_msg:{uid2}:{uid1}"
+
+def _set_last_message(pipe, message: Message, message_data: Optional[dict] = None):
+    """Queue a compare-on-created_at write of the last message between its two users"""
+    created_at_ts = message.created_at.timestamp()
+    blob = {**(message_data or message.to_dict()), "created_at_ts": created_at_ts}
+    _SET_LAST_MESSAGE_IF_NEWER(
+        keys=[_last_message_key(message.sender_uid, message.receiver_uid)],
+        args=[json.dumps(blob), created_at_ts, message.id, CONVERSATION_CACHE_TTL],
+        client=pipe
+    )
+
+def _message_from_cache(data: dict) -> Message:
+    """Rebuild a (detached) Message from its cached to_dict() form"""
+    created_at = data.get("created_at")
+    return Message(
+        id=data["id"],
+        sender_uid=data["sender_uid"],
+        receiver_uid=data["receiver_uid"],
+        content=data["content"],
+        created_at=datetime.fromisoformat(created_at) if created_at else None,
+    )
+
+def _cache_conversations(user_uid: str, conversations: List[Dict]):
+    """
+    Store a user's complete conversation list in Redis
+    
+    Merges into whatever is cached instead of replacing it: scores only move
+    forward (ZADD GT) and last_msg is compared on created_at, because a
+    create_message may have updated these keys since the list was read.
+    """
+    pipe = redis_client.pipeline()
+    for conv in conversations:
+        last_message = conv["last_message"]
+        pipe.zadd(f"convs:{user_uid}", {conv["other_user_uid"]: last_message.created_at.timestamp()}, gt=True)
+        _set_last_message(pipe, last_message)
+    pipe.expire(f"convs:{user_uid}", CONVERSATION_CACHE_TTL)
+    pipe.set(f"convs_seeded:{user_uid}", 1, ex=CONVERSATION_CACHE_TTL)
+    pipe.execute()
+
+def _get_cached_conversations(user_uid: str) -> Optional[List[Dict]]:
+    """Conversation list from Redis, or None if it isn't (completely) cached"""
+    if not redis_client.exists(f"convs_seeded:{user_uid}"):
+        return None
+    partner_uids = redis_client.zrevrange(f"convs:{user_uid}", 0, -1)
+    if not partner_uids:
+        return []
+    blobs = redis_client.mget([_last_message_key(user_uid, partner_uid) for partner_uid in partner_uids])
+    if any(blob is None for blob in blobs):
+        return None
+    return [
+        {"other_user_uid": partner_uid, "last_message": _message_from_cache(json.loads(blob))}
+        for partner_uid, blob in zip(partner_uids, blobs)
+    ]
+
 def publish_message(channel: str, message_data: dict):
     """Publish message to Redis channel"""
     redis_client.publish(channel, json.dumps(message_data))
 
 def create_message(db: Session, sender_uid: str, receiver_uid: str, content: str) -> Message:
-    """Create a new message in the database"""
+    """
+    Create a new message in the database, then publish it to both users'
+    channels for real-time delivery
+    """
     message = Message(
         sender_uid=sender_uid,
         receiver_uid=receiver_uid,
@@ -29,6 +122,31 @@ def create_message(db: Session, sender_uid: str, receiver_uid: str, content: str
     db.add(message)
     db.commit()
     db.refresh(message)
+    
+    # Publish to the receiver (delivery) and the sender (confirmation) and
+    # keep both users' cached conversation lists current, all in one round
+    # trip. Best effort: the message is already stored, and a conversation
+    # list that isn't seeded is simply rebuilt from the database.
+    try:
+        message_data = message.to_dict()
+        event = json.dumps({"type": "new_message", "message": message_data})
+        created_at_ts = message.created_at.timestamp()
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.publish(f"user:{receiver_uid}", event)
+        pipe.publish(f"user:{sender_uid}", event)
+        pipe.zadd(f"convs:{sender_uid}", {receiver_uid: created_at_ts}, gt=True)
+        pipe.zadd(f"convs:{receiver_uid}", {sender_uid: created_at_ts}, gt=True)
+        _set_last_message(pipe, message, message_data)
+        pipe.execute()
+    except redis.RedisError as e:
+        logger.warning(f"Could not publish message {message.id} to Redis: {e}")
+        # The cached lists may now miss this message: unseed them so the
+        # next read rebuilds both from the database
+        try:
+            redis_client.delete(f"convs_seeded:{sender_uid}", f"convs_seeded:{receiver_uid}")
+        except redis.RedisError:
+            pass
+    
     return message
 
 def get_conversation_messages(
@@ -36,50 +154,75 @@ def get_conversation_messages(
     user1_uid: str, 
     user2_uid: str, 
     limit: int = 50,
-    offset: int = 0
+    offset: int = 0,
+    before_id: Optional[int] = None
 ) -> List[Message]:
-    """Get messages between two users"""
-    messages = db.query(Message).filter(
+    """
+    Get messages between two users, oldest first.
+    
+    Pass the id of the oldest message already loaded as before_id to page
+    backwards without the database having to skip `offset` rows.
+    """
+    page = db.query(Message.id).filter(
         or_(
             and_(Message.sender_uid == user1_uid, Message.receiver_uid == user2_uid),
             and_(Message.sender_uid == user2_uid, Message.receiver_uid == user1_uid)
         )
-    ).order_by(desc(Message.created_at)).limit(limit).offset(offset).all()
+    )
+    if before_id is not None:
+        # Keyset on (created_at, id), matching the sort order below; a row
+        # value comparison lets Postgres seek the index instead of OR-ing
+        before_created_at = db.query(Message.created_at).filter(Message.id == before_id).scalar_subquery()
+        page = page.filter(tuple_(Message.created_at, Message.id) < tuple_(before_created_at, before_id))
     
-    # Reverse to get chronological order (oldest first)
-    return list(reversed(messages))
+    # Newest `limit` messages in the subquery, returned in chronological order
+    page = page.order_by(desc(Message.created_at), desc(Message.id)).limit(limit).offset(offset).subquery()
+    return db.query(Message).join(page, Message.id == page.c.id).order_by(
+        Message.created_at, Message.id
+    ).all()
 
 def get_user_conversations(db: Session, user_uid: str) -> List[Dict]:
     """Get all conversations for a user (list of other users they've messaged with)"""
-    # Get distinct conversation partners
-    sent_messages = db.query(Message.receiver_uid).filter(Message.sender_uid == user_uid).distinct().all()
-    received_messages = db.query(Message.sender_uid).filter(Message.receiver_uid == user_uid).distinct().all()
+    try:
+        cached = _get_cached_conversations(user_uid)
+        if cached is not None:
+            return cached
+    except redis.RedisError as e:
+        logger.warning(f"Could not read cached conversations: {e}")
+    
+    # Conversation partner of each message, from this user's point of view
+    partner_uid = case(
+        (Message.sender_uid == user_uid, Message.receiver_uid),
+        else_=Message.sender_uid
+    )
+    
+    # Rank each partner's messages newest first so the last message per
+    # conversation comes back from one query instead of one per partner
+    ranked = db.query(
+        Message.id.label("id"),
+        partner_uid.label("partner_uid"),
+        func.row_number().over(
+            partition_by=partner_uid,
+            order_by=(desc(Message.created_at), desc(Message.id))
+        ).label("rank")
+    ).filter(
+        or_(Message.sender_uid == user_uid, Message.receiver_uid == user_uid)
+    ).subquery()
     
-    # Combine and get unique UIDs
-    partner_uids = set()
-    for row in sent_messages:
-        partner_uids.add(row[0])
-    for row in received_messages:
-        partner_uids.add(row[0])
+    # Sorted by last message time (most recent first)
+    rows = db.query(Message, ranked.c.partner_uid).join(
+        ranked, Message.id == ranked.c.id
+    ).filter(ranked.c.rank == 1).order_by(desc(Message.created_at)).all()
     
-    # Get last message for each conversation
-    conversations = []
-    for partner_uid in partner_uids:
-        last_message = db.query(Message).filter(
-            or_(
-                and_(Message.sender_uid == user_uid, Message.receiver_uid == partner_uid),
-                and_(Message.sender_uid == partner_uid, Message.receiver_uid == user_uid)
-            )
-        ).order_by(desc(Message.created_at)).first()
-        
-        if last_message:
-            conversations.append({
-                "other_user_uid": partner_uid,
-                "last_message": last_message
-            })
+    conversations = [
+        {"other_user_uid": other_uid, "last_message": last_message}
+        for last_message, other_uid in rows
+    ]
     
-    # Sort by last message time (most recent first)
-    conversations.sort(key=lambda x: x["last_message"].created_at, reverse=True)
+    try:
+        _cache_conversations(user_uid, conversations)
+    except redis.RedisError as e:
+        logger.warning(f"Could not cache conversations: {e}")
     
     return conversations
 
@@ -10,7 +10,38 @@ import os
 import argparse
 from pathlib import Path
 
-def run_tests(test_type=None, verbose=False, coverage=False):
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def _run_pytest(args, in_subprocess=False):
+    """
+    Run pytest with the given arguments from the backend directory
+    
+    Args:
+        args: pytest arguments (test files are relative to the backend directory)
+        in_subprocess: Run in a fresh interpreter instead of in-process
+    
+    Returns:
+        True if pytest exited successfully
+    """
+    args = [*args, "--rootdir", BACKEND_DIR]
+    if in_subprocess:
+        cmd = [sys.executable, "-m", "pytest", *args]
+        print(f"Running command: {' '.join(cmd)}")
+        print("-" * 60)
+        return subprocess.run(cmd, cwd=BACKEND_DIR, capture_output=False, text=True).returncode == 0
+    
+    import pytest
+    print(f"Running: pytest {' '.join(args)}")
+    print("-" * 60)
+    # Test files are resolved relative to the backend directory, as in the subprocess path
+    previous_dir = os.getcwd()
+    os.chdir(BACKEND_DIR)
+    try:
+        return pytest.main(args) == 0
+    finally:
+        os.chdir(previous_dir)
+
+def run_tests(test_type=None, verbose=False, coverage=False, in_subprocess=False, workers=None):
     """
     Run tests using pytest
     
@@ -18,34 +49,29 @@ def run_tests(test_type=None, verbose=False, coverage=False):
         test_type: Specific test type to run ('auth', 'schedule', 'maps', 'all')
         verbose: Enable verbose output
         coverage: Enable coverage reporting
+        in_subprocess: Run pytest in a separate interpreter for isolation
+        workers: Number of pytest-xdist workers ('auto' for one per core)
     """
     print("🧪 Running TrailMix Backend Test Suite")
     print("=" * 60)
     
-    # Change to backend directory
-    backend_dir = os.path.dirname(os.path.abspath(__file__))
-    os.chdir(backend_dir)
-    
-    # Build pytest command
-    cmd = [sys.executable, "-m", "pytest"]
-    
     # Add test files based on type
     if test_type == "auth":
-        cmd.extend(["tests/test_auth.py", "test_auth.py"])
+        cmd = ["tests/test_auth.py", "test_auth.py"]
     elif test_type == "schedule":
-        cmd.extend(["tests/test_schedule.py"])
+        cmd = ["tests/test_schedule.py"]
     elif test_type == "maps":
-        cmd.extend(["tests/test_maps.py"])
+        cmd = ["tests/test_maps.py"]
     elif test_type == "env":
-        cmd.extend(["test_env.py"])
+        cmd = ["test_env.py"]
     else:  # all or None
-        cmd.extend([
+        cmd = [
             "tests/test_auth.py",
             "tests/test_schedule.py", 
             "tests/test_maps.py",
             "test_auth.py",
             "test_env.py"
-        ])
+        ]
     
     # Add options
     if verbose:
@@ -58,27 +84,22 @@ def run_tests(test_type=None, verbose=False, coverage=False):
     if coverage:
         cmd.extend(["--cov=.", "--cov-report=html", "--cov-report=term"])
     
+    if workers:
+        # Test classes are independent, so spread them across workers
+        cmd.extend(["-n", str(workers), "--dist=loadscope"])
+    
     try:
-        print(f"Running command: {' '.join(cmd)}")
-        print("-" * 60)
-        
-        result = subprocess.run(cmd, capture_output=False, text=True)
-        
-        return result.returncode == 0
-        
+        return _run_pytest(cmd, in_subprocess)
     except Exception as e:
         print(f"❌ Error running tests: {e}")
         return False
 
-def run_specific_test(test_file, verbose=False):
+def run_specific_test(test_file, verbose=False, in_subprocess=False):
     """Run a specific test file"""
     print(f"🧪 Running specific test: {test_file}")
     print("=" * 50)
     
-    backend_dir = os.path.dirname(os.path.abspath(__file__))
-    os.chdir(backend_dir)
-    
-    cmd = [sys.executable, "-m", "pytest", test_file]
+    cmd = [test_file]
     
     if verbose:
         cmd.append("-v")
@@ -88,8 +109,7 @@ def run_specific_test(test_file, verbose=False):
     cmd.extend(["--tb=short"])
     
     try:
-        result = subprocess.run(cmd, capture_output=False, text=True)
-        return result.returncode == 0
+        return _run_pytest(cmd, in_subprocess)
     except Exception as e:
         print(f"❌ Error running test {test_file}: {e}")
         return False
@@ -99,18 +119,17 @@ def list_available_tests():
     print("📋 Available Test Files:")
     print("=" * 30)
     
-    backend_dir = os.path.dirname(os.path.abspath(__file__))
     test_files = []
     
     # Find test files in tests directory
-    tests_dir = os.path.join(backend_dir, "tests")
+    tests_dir = os.path.join(BACKEND_DIR, "tests")
     if os.path.exists(tests_dir):
         for file in os.listdir(tests_dir):
             if file.startswith("test_") and file.endswith(".py"):
                 test_files.append(f"tests/{file}")
     
     # Find test files in root directory
-    for file in os.listdir(backend_dir):
+    for file in os.listdir(BACKEND_DIR):
         if file.startswith("test_") and file.endswith(".py"):
             test_files.append(file)
     
@@ -143,6 +162,16 @@ def main():
         action="store_true", 
         help="Enable coverage reporting"
     )
+    parser.add_argument(
+        "--subprocess",
+        action="store_true",
+        help="Run pytest in a separate interpreter instead of in-process"
+    )
+    parser.add_argument(
+        "--workers", "-n",
+        type=str,
+        help="Run tests in parallel with pytest-xdist (number of workers or 'auto')"
+    )
     parser.add_argument(
         "--list", "-l",
         action="store_true",
@@ -156,9 +185,9 @@ def main():
         return
     
     if args.file:
-        success = run_specific_test(args.file, args.verbose)
+        success = run_specific_test(args.file, args.verbose, args.subprocess)
     else:
-        success = run_tests(args.type, args.verbose, args.coverage)
+        success = run_tests(args.type, args.verbose, args.coverage, args.subprocess, args.workers)
     
     if success:
         print("\n✅ All tests passed!")
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr, constr, Field
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, StringConstraints
+from typing import Annotated, Optional, List
 from datetime import date
 from enum import Enum
 
@@ -9,10 +9,10 @@ class UserStatus(str, Enum):
     ADMIN = "admin"
 
 class SignupIn(BaseModel):
-    name: constr(strip_whitespace=True, min_length=1)
-    username: constr(strip_whitespace=True, min_length=1)
+    name: Annotated[str, StringConstraints(strip_whitespace=True, min_length=1)]
+    username: Annotated[str, StringConstraints(strip_whitespace=True, min_length=1)]
     email: EmailStr
-    password: constr(min_length=6)
+    password: Annotated[str, StringConstraints(min_length=6)]
 
 class SignupOut(BaseModel):
     success: bool
@@ -25,7 +25,7 @@ class SignupOut(BaseModel):
 
 class LoginIn(BaseModel):
     email: EmailStr
-    password: constr(min_length=1)
+    password: Annotated[str, StringConstraints(min_length=1)]
 
 class LoginOut(BaseModel):
     success: bool
@@ -47,8 +47,7 @@ class HomeAddress(BaseModel):
     longitude: Optional[float] = None
     formatted_address: Optional[str] = Field(None, alias="formattedAddress")
     
-    class Config:
-        populate_by_name = True
+    model_config = ConfigDict(populate_by_name=True)
 
 class ProfileUpdateIn(BaseModel):
     interests: Optional[List[str]] = None
@@ -61,14 +60,12 @@ class ProfileUpdateIn(BaseModel):
     hiking_level: Optional[str] = Field(None, alias="hikingLevel")
     home_address: Optional[HomeAddress] = Field(None, alias="homeAddress")
     
-    class Config:
-        populate_by_name = True
+    model_config = ConfigDict(populate_by_name=True)
 
 class PromoteToWayfarerIn(BaseModel):
     target_uid: str = Field(alias="targetUid")
     
-    class Config:
-        populate_by_name = True
+    model_config = ConfigDict(populate_by_name=True)
 
 class UserProfile(BaseModel):
     uid: str
@@ -93,5 +90,4 @@ class UserProfile(BaseModel):
     last_login_at: Optional[str] = Field(None, alias="lastLoginAt")
     is_active: Optional[bool] = Field(None, alias="isActive")
 
-    class Config:
-        populate_by_name = True
+    model_config = ConfigDict(populate_by_name=True)
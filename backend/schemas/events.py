@@ -1,10 +1,10 @@
-from pydantic import BaseModel, Field, constr
-from typing import List, Optional
+from pydantic import BaseModel, Field, StringConstraints
+from typing import Annotated, List, Optional
 from datetime import datetime
 
 class EventCreate(BaseModel):
-    title: constr(strip_whitespace=True, min_length=1)
-    location: constr(strip_whitespace=True, min_length=1)
+    title: Annotated[str, StringConstraints(strip_whitespace=True, min_length=1)]
+    location: Annotated[str, StringConstraints(strip_whitespace=True, min_length=1)]
     event_date: str  # accepts "YYYY-MM-DD" or ISO string; parsing happens in the service layer
     description: Optional[str] = ""
     max_attendees: int = Field(default=20, gt=0)
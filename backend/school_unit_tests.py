@@ -6,279 +6,247 @@ Each category has 1 valid test and 4 invalid input tests
 """
 
 import pytest
-import sys
-import os
-from datetime import datetime, timedelta
-from unittest.mock import Mock, patch, MagicMock
+import re
+from importlib import import_module
+from unittest.mock import patch
 
-# Add the parent directory to the path so we can import from backend modules
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# Expected error messages, compiled once for pytest.raises(match=...)
+_ERR_CREDS = re.compile("Please enter both email and password")
+_ERR_LOGIN = {
+    message: re.compile(f"Login failed: {message}")
+    for message in ("INVALID_PASSWORD", "INVALID_EMAIL")
+}
+_ERR_TITLE = re.compile("Title and location are required")
+_ERR_PAST = re.compile("Event date must be in the future")
+_ERR_DIFF = re.compile("Difficulty level must be: beginner, intermediate, or advanced")
+_ERR_ATTENDEES = re.compile("Max attendees must be greater than 0")
 
-# Import the modules we're testing
-from accounts.signups import signup_with_email_password, login_with_email_password
-from events.schedule import create_hiking_event
-from maps.download_map import validate_latitude, validate_longitude, validate_zoom, fetch_osm_data
+# Table-driven tests check these with a plain substring test instead of a regex
+_ERR_FILL = "Please fill in all fields"
+_ERR_PWD = "Password must be at least 6 characters long"
+_ERR_USERNAME = "Username 'johndoe' is already taken"
+_ERR_LAT = "Latitude must be between -90 and 90"
+_ERR_LNG = "Longitude must be between -180 and 180"
+_ERR_ZOOM = "Zoom must be between 1 and 18"
+_ERR_LAT_FORMAT = "Invalid latitude value"
 
+# The modules under test pull in Firebase Admin, Firestore and the map
+# libraries, so they are imported on first use rather than at collection
+@pytest.fixture(scope="module")
+def signups():
+    return import_module("accounts.signups")
 
-class TestSignUp:
-    """Tests for user signup functionality"""
-    
-    @patch('accounts.signups.auth')
-    @patch('accounts.signups.create_user_profile')
-    @patch('accounts.signups._is_username_taken')
-    def test_signup_valid_inputs(self, mock_username_taken, mock_create_profile, mock_auth):
-        """Test 1: Valid signup with all correct inputs"""
-        # Mock username not taken
-        mock_username_taken.return_value = False
-        
-        # Mock Firebase Auth user creation
-        mock_user_record = Mock()
-        mock_user_record.uid = "test_uid_123"
-        mock_user_record.email = "john@example.com"  # This should match the input email
-        mock_auth.create_user.return_value = mock_user_record
-        
-        result = signup_with_email_password(
-            name="John Doe",
-            username="johndoe",
-            email="john@example.com",
-            password="password123"
+
+@pytest.fixture(scope="module")
+def schedule():
+    return import_module("events.schedule")
+
+
+@pytest.fixture(scope="module")
+def download_map():
+    return import_module("maps.download_map")
+
+
+# ─────────────────────────
+# Sign-up
+# ─────────────────────────
+def test_signup_valid_inputs(monkeypatch, signups, user_record):
+    """Test 1: Valid signup with all correct inputs"""
+    # Username not taken, Firebase Auth creates the user
+    monkeypatch.setattr("accounts.signups._is_username_taken", lambda username: False)
+    monkeypatch.setattr("accounts.signups.create_user_profile", lambda *args, **kwargs: None)
+    monkeypatch.setattr("accounts.signups.auth.create_user", lambda **kwargs: user_record)
+    
+    result = signups.signup_with_email_password(
+        name="John Doe",
+        username="johndoe",
+        email="john@example.com",
+        password="password123"
+    )
+    
+    assert result["success"] is True
+    assert result["uid"] == "test_uid_123"
+    assert result["email"] == "john@example.com"  # Email is normalized to lowercase
+    assert result["name"] == "John Doe"
+    assert result["username"] == "johndoe"
+
+
+def test_signup_invalid_inputs(monkeypatch, signups):
+    """Tests 2-5: Signup with an empty field, a short password or a taken username should fail"""
+    valid = dict(name="John Doe", username="johndoe", email="john@example.com", password="password123")
+    cases = [
+        # (overrides, username taken, expected error)
+        (dict(name=""), False, _ERR_FILL),
+        (dict(password="123"), False, _ERR_PWD),
+        ({}, True, _ERR_USERNAME),
+        (dict(email=""), False, _ERR_FILL),
+    ]
+    
+    for overrides, taken, message in cases:
+        monkeypatch.setattr("accounts.signups._is_username_taken", lambda username, taken=taken: taken)
+        with pytest.raises(ValueError) as exc_info:
+            signups.signup_with_email_password(**{**valid, **overrides})
+        assert message in str(exc_info.value)
+
+
+# ─────────────────────────
+# Sign-in
+# ─────────────────────────
+@pytest.fixture(scope="module")
+def mock_post():
+    """Firebase Auth REST calls, patched once for the module"""
+    with patch("accounts.signups.requests.post") as mock_post:
+        yield mock_post
+
+
+def test_login_valid_credentials(monkeypatch, signups, mock_post, login_ok_response, user_doc_ref):
+    """Test 1: Valid login with correct email and password"""
+    # Successful Firebase Auth response for an existing user profile
+    mock_post.return_value = login_ok_response
+    monkeypatch.setattr("accounts.signups.create_user_profile", lambda *args, **kwargs: None)
+    monkeypatch.setattr("accounts.signups._user_doc_ref", lambda uid: user_doc_ref)
+    
+    result = signups.login_with_email_password("john@example.com", "password123")
+    
+    assert result["success"] is True
+    assert result["uid"] == "test_uid_123"
+    assert result["email"] == "john@example.com"
+    assert result["idToken"] == "test_id_token"
+
+
+@pytest.mark.parametrize("email,password", [
+    # Test 2: Login with empty email should fail
+    ("", "password123"),
+    # Test 3: Login with empty password should fail
+    ("john@example.com", ""),
+])
+def test_login_missing_field(signups, email, password):
+    """Tests 2-3: Login with an empty email or password should fail"""
+    with pytest.raises(ValueError, match=_ERR_CREDS):
+        signups.login_with_email_password(email, password)
+
+
+@pytest.mark.parametrize("email,password,error", [
+    # Test 4: Login with wrong password should fail
+    ("john@example.com", "wrongpassword", "INVALID_PASSWORD"),
+    # Test 5: Login with invalid email format should fail
+    ("not-an-email", "password123", "INVALID_EMAIL"),
+])
+def test_login_rejected(signups, mock_post, login_fail_response, email, password, error):
+    """Tests 4-5: Login rejected by Firebase Auth should fail with its error message"""
+    mock_post.return_value = login_fail_response(error)
+    
+    with pytest.raises(RuntimeError, match=_ERR_LOGIN[error]):
+        signups.login_with_email_password(email, password)
+
+
+# ─────────────────────────
+# Event creation
+# ─────────────────────────
+@pytest.fixture(scope="module")
+def mock_db(firestore_db_stub):
+    """Firestore client, patched once for the module"""
+    with patch("events.schedule.db", firestore_db_stub):
+        yield firestore_db_stub
+
+
+def test_create_event_valid_inputs(schedule, mock_db, future_date):
+    """Test 1: Valid event creation with all correct inputs"""
+    result = schedule.create_hiking_event(
+        title="Mountain Hike",
+        location="Blue Ridge Trail",
+        event_date=future_date,
+        description="A beautiful mountain hike",
+        max_attendees=15,
+        difficulty_level="intermediate",
+        organizer_uid="organizer_123"
+    )
+    
+    assert result["success"] is True
+    assert result["event_id"] == "test_event_123"
+    assert result["title"] == "Mountain Hike"
+    assert result["location"] == "Blue Ridge Trail"
+    assert result["max_attendees"] == 15
+    assert result["difficulty_level"] == "intermediate"
+
+
+def test_create_event_empty_title(schedule, mock_db, future_date):
+    """Test 2: Event creation with empty title should fail"""
+    with pytest.raises(ValueError, match=_ERR_TITLE):
+        schedule.create_hiking_event(
+            title="",
+            location="Blue Ridge Trail",
+            event_date=future_date
         )
-        
-        assert result["success"] is True
-        assert result["uid"] == "test_uid_123"
-        assert result["email"] == "john@example.com"  # Email is normalized to lowercase
-        assert result["name"] == "John Doe"
-        assert result["username"] == "johndoe"
-    
-    def test_signup_empty_name(self):
-        """Test 2: Signup with empty name should fail"""
-        with pytest.raises(ValueError, match="Please fill in all fields"):
-            signup_with_email_password(
-                name="",
-                username="johndoe",
-                email="john@example.com",
-                password="password123"
-            )
-    
-    def test_signup_short_password(self):
-        """Test 3: Signup with password too short should fail"""
-        with pytest.raises(ValueError, match="Password must be at least 6 characters long"):
-            signup_with_email_password(
-                name="John Doe",
-                username="johndoe",
-                email="john@example.com",
-                password="123"
-            )
-    
-    @patch('accounts.signups._is_username_taken')
-    def test_signup_username_taken(self, mock_username_taken):
-        """Test 4: Signup with taken username should fail"""
-        mock_username_taken.return_value = True
-        
-        with pytest.raises(ValueError, match="Username 'johndoe' is already taken"):
-            signup_with_email_password(
-                name="John Doe",
-                username="johndoe",
-                email="john@example.com",
-                password="password123"
-            )
-    
-    def test_signup_empty_email(self):
-        """Test 5: Signup with empty email should fail"""
-        with pytest.raises(ValueError, match="Please fill in all fields"):
-            signup_with_email_password(
-                name="John Doe",
-                username="johndoe",
-                email="",
-                password="password123"
-            )
-
-
-class TestSignIn:
-    """Tests for user sign-in functionality"""
-    
-    @patch('accounts.signups.requests.post')
-    @patch('accounts.signups.create_user_profile')
-    @patch('accounts.signups._user_doc_ref')
-    def test_login_valid_credentials(self, mock_user_doc_ref, mock_create_profile, mock_post):
-        """Test 1: Valid login with correct email and password"""
-        # Mock successful Firebase Auth response
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "localId": "test_uid_123",
-            "idToken": "test_id_token",
-            "refreshToken": "test_refresh_token",
-            "expiresIn": "3600"
-        }
-        mock_post.return_value = mock_response
-        
-        # Mock user profile exists
-        mock_doc_ref = Mock()
-        mock_doc = Mock()
-        mock_doc.exists = True
-        mock_doc.to_dict.return_value = {
-            "name": "John Doe",
-            "username": "johndoe"
-        }
-        mock_doc_ref.get.return_value = mock_doc
-        mock_user_doc_ref.return_value = mock_doc_ref
-        
-        result = login_with_email_password("john@example.com", "password123")
-        
-        assert result["success"] is True
-        assert result["uid"] == "test_uid_123"
-        assert result["email"] == "john@example.com"
-        assert result["idToken"] == "test_id_token"
-    
-    def test_login_empty_email(self):
-        """Test 2: Login with empty email should fail"""
-        with pytest.raises(ValueError, match="Please enter both email and password"):
-            login_with_email_password("", "password123")
-    
-    def test_login_empty_password(self):
-        """Test 3: Login with empty password should fail"""
-        with pytest.raises(ValueError, match="Please enter both email and password"):
-            login_with_email_password("john@example.com", "")
-    
-    @patch('accounts.signups.requests.post')
-    def test_login_wrong_password(self, mock_post):
-        """Test 4: Login with wrong password should fail"""
-        # Mock failed Firebase Auth response
-        mock_response = Mock()
-        mock_response.status_code = 400
-        mock_response.json.return_value = {
-            "error": {
-                "message": "INVALID_PASSWORD"
-            }
-        }
-        mock_post.return_value = mock_response
-        
-        with pytest.raises(RuntimeError, match="Login failed: INVALID_PASSWORD"):
-            login_with_email_password("john@example.com", "wrongpassword")
-    
-    @patch('accounts.signups.requests.post')
-    def test_login_invalid_email_format(self, mock_post):
-        """Test 5: Login with invalid email format should fail"""
-        # Mock failed Firebase Auth response
-        mock_response = Mock()
-        mock_response.status_code = 400
-        mock_response.json.return_value = {
-            "error": {
-                "message": "INVALID_EMAIL"
-            }
-        }
-        mock_post.return_value = mock_response
-        
-        with pytest.raises(RuntimeError, match="Login failed: INVALID_EMAIL"):
-            login_with_email_password("not-an-email", "password123")
-
-
-class TestCreateEvent:
-    """Tests for event creation functionality"""
-    
-    @patch('events.schedule.db')
-    def test_create_event_valid_inputs(self, mock_db):
-        """Test 1: Valid event creation with all correct inputs"""
-        # Mock Firestore response
-        mock_doc_ref = Mock()
-        mock_doc_ref.id = "test_event_123"
-        mock_db.collection.return_value.add.return_value = (None, mock_doc_ref)
-        
-        future_date = (datetime.now() + timedelta(days=7)).strftime("%Y-%m-%d")
-        
-        result = create_hiking_event(
+
+
+def test_create_event_past_date(schedule, mock_db, past_date):
+    """Test 3: Event creation with past date should fail"""
+    with pytest.raises(ValueError, match=_ERR_PAST):
+        schedule.create_hiking_event(
+            title="Mountain Hike",
+            location="Blue Ridge Trail",
+            event_date=past_date
+        )
+
+
+def test_create_event_invalid_difficulty(schedule, mock_db, future_date):
+    """Test 4: Event creation with invalid difficulty level should fail"""
+    with pytest.raises(ValueError, match=_ERR_DIFF):
+        schedule.create_hiking_event(
             title="Mountain Hike",
             location="Blue Ridge Trail",
             event_date=future_date,
-            description="A beautiful mountain hike",
-            max_attendees=15,
-            difficulty_level="intermediate",
-            organizer_uid="organizer_123"
+            difficulty_level="expert"
         )
-        
-        assert result["success"] is True
-        assert result["event_id"] == "test_event_123"
-        assert result["title"] == "Mountain Hike"
-        assert result["location"] == "Blue Ridge Trail"
-        assert result["max_attendees"] == 15
-        assert result["difficulty_level"] == "intermediate"
-    
-    def test_create_event_empty_title(self):
-        """Test 2: Event creation with empty title should fail"""
-        future_date = (datetime.now() + timedelta(days=7)).strftime("%Y-%m-%d")
-        
-        with pytest.raises(ValueError, match="Title and location are required"):
-            create_hiking_event(
-                title="",
-                location="Blue Ridge Trail",
-                event_date=future_date
-            )
-    
-    def test_create_event_past_date(self):
-        """Test 3: Event creation with past date should fail"""
-        past_date = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
-        
-        with pytest.raises(ValueError, match="Event date must be in the future"):
-            create_hiking_event(
-                title="Mountain Hike",
-                location="Blue Ridge Trail",
-                event_date=past_date
-            )
-    
-    def test_create_event_invalid_difficulty(self):
-        """Test 4: Event creation with invalid difficulty level should fail"""
-        future_date = (datetime.now() + timedelta(days=7)).strftime("%Y-%m-%d")
-        
-        with pytest.raises(ValueError, match="Difficulty level must be: beginner, intermediate, or advanced"):
-            create_hiking_event(
-                title="Mountain Hike",
-                location="Blue Ridge Trail",
-                event_date=future_date,
-                difficulty_level="expert"
-            )
-    
-    def test_create_event_negative_attendees(self):
-        """Test 5: Event creation with negative max attendees should fail"""
-        future_date = (datetime.now() + timedelta(days=7)).strftime("%Y-%m-%d")
-        
-        with pytest.raises(ValueError, match="Max attendees must be greater than 0"):
-            create_hiking_event(
-                title="Mountain Hike",
-                location="Blue Ridge Trail",
-                event_date=future_date,
-                max_attendees=-5
-            )
-
-
-class TestDownloadMap:
-    """Tests for map downloading functionality"""
-    
-    def test_validate_latitude_valid(self):
-        """Test 1: Valid latitude should pass validation"""
-        result = validate_latitude("37.3496")
-        assert result == 37.3496
-    
-    def test_validate_latitude_too_high(self):
-        """Test 2: Latitude above 90 should fail validation"""
-        with pytest.raises(Exception, match="Latitude must be between -90 and 90"):
-            validate_latitude("91")
-    
-    def test_validate_longitude_too_low(self):
-        """Test 3: Longitude below -180 should fail validation"""
-        with pytest.raises(Exception, match="Longitude must be between -180 and 180"):
-            validate_longitude("-181")
-    
-    def test_validate_zoom_too_high(self):
-        """Test 4: Zoom level above 18 should fail validation"""
-        with pytest.raises(Exception, match="Zoom must be between 1 and 18"):
-            validate_zoom("19")
-    
-    def test_validate_latitude_invalid_format(self):
-        """Test 5: Invalid latitude format should fail validation"""
-        with pytest.raises(Exception, match="Invalid latitude value"):
-            validate_latitude("not_a_number")
+
+
+def test_create_event_negative_attendees(schedule, mock_db, future_date):
+    """Test 5: Event creation with negative max attendees should fail"""
+    with pytest.raises(ValueError, match=_ERR_ATTENDEES):
+        schedule.create_hiking_event(
+            title="Mountain Hike",
+            location="Blue Ridge Trail",
+            event_date=future_date,
+            max_attendees=-5
+        )
+
+
+# ─────────────────────────
+# Map downloading
+# ─────────────────────────
+@pytest.mark.parametrize("validator,value,expected,error", [
+    # Test 1: Valid latitude should pass validation
+    ("validate_latitude", "37.3496", 37.3496, None),
+    # Test 2: Latitude above 90 should fail validation
+    ("validate_latitude", "91", None, _ERR_LAT),
+    # Test 3: Longitude below -180 should fail validation
+    ("validate_longitude", "-181", None, _ERR_LNG),
+    # Test 4: Zoom level above 18 should fail validation
+    ("validate_zoom", "19", None, _ERR_ZOOM),
+    # Test 5: Invalid latitude format should fail validation
+    ("validate_latitude", "not_a_number", None, _ERR_LAT_FORMAT),
+])
+def test_map_validators(download_map, validator, value, expected, error):
+    """Map input validators accept valid values and reject invalid ones"""
+    validator = getattr(download_map, validator)
+    if error is None:
+        assert validator(value) == expected
+    else:
+        with pytest.raises(Exception) as exc_info:
+            validator(value)
+        assert error in str(exc_info.value)
 
 
 if __name__ == "__main__":
-    pytest.main([__file__, "-v"])
+    from importlib.util import find_spec
+    
+    # Skip plugins these tests don't use (and the .pytest_cache writes)
+    args = [
+        __file__, "-v", "--no-header",
+        "-p", "no:cacheprovider", "-p", "no:stepwise", "-p", "no:doctest",
+    ]
+    # loadfile keeps the module-scoped patches on a single worker
+    if find_spec("xdist") is not None:
+        args.extend(["-n", "auto", "--dist=loadfile"])
+    pytest.main(args)
@@ -3,43 +3,120 @@
 School Unit Tests for TrailMix Backend using unittest library
 
 This module contains focused unit tests for the most critical functionality of the TrailMix backend.
-Each test category (signup, signin, event creation, map validation) includes:
-- 1 valid input test (happy path)
-- 4 invalid input tests (error handling)
-- 1 edge case test (boundary conditions)
+Each test category (signup, signin, event creation) includes:
+- 1 valid input case (happy path)
+- 4 invalid input cases (error handling)
+- 1 edge case (boundary conditions)
+
+Cases that share a test body are table-driven and run as subTests, so each
+input vector is still reported on its own.
 
 Test Structure:
-- TestSignUp: 6 tests for user registration functionality
-- TestSignIn: 6 tests for user authentication functionality  
-- TestCreateEvent: 6 tests for hiking event creation functionality
-- TestDownloadMap: 6 tests for map coordinate validation functionality
+- TestSignUp: 6 cases for user registration functionality
+- TestSignIn: 6 cases for user authentication functionality  
+- TestCreateEvent: 6 cases for hiking event creation functionality
+
+Total: 18 cases covering the most important user workflows and error scenarios.
 
-Total: 24 tests covering the most important user workflows and error scenarios.
+The map coordinate validation cases need no mocks or Firebase, so they live in
+tests/test_map_validators.py and can be run on their own.
 
 Usage:
     python school_unit_tests_unittest.py
+    python school_unit_tests_unittest.py -v
+    python school_unit_tests_unittest.py --parallel
+    pytest -n auto --dist=loadscope school_unit_tests_unittest.py
+    FAST=1 python school_unit_tests_unittest.py
+
+The three test classes share no state (every Firebase/Firestore call is mocked),
+so they can run in parallel with pytest-xdist. --dist=loadscope sends each class
+to a single worker, so its setUpClass patchers are still started only once.
+
+Setting FAST=1 skips the edge cases and keeps the happy-path and validation
+cases, for a quicker feedback loop during development. CI runs everything.
     
 Dependencies:
     - unittest (Python standard library)
     - unittest.mock (for mocking external dependencies; done to prevent actual Firebase calls, which gets pricey)
     - datetime (for date/time operations)
-    - TrailMix backend modules (accounts, events, maps)
+    - TrailMix backend modules (accounts, events)
+    - pytest and pytest-xdist (optional, for --parallel)
 """
 
 import unittest
 import sys
 import os
-from datetime import datetime, timedelta
-from unittest.mock import Mock, patch, MagicMock
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from importlib import import_module
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock
 
 # Add the parent directory to the path so we can import from backend modules
-# This allows us to import from accounts/, events/, and maps/ directories
+# This allows us to import from the accounts/ and events/ directories
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-# Import the modules we're testing
-from accounts.signups import signup_with_email_password, login_with_email_password
-from events.schedule import create_hiking_event
-from maps.download_map import validate_latitude, validate_longitude, validate_zoom, fetch_osm_data
+# Stand-in for the Firebase Admin SDK, installed before the modules under test
+# are imported so they never load the real SDK or initialize credentials.
+# Left alone if the real SDK is already loaded (e.g. by another test module
+# in the same pytest run), so the class-level patches below still apply.
+if "firebase_admin" not in sys.modules:
+    _firebase_admin = MagicMock()
+    for _submodule in ("auth", "credentials", "firestore"):
+        sys.modules[f"firebase_admin.{_submodule}"] = getattr(_firebase_admin, _submodule)
+    sys.modules["firebase_admin"] = _firebase_admin
+
+# The modules we're testing pull in Firebase Admin and Firestore, so each TestCase imports its module in setUpClass rather than
+# at collection time
+
+
+# Edge-case subTests skipped when FAST is set
+FAST = bool(os.environ.get("FAST"))
+EDGE_CASES = frozenset({
+    "minimum password length",
+    "unicode email",
+    "maximum attendees",
+})
+
+
+def _skip_if_fast(test_case, case):
+    """Skip the current subTest when FAST is set and case is an edge case"""
+    if FAST and case in EDGE_CASES:
+        test_case.skipTest(f"edge case '{case}' skipped (FAST is set)")
+
+
+@dataclass(frozen=True)
+class FakeResponse:
+    """Minimal stand-in for the requests.Response returned by the Firebase Auth REST API"""
+    status_code: int
+    _payload: dict
+    
+    def json(self):
+        return self._payload
+
+
+# Firebase Auth REST responses shared by the sign-in cases
+SUCCESS_RESP = FakeResponse(200, {
+    "localId": "test_uid_123",
+    "idToken": "test_id_token",
+    "refreshToken": "test_refresh_token",
+    "expiresIn": "3600"
+})
+INVALID_PW_RESP = FakeResponse(400, {"error": {"message": "INVALID_PASSWORD"}})
+INVALID_EMAIL_RESP = FakeResponse(400, {"error": {"message": "INVALID_EMAIL"}})
+
+
+def _start_class_patch(test_class, target):
+    """
+    Patch target for the lifetime of a TestCase class
+    
+    The patcher is started once in setUpClass and stopped by a class cleanup,
+    instead of being entered and exited around every test method.
+    """
+    patcher = patch(target)
+    mock = patcher.start()
+    test_class.addClassCleanup(patcher.stop)
+    return mock
 
 
 class TestSignUp(unittest.TestCase):
@@ -55,17 +132,32 @@ class TestSignUp(unittest.TestCase):
     All tests use mocking to avoid actual Firebase calls during testing.
     """
     
-    @patch('accounts.signups.auth')
-    @patch('accounts.signups.create_user_profile')
-    @patch('accounts.signups._is_username_taken')
-    def test_signup_valid_inputs(self, mock_username_taken, mock_create_profile, mock_auth):
+    @classmethod
+    def setUpClass(cls):
+        """Patch Firebase Auth and Firestore once and build the shared user record"""
+        cls.signups = import_module('accounts.signups')
+        cls.mock_auth = _start_class_patch(cls, 'accounts.signups.auth')
+        cls.mock_create_profile = _start_class_patch(cls, 'accounts.signups.create_user_profile')
+        cls.mock_username_taken = _start_class_patch(cls, 'accounts.signups._is_username_taken')
+        
+        # Mock Firebase Auth user creation response
+        cls._mock_user_record = SimpleNamespace(uid="test_uid_123", email="john@example.com")
+        cls.mock_auth.create_user.return_value = cls._mock_user_record
+    
+    def setUp(self):
+        """Clear call history left by the previous test"""
+        self.mock_auth.reset_mock()
+        self.mock_create_profile.reset_mock()
+        self.mock_username_taken.reset_mock()
+    
+    def test_signup_valid_inputs(self):
         """
-        Test 1: Valid signup with all correct inputs (Happy Path)
+        Tests 1 and 6: Valid signup (Happy Path) and minimum password length (Edge Case)
         
         This test verifies that a user can successfully sign up when providing:
         - Valid name, username, email, and password
         - Username that is not already taken
-        - All required fields filled
+        - A password of exactly the minimum length (6 characters)
         
         Expected behavior:
         - Firebase Auth user is created successfully
@@ -73,155 +165,67 @@ class TestSignUp(unittest.TestCase):
         - Success response is returned with user details
         """
         # Mock username availability check - username is not taken
-        mock_username_taken.return_value = False
-        
-        # Mock Firebase Auth user creation response
-        mock_user_record = Mock()
-        mock_user_record.uid = "test_uid_123"
-        mock_user_record.email = "john@example.com"
-        mock_auth.create_user.return_value = mock_user_record
-        
-        # Execute the signup function with valid inputs
-        result = signup_with_email_password(
-            name="John Doe",
-            username="johndoe",
-            email="john@example.com",
-            password="password123"
-        )
-        
-        # Verify the signup was successful and returned correct data
-        self.assertTrue(result["success"])
-        self.assertEqual(result["uid"], "test_uid_123")
-        self.assertEqual(result["email"], "john@example.com")
-        self.assertEqual(result["name"], "John Doe")
-        self.assertEqual(result["username"], "johndoe")
-    
-    def test_signup_empty_name(self):
-        """
-        Test 2: Signup with empty name should fail (Input Validation)
-        
-        This test verifies that the signup function properly validates required fields
-        and rejects attempts to sign up with an empty name field.
-        
-        Expected behavior:
-        - ValueError should be raised
-        - Error message should indicate "Please fill in all fields"
-        """
-        with self.assertRaises(ValueError) as context:
-            signup_with_email_password(
-                name="",  # Empty name should trigger validation error
-                username="johndoe",
-                email="john@example.com",
-                password="password123"
-            )
-        self.assertIn("Please fill in all fields", str(context.exception))
-    
-    def test_signup_short_password(self):
-        """
-        Test 3: Signup with password too short should fail (Input Validation)
-        
-        This test verifies that the signup function enforces minimum password length
-        requirements and rejects passwords that are too short.
-        
-        Expected behavior:
-        - ValueError should be raised
-        - Error message should indicate minimum password length requirement
-        """
-        with self.assertRaises(ValueError) as context:
-            signup_with_email_password(
-                name="John Doe",
-                username="johndoe",
-                email="john@example.com",
-                password="123"  # Password too short (less than 6 characters)
-            )
-        self.assertIn("Password must be at least 6 characters long", str(context.exception))
-    
-    @patch('accounts.signups._is_username_taken')
-    def test_signup_username_taken(self, mock_username_taken):
-        """
-        Test 4: Signup with taken username should fail (Business Logic Validation)
-        
-        This test verifies that the signup function checks for username uniqueness
-        and prevents duplicate usernames from being created.
+        self.mock_username_taken.return_value = False
+        
+        cases = [
+            # (case, username, password)
+            ("valid inputs", "johndoe", "password123"),
+            ("minimum password length", "johndoe1", "123456"),  # Exactly 6 characters
+        ]
+        
+        for case, username, password in cases:
+            with self.subTest(case=case):
+                _skip_if_fast(self, case)
+                result = self.signups.signup_with_email_password(
+                    name="John Doe",
+                    username=username,
+                    email="john@example.com",
+                    password=password
+                )
+                
+                # Verify the signup was successful and returned correct data
+                # Note: Password is not returned in the result for security reasons
+                self.assertTrue(result["success"])
+                self.assertEqual(result["uid"], "test_uid_123")
+                self.assertEqual(result["email"], "john@example.com")
+                self.assertEqual(result["name"], "John Doe")
+                self.assertEqual(result["username"], username)
+    
+    def test_signup_invalid_inputs(self):
+        """
+        Tests 2-5: Signup with invalid inputs should fail (Input and Business Logic Validation)
+        
+        This test verifies that the signup function rejects:
+        - An empty name or email (required fields)
+        - A password shorter than 6 characters
+        - A username that is already taken
         
         Expected behavior:
         - ValueError should be raised
-        - Error message should indicate username is already taken
-        """
-        # Mock that the username is already taken
-        mock_username_taken.return_value = True
-        
-        with self.assertRaises(ValueError) as context:
-            signup_with_email_password(
-                name="John Doe",
-                username="johndoe",  # This username is already taken
-                email="john@example.com",
-                password="password123"
-            )
-        self.assertIn("Username 'johndoe' is already taken", str(context.exception))
-    
-    def test_signup_empty_email(self):
-        """
-        Test 5: Signup with empty email should fail (Input Validation)
-        
-        This test verifies that the signup function properly validates required fields
-        and rejects attempts to sign up with an empty email field.
-        
-        Expected behavior:
-        - ValueError should be raised
-        - Error message should indicate "Please fill in all fields"
-        """
-        with self.assertRaises(ValueError) as context:
-            signup_with_email_password(
-                name="John Doe",
-                username="johndoe",
-                email="",  # Empty email should trigger validation error
-                password="password123"
-            )
-        self.assertIn("Please fill in all fields", str(context.exception))
-    
-    @patch('accounts.signups.auth')
-    @patch('accounts.signups.create_user_profile')
-    @patch('accounts.signups._is_username_taken')
-    def test_signup_edge_case_minimum_password_length(self, mock_username_taken, mock_create_profile, mock_auth):
-        """
-        Test 6: Edge case - Signup with minimum valid password length (6 characters)
-        
-        This test verifies the boundary condition where a user provides exactly
-        the minimum required password length. This is an important edge case
-        because it tests the exact boundary between valid and invalid passwords.
-        
-        Expected behavior:
-        - Signup should succeed with exactly 6-character password
-        - All user data should be properly stored and returned
-        - This validates the minimum password requirement is correctly implemented
-        """
-        # Mock username availability check - username is not taken
-        mock_username_taken.return_value = False
-        
-        # Mock Firebase Auth user creation response
-        mock_user_record = Mock()
-        mock_user_record.uid = "test_uid_123"
-        mock_user_record.email = "john@example.com"
-        mock_auth.create_user.return_value = mock_user_record
-        
-        # Test with minimum valid password length (exactly 6 characters)
-        min_password = "123456"  # Exactly 6 characters (minimum valid length)
-        
-        result = signup_with_email_password(
-            name="John Doe",
-            username="johndoe1",
-            email="john@example.com",
-            password=min_password
-        )
-        
-        # Verify the signup was successful with minimum password length
-        self.assertTrue(result["success"])
-        self.assertEqual(result["uid"], "test_uid_123")
-        self.assertEqual(result["email"], "john@example.com")
-        self.assertEqual(result["name"], "John Doe")
-        self.assertEqual(result["username"], "johndoe1")
-        # Note: Password is not returned in the result for security reasons
+        - Error message should describe the failed check
+        """
+        cases = [
+            # (case, overrides, username taken, expected error)
+            ("empty name", {"name": ""}, False, "Please fill in all fields"),
+            ("short password", {"password": "123"}, False, "Password must be at least 6 characters long"),
+            ("username taken", {}, True, "Username 'johndoe' is already taken"),
+            ("empty email", {"email": ""}, False, "Please fill in all fields"),
+        ]
+        
+        for case, overrides, taken, message in cases:
+            with self.subTest(case=case):
+                self.mock_username_taken.return_value = taken
+                fields = {
+                    "name": "John Doe",
+                    "username": "johndoe",
+                    "email": "john@example.com",
+                    "password": "password123",
+                    **overrides
+                }
+                
+                with self.assertRaises(ValueError) as context:
+                    self.signups.signup_with_email_password(**fields)
+                self.assertIn(message, str(context.exception))
 
 
 class TestSignIn(unittest.TestCase):
@@ -237,181 +241,109 @@ class TestSignIn(unittest.TestCase):
     All tests use mocking to avoid actual Firebase API calls during testing.
     """
     
-    @patch('accounts.signups.requests.post')
-    @patch('accounts.signups.create_user_profile')
-    @patch('accounts.signups._user_doc_ref')
-    def test_login_valid_credentials(self, mock_user_doc_ref, mock_create_profile, mock_post):
+    @classmethod
+    def setUpClass(cls):
+        """Patch the Firebase Auth REST call and Firestore once and build the shared profile"""
+        cls.signups = import_module('accounts.signups')
+        cls.mock_post = _start_class_patch(cls, 'accounts.signups.requests.post')
+        cls.mock_create_profile = _start_class_patch(cls, 'accounts.signups.create_user_profile')
+        cls.mock_user_doc_ref = _start_class_patch(cls, 'accounts.signups._user_doc_ref')
+        
+        # Existing user profile in Firestore; each case swaps in its own to_dict
+        cls._mock_doc = SimpleNamespace(exists=True, to_dict=dict)
+        cls._mock_doc_ref = SimpleNamespace(get=lambda: cls._mock_doc)
+        cls.mock_user_doc_ref.return_value = cls._mock_doc_ref
+    
+    def setUp(self):
+        """Clear call history left by the previous test"""
+        self.mock_post.reset_mock()
+        self.mock_create_profile.reset_mock()
+        self.mock_user_doc_ref.reset_mock()
+    
+    def test_login_valid_credentials(self):
         """
-        Test 1: Valid login with correct email and password (Happy Path)
+        Tests 1 and 6: Valid login (Happy Path) and unicode email (Edge Case)
         
         This test verifies that a user can successfully log in when providing:
         - Valid email and password combination
         - Existing user profile in Firestore
-        - Successful Firebase authentication
+        - An international email address with accented characters
         
         Expected behavior:
         - Firebase authentication succeeds
         - User profile is retrieved and updated
         - Success response is returned with authentication tokens
+        - All unicode characters should be preserved
         """
         # Mock successful Firebase Auth API response
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "localId": "test_uid_123",
-            "idToken": "test_id_token",
-            "refreshToken": "test_refresh_token",
-            "expiresIn": "3600"
-        }
-        mock_post.return_value = mock_response
-        
-        # Mock user profile exists in Firestore
-        mock_doc_ref = Mock()
-        mock_doc = Mock()
-        mock_doc.exists = True
-        mock_doc.to_dict.return_value = {
-            "name": "John Doe",
-            "username": "johndoe"
-        }
-        mock_doc_ref.get.return_value = mock_doc
-        mock_user_doc_ref.return_value = mock_doc_ref
-        
-        # Execute login with valid credentials
-        result = login_with_email_password("john@example.com", "password123")
-        
-        # Verify login was successful and returned correct data
-        self.assertTrue(result["success"])
-        self.assertEqual(result["uid"], "test_uid_123")
-        self.assertEqual(result["email"], "john@example.com")
-        self.assertEqual(result["idToken"], "test_id_token")
-    
-    def test_login_empty_email(self):
-        """
-        Test 2: Login with empty email should fail (Input Validation)
+        self.mock_post.return_value = SUCCESS_RESP
+        
+        cases = [
+            # (case, email, stored profile)
+            ("valid credentials", "john@example.com", {"name": "John Doe", "username": "johndoe"}),
+            ("unicode email", "josé.garcía@example.com", {"name": "José García", "username": "josegarcia"}),
+        ]
+        
+        for case, email, profile in cases:
+            with self.subTest(case=case):
+                _skip_if_fast(self, case)
+                self._mock_doc.to_dict = profile.copy
+                
+                result = self.signups.login_with_email_password(email, "password123")
+                
+                # Verify login was successful and returned correct data
+                self.assertTrue(result["success"])
+                self.assertEqual(result["uid"], "test_uid_123")
+                self.assertEqual(result["email"], email)
+                self.assertEqual(result["idToken"], "test_id_token")
+    
+    def test_login_empty_fields(self):
+        """
+        Tests 2-3: Login with an empty email or password should fail (Input Validation)
         
         This test verifies that the login function properly validates required fields
-        and rejects attempts to log in with an empty email field.
+        and rejects attempts to log in with either field left empty.
         
         Expected behavior:
         - ValueError should be raised
         - Error message should indicate both email and password are required
         """
-        with self.assertRaises(ValueError) as context:
-            login_with_email_password("", "password123")  # Empty email should trigger validation error
-        self.assertIn("Please enter both email and password", str(context.exception))
-    
-    def test_login_empty_password(self):
-        """
-        Test 3: Login with empty password should fail (Input Validation)
+        cases = [
+            # (case, email, password)
+            ("empty email", "", "password123"),
+            ("empty password", "john@example.com", ""),
+        ]
         
-        This test verifies that the login function properly validates required fields
-        and rejects attempts to log in with an empty password field.
-        
-        Expected behavior:
-        - ValueError should be raised
-        - Error message should indicate both email and password are required
-        """
-        with self.assertRaises(ValueError) as context:
-            login_with_email_password("john@example.com", "")  # Empty password should trigger validation error
-        self.assertIn("Please enter both email and password", str(context.exception))
+        for case, email, password in cases:
+            with self.subTest(case=case):
+                with self.assertRaises(ValueError) as context:
+                    self.signups.login_with_email_password(email, password)
+                self.assertIn("Please enter both email and password", str(context.exception))
     
-    @patch('accounts.signups.requests.post')
-    def test_login_wrong_password(self, mock_post):
+    def test_login_rejected(self):
         """
-        Test 4: Login with wrong password should fail (Authentication Failure)
+        Tests 4-5: Login rejected by Firebase should fail (Authentication Failure)
         
         This test verifies that the login function properly handles authentication
-        failures when an incorrect password is provided.
+        failures for a wrong password and for a malformed email address.
         
         Expected behavior:
         - RuntimeError should be raised
-        - Error message should indicate invalid password
-        """
-        # Mock failed Firebase Auth API response
-        mock_response = Mock()
-        mock_response.status_code = 400
-        mock_response.json.return_value = {
-            "error": {
-                "message": "INVALID_PASSWORD"
-            }
-        }
-        mock_post.return_value = mock_response
-        
-        with self.assertRaises(RuntimeError) as context:
-            login_with_email_password("john@example.com", "wrongpassword")  # Wrong password
-        self.assertIn("Login failed: INVALID_PASSWORD", str(context.exception))
-    
-    @patch('accounts.signups.requests.post')
-    def test_login_invalid_email_format(self, mock_post):
-        """
-        Test 5: Login with invalid email format should fail (Input Validation)
-        
-        This test verifies that the login function properly handles malformed email
-        addresses and returns appropriate error messages.
-        
-        Expected behavior:
-        - RuntimeError should be raised
-        - Error message should indicate invalid email format
-        """
-        # Mock failed Firebase Auth API response
-        mock_response = Mock()
-        mock_response.status_code = 400
-        mock_response.json.return_value = {
-            "error": {
-                "message": "INVALID_EMAIL"
-            }
-        }
-        mock_post.return_value = mock_response
-        
-        with self.assertRaises(RuntimeError) as context:
-            login_with_email_password("not-an-email", "password123")  # Invalid email format
-        self.assertIn("Login failed: INVALID_EMAIL", str(context.exception))
-    
-    @patch('accounts.signups.requests.post')
-    @patch('accounts.signups.create_user_profile')
-    @patch('accounts.signups._user_doc_ref')
-    def test_login_edge_case_unicode_email(self, mock_user_doc_ref, mock_create_profile, mock_post):
-        """
-        Test 6: Edge case - Login with unicode characters in email
-        
-        This test verifies that the login function properly handles international
-        email addresses containing unicode characters (accented letters, special
-        characters, etc.). This is important for international users.
-        
-        Expected behavior:
-        - Login should succeed with unicode email address
-        - User profile should be retrieved correctly
-        - All unicode characters should be preserved
-        """
-        # Mock successful Firebase Auth API response
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "localId": "test_uid_123",
-            "idToken": "test_id_token",
-            "refreshToken": "test_refresh_token",
-            "expiresIn": "3600"
-        }
-        mock_post.return_value = mock_response
-        
-        # Mock user profile exists in Firestore with unicode name
-        mock_doc_ref = Mock()
-        mock_doc = Mock()
-        mock_doc.exists = True
-        mock_doc.to_dict.return_value = {
-            "name": "José García",
-            "username": "josegarcia"
-        }
-        mock_doc_ref.get.return_value = mock_doc
-        mock_user_doc_ref.return_value = mock_doc_ref
-        
-        # Test with unicode email containing accented characters
-        unicode_email = "josé.garcía@example.com"
-        result = login_with_email_password(unicode_email, "password123")
-        
-        # Verify login was successful with unicode email
-        self.assertTrue(result["success"])
-        self.assertEqual(result["email"], unicode_email)
+        - Error message should include the Firebase error code
+        """
+        cases = [
+            # (case, email, password, failed Firebase Auth API response, Firebase error)
+            ("wrong password", "john@example.com", "wrongpassword", INVALID_PW_RESP, "INVALID_PASSWORD"),
+            ("invalid email format", "not-an-email", "password123", INVALID_EMAIL_RESP, "INVALID_EMAIL"),
+        ]
+        
+        for case, email, password, response, error in cases:
+            with self.subTest(case=case):
+                self.mock_post.return_value = response
+                
+                with self.assertRaises(RuntimeError) as context:
+                    self.signups.login_with_email_password(email, password)
+                self.assertIn(f"Login failed: {error}", str(context.exception))
 
 
 class TestCreateEvent(unittest.TestCase):
@@ -427,15 +359,45 @@ class TestCreateEvent(unittest.TestCase):
     All tests use mocking to avoid actual Firestore database calls during testing.
     """
     
-    @patch('events.schedule.db')
-    def test_create_event_valid_inputs(self, mock_db):
+    @classmethod
+    def setUpClass(cls):
+        """Patch the Firestore client once and build the shared add() result"""
+        cls.schedule = import_module('events.schedule')
+        cls.mock_db = _start_class_patch(cls, 'events.schedule.db')
+        
+        # Mock Firestore database response; add() returns (update_time, doc_ref)
+        cls._firestore_add_return = (None, SimpleNamespace(id="test_event_123"))
+        cls.mock_db.collection.return_value.add.return_value = cls._firestore_add_return
+        
+        # Event dates are checked against UTC now, so derive them from UTC as well.
+        # The extra day of margin keeps FUTURE_DATE valid across a date rollover.
+        today = datetime.now(timezone.utc)
+        cls.FUTURE_DATE = (today + timedelta(days=8)).strftime("%Y-%m-%d")
+        cls.PAST_DATE = (today - timedelta(days=1)).strftime("%Y-%m-%d")
+        
+        # Valid create_hiking_event arguments; each case overrides what it tests
+        cls.VALID_EVENT = {
+            "title": "Mountain Hike",
+            "location": "Blue Ridge Trail",
+            "event_date": cls.FUTURE_DATE,
+            "description": "A beautiful mountain hike",
+            "max_attendees": 15,
+            "difficulty_level": "intermediate",
+            "organizer_uid": "organizer_123",
+        }
+    
+    def setUp(self):
+        """Clear call history left by the previous test"""
+        self.mock_db.reset_mock()
+    
+    def test_create_event_valid_inputs(self):
         """
-        Test 1: Valid event creation with all correct inputs (Happy Path)
+        Tests 1 and 6: Valid event creation (Happy Path) and 1000 attendees (Edge Case)
         
         This test verifies that an event can be successfully created when providing:
         - Valid title, location, and description
         - Future event date
-        - Valid difficulty level and attendee count
+        - Valid difficulty level and attendee count, including a very large group
         - Valid organizer UID
         
         Expected behavior:
@@ -443,355 +405,84 @@ class TestCreateEvent(unittest.TestCase):
         - Success response is returned with event details
         - All event data is properly saved and returned
         """
-        # Mock Firestore database response
-        mock_doc_ref = Mock()
-        mock_doc_ref.id = "test_event_123"
-        mock_db.collection.return_value.add.return_value = (None, mock_doc_ref)
-        
-        # Create a future date for the event
-        future_date = (datetime.now() + timedelta(days=7)).strftime("%Y-%m-%d")
-        
-        # Execute event creation with valid inputs
-        result = create_hiking_event(
-            title="Mountain Hike",
-            location="Blue Ridge Trail",
-            event_date=future_date,
-            description="A beautiful mountain hike",
-            max_attendees=15,
-            difficulty_level="intermediate",
-            organizer_uid="organizer_123"
-        )
-        
-        # Verify event was created successfully
-        self.assertTrue(result["success"])
-        self.assertEqual(result["event_id"], "test_event_123")
-        self.assertEqual(result["title"], "Mountain Hike")
-        self.assertEqual(result["location"], "Blue Ridge Trail")
-        self.assertEqual(result["max_attendees"], 15)
-        self.assertEqual(result["difficulty_level"], "intermediate")
-    
-    def test_create_event_empty_title(self):
-        """
-        Test 2: Event creation with empty title should fail (Input Validation)
-        
-        This test verifies that the event creation function properly validates
-        required fields and rejects attempts to create events with empty titles.
-        
-        Expected behavior:
-        - ValueError should be raised
-        - Error message should indicate title and location are required
-        """
-        future_date = (datetime.now() + timedelta(days=7)).strftime("%Y-%m-%d")
-        
-        with self.assertRaises(ValueError) as context:
-            create_hiking_event(
-                title="",  # Empty title should trigger validation error
-                location="Blue Ridge Trail",
-                event_date=future_date
-            )
-        self.assertIn("Title and location are required", str(context.exception))
-    
-    def test_create_event_past_date(self):
-        """
-        Test 3: Event creation with past date should fail (Business Logic Validation)
-        
-        This test verifies that the event creation function enforces the business
-        rule that events must be scheduled for future dates only.
-        
-        Expected behavior:
-        - ValueError should be raised
-        - Error message should indicate event date must be in the future
-        """
-        past_date = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
-        
-        with self.assertRaises(ValueError) as context:
-            create_hiking_event(
-                title="Mountain Hike",
-                location="Blue Ridge Trail",
-                event_date=past_date  # Past date should trigger validation error
-            )
-        self.assertIn("Event date must be in the future", str(context.exception))
-    
-    def test_create_event_invalid_difficulty(self):
-        """
-        Test 4: Event creation with invalid difficulty level should fail (Input Validation)
-        
-        This test verifies that the event creation function validates difficulty
-        levels and only accepts predefined valid values.
+        cases = [
+            # (case, overrides)
+            ("valid inputs", {}),
+            ("maximum attendees", {
+                "title": "Massive Group Hike",
+                "location": "National Park Trail",
+                "description": "A large group hiking event",
+                "max_attendees": 1000,  # Very large number - edge case
+                "difficulty_level": "beginner",
+            }),
+        ]
+        
+        for case, overrides in cases:
+            with self.subTest(case=case):
+                _skip_if_fast(self, case)
+                fields = {**self.VALID_EVENT, **overrides}
+                result = self.schedule.create_hiking_event(**fields)
+                
+                # Verify event was created successfully
+                self.assertTrue(result["success"])
+                self.assertEqual(result["event_id"], "test_event_123")
+                self.assertEqual(result["title"], fields["title"])
+                self.assertEqual(result["location"], fields["location"])
+                self.assertEqual(result["max_attendees"], fields["max_attendees"])
+                self.assertEqual(result["difficulty_level"], fields["difficulty_level"])
+    
+    def test_create_event_invalid_inputs(self):
+        """
+        Tests 2-5: Event creation with invalid inputs should fail (Input and Business Logic Validation)
+        
+        This test verifies that the event creation function rejects:
+        - An empty title (required field)
+        - An event date in the past
+        - A difficulty level outside the predefined values
+        - A negative attendee count
         
         Expected behavior:
         - ValueError should be raised
-        - Error message should indicate valid difficulty levels
-        """
-        future_date = (datetime.now() + timedelta(days=7)).strftime("%Y-%m-%d")
-        
-        with self.assertRaises(ValueError) as context:
-            create_hiking_event(
-                title="Mountain Hike",
-                location="Blue Ridge Trail",
-                event_date=future_date,
-                difficulty_level="expert"  # Invalid difficulty level
-            )
-        self.assertIn("Difficulty level must be: beginner, intermediate, or advanced", str(context.exception))
-    
-    def test_create_event_negative_attendees(self):
-        """
-        Test 5: Event creation with negative max attendees should fail (Input Validation)
-        
-        This test verifies that the event creation function validates attendee
-        counts and rejects negative values which don't make business sense.
-        
-        Expected behavior:
-        - ValueError should be raised
-        - Error message should indicate max attendees must be greater than 0
-        """
-        future_date = (datetime.now() + timedelta(days=7)).strftime("%Y-%m-%d")
-        
-        with self.assertRaises(ValueError) as context:
-            create_hiking_event(
-                title="Mountain Hike",
-                location="Blue Ridge Trail",
-                event_date=future_date,
-                max_attendees=-5  # Negative attendee count should trigger validation error
-            )
-        self.assertIn("Max attendees must be greater than 0", str(context.exception))
-    
-    @patch('events.schedule.db')
-    def test_create_event_edge_case_maximum_attendees(self, mock_db):
-        """
-        Test 6: Edge case - Event creation with maximum possible attendees (1000)
-        
-        This test verifies the boundary condition where an event is created with
-        a very large number of attendees. This tests the system's ability to handle
-        large-scale events and validates that there are no artificial limits
-        preventing legitimate large group events.
-        
-        Expected behavior:
-        - Event should be created successfully with 1000 attendees
-        - All event data should be properly stored and returned
-        - This validates the system can handle large group events
-        """
-        # Mock Firestore database response
-        mock_doc_ref = Mock()
-        mock_doc_ref.id = "test_event_123"
-        mock_db.collection.return_value.add.return_value = (None, mock_doc_ref)
-        
-        future_date = (datetime.now() + timedelta(days=7)).strftime("%Y-%m-%d")
-        
-        # Execute event creation with maximum attendees
-        result = create_hiking_event(
-            title="Massive Group Hike",
-            location="National Park Trail",
-            event_date=future_date,
-            description="A large group hiking event",
-            max_attendees=1000,  # Very large number - edge case
-            difficulty_level="beginner",
-            organizer_uid="organizer_123"
-        )
-        
-        # Verify event was created successfully with large attendee count
-        self.assertTrue(result["success"])
-        self.assertEqual(result["max_attendees"], 1000)
-        self.assertEqual(result["title"], "Massive Group Hike")
-
-
-class TestDownloadMap(unittest.TestCase):
-    """
-    Test suite for map coordinate validation functionality.
-    
-    This class tests the coordinate validation functions used in map downloading
-    including latitude, longitude, and zoom level validation. These functions
-    are critical for ensuring map requests use valid geographic coordinates.
-    
-    Test coverage includes:
-    - Valid coordinate scenarios
-    - Boundary value testing (exact limits)
-    - Invalid input validation (out of range, wrong format)
-    - Edge cases (boundary conditions)
-    """
-    
-    def test_validate_latitude_valid(self):
-        """
-        Test 1: Valid latitude should pass validation (Happy Path)
-        
-        This test verifies that a valid latitude coordinate within the acceptable
-        range (-90 to 90 degrees) is properly validated and returned.
-        
-        Expected behavior:
-        - Latitude should be parsed and returned as float
-        - No exceptions should be raised
-        """
-        result = validate_latitude("37.3496")
-        self.assertEqual(result, 37.3496)
-    
-    def test_validate_latitude_too_high(self):
-        """
-        Test 2: Latitude above 90 should fail validation (Input Validation)
-        
-        This test verifies that latitudes above the maximum valid value (90 degrees)
-        are properly rejected with appropriate error messages.
-        
-        Expected behavior:
-        - Exception should be raised
-        - Error message should indicate latitude range limits
-        """
-        with self.assertRaises(Exception) as context:
-            validate_latitude("91")  # Above maximum valid latitude
-        self.assertIn("Latitude must be between -90 and 90", str(context.exception))
-    
-    def test_validate_longitude_too_low(self):
-        """
-        Test 3: Longitude below -180 should fail validation (Input Validation)
-        
-        This test verifies that longitudes below the minimum valid value (-180 degrees)
-        are properly rejected with appropriate error messages.
-        
-        Expected behavior:
-        - Exception should be raised
-        - Error message should indicate longitude range limits
-        """
-        with self.assertRaises(Exception) as context:
-            validate_longitude("-181")  # Below minimum valid longitude
-        self.assertIn("Longitude must be between -180 and 180", str(context.exception))
-    
-    def test_validate_zoom_too_high(self):
-        """
-        Test 4: Zoom level above 18 should fail validation (Input Validation)
-        
-        This test verifies that zoom levels above the maximum valid value (18)
-        are properly rejected with appropriate error messages.
-        
-        Expected behavior:
-        - Exception should be raised
-        - Error message should indicate zoom level range limits
-        """
-        with self.assertRaises(Exception) as context:
-            validate_zoom("19")  # Above maximum valid zoom level
-        self.assertIn("Zoom must be between 1 and 18", str(context.exception))
-    
-    def test_validate_latitude_invalid_format(self):
-        """
-        Test 5: Invalid latitude format should fail validation (Input Validation)
-        
-        This test verifies that non-numeric latitude values are properly rejected
-        with appropriate error messages.
-        
-        Expected behavior:
-        - Exception should be raised
-        - Error message should indicate invalid latitude value
-        """
-        with self.assertRaises(Exception) as context:
-            validate_latitude("not_a_number")  # Non-numeric input
-        self.assertIn("Invalid latitude value", str(context.exception))
-    
-    def test_validate_latitude_edge_case_boundary_values(self):
-        """
-        Test 6: Edge case - Testing exact boundary values for latitude
-        
-        This test verifies the exact boundary conditions for latitude validation.
-        It tests values at the exact limits and just outside them to ensure
-        proper boundary handling.
-        
-        Expected behavior:
-        - Exact boundary values (90, -90, 0) should be valid
-        - Values just outside boundaries should be invalid
-        """
-        # Test exact boundary values - these should be valid
-        self.assertEqual(validate_latitude("90"), 90.0)  # Maximum valid latitude
-        self.assertEqual(validate_latitude("-90"), -90.0)  # Minimum valid latitude
-        self.assertEqual(validate_latitude("0"), 0.0)  # Equator
-        
-        # Test values just outside boundaries - these should be invalid
-        with self.assertRaises(Exception):
-            validate_latitude("90.0001")  # Just above maximum
-        
-        with self.assertRaises(Exception):
-            validate_latitude("-90.0001")  # Just below minimum
+        - Error message should describe the failed check
+        """
+        cases = [
+            # (key, bad value, expected error)
+            ("title", "", "Title and location are required"),
+            ("event_date", self.PAST_DATE, "Event date must be in the future"),
+            ("difficulty_level", "expert", "Difficulty level must be: beginner, intermediate, or advanced"),
+            ("max_attendees", -5, "Max attendees must be greater than 0"),
+        ]
+        
+        for key, value, message in cases:
+            with self.subTest(**{key: value}):
+                with self.assertRaises(ValueError) as context:
+                    self.schedule.create_hiking_event(**{**self.VALID_EVENT, key: value})
+                self.assertIn(message, str(context.exception))
 
 
 if __name__ == "__main__":
     """
     Test Runner and Execution
     
-    This section sets up and runs all the unit tests with a custom result handler
-    that provides detailed output including individual test results and summary statistics.
-    
-    Features:
-    - Custom test result class for detailed reporting
-    - Individual test status display (PASSED/FAILED/ERROR)
-    - Comprehensive test summary with statistics
-    - Detailed error reporting for failed tests
+    Runs the test classes in a fixed order through unittest.main. Output from
+    passing tests is buffered and discarded, so only failures are reported in
+    detail; pass -v for a per-test status line when debugging.
+    --parallel hands the run off to pytest-xdist instead.
     """
     
-    # Create a test suite to organize all tests
-    test_suite = unittest.TestSuite()
-    
-    # Define all test classes to be executed
-    test_classes = [TestSignUp, TestSignIn, TestCreateEvent, TestDownloadMap]
-    
-    # Load tests from each test class and add to the suite
-    for test_class in test_classes:
-        tests = unittest.TestLoader().loadTestsFromTestCase(test_class)
-        test_suite.addTests(tests)
-    
-    # Custom test result class to capture individual test results
-    class CustomTestResult(unittest.TextTestResult):
-        """
-        Custom test result handler that captures individual test results
-        for detailed reporting and analysis.
-        """
-        def __init__(self, stream, descriptions, verbosity):
-            super().__init__(stream, descriptions, verbosity)
-            self.test_results = []  # Store individual test results
-        
-        def addSuccess(self, test):
-            """Record a successful test execution"""
-            super().addSuccess(test)
-            self.test_results.append((test, "PASSED"))
-        
-        def addError(self, test, err):
-            """Record a test that raised an unexpected exception"""
-            super().addError(test, err)
-            self.test_results.append((test, "ERROR"))
-        
-        def addFailure(self, test, err):
-            """Record a test that failed an assertion"""
-            super().addFailure(test, err)
-            self.test_results.append((test, "FAILED"))
-    
-    # Execute all tests with custom result handler
-    runner = unittest.TextTestRunner(verbosity=0, resultclass=CustomTestResult)
-    result = runner.run(test_suite)
-    
-    # Display individual test results in a formatted table
-    print(f"\n{'='*80}")
-    print("INDIVIDUAL TEST RESULTS:")
-    print(f"{'='*80}")
-    
-    for test, status in result.test_results:
-        test_name = f"{test.__class__.__name__}.{test._testMethodName}"
-        print(f"{test_name:<73} {status}")
-    
-    # Display comprehensive test summary
-    print(f"\n{'='*80}")
-    print("TEST SUMMARY:")
-    print(f"{'='*80}")
-    print(f"Total Tests: {result.testsRun}")
-    print(f"Passed: {result.testsRun - len(result.failures) - len(result.errors)}")
-    print(f"Failed: {len(result.failures)}")
-    print(f"Errors: {len(result.errors)}")
-    print(f"Success Rate: {((result.testsRun - len(result.failures) - len(result.errors)) / result.testsRun * 100):.1f}%")
-    print(f"{'='*80}")
-    
-    # Display detailed failure/error information if any tests failed
-    if result.failures or result.errors:
-        print(f"\n{'='*80}")
-        print("DETAILED FAILURE/ERROR INFORMATION:")
-        print(f"{'='*80}")
-        
-        for test, traceback in result.failures + result.errors:
-            test_name = f"{test.__class__.__name__}.{test._testMethodName}"
-            print(f"\n{test_name}:")
-            print("-" * 60)
-            print(traceback)
-            print("-" * 60)
+    if "--parallel" in sys.argv[1:]:
+        import pytest
+        sys.exit(pytest.main([__file__, "-q", "-n", "auto", "--dist=loadscope"]))
+    
+    # Don't re-sort method names, so each class's tests stay contiguous and
+    # its setUpClass work runs only once
+    loader = unittest.TestLoader()
+    loader.sortTestMethodsUsing = None
+    
+    unittest.main(
+        defaultTest=["TestSignUp", "TestSignIn", "TestCreateEvent"],
+        testLoader=loader,
+        verbosity=0,
+        buffer=True,
+        failfast=False,
+    )
@@ -25,108 +25,78 @@ def test_read_placeholder():
 
 
 print("start\n")
-def make_zip(files):
-   """Helper: create an in-memory ZIP from dict of {filename: content}"""
+def _build_zip(files):
+   """Create in-memory ZIP bytes from dict of {filename: content}"""
    buf = io.BytesIO()
    with zipfile.ZipFile(buf, "w") as z:
        for name, data in files.items():
            z.writestr(name, data)
-   buf.seek(0)
-   return buf
+   return buf.getvalue()
 
 
 
 
-# NORMAL CASES
-@patch("services.shapefile_reader.gpd.read_file")
-def test_1_read_valid_shapefile(mock_read):
-   """Test 1 (Normal): Successfully read a valid shapefile"""
-   # Mock geopandas returning a GeoDataFrame-like object
-   mock_gdf = Mock()
-   mock_gdf.__len__.return_value = 100
-   mock_read.return_value = mock_gdf
-
-
-   z = make_zip({"roads.shp": "x", "roads.shx": "x", "roads.dbf": "x", "roads.prj": "x"})
-   reader = ShapefileReader()
-   result = reader.read_shapefile(z)
-
-
-   assert result["success"]
-   assert result["feature_count"] == 100
-   assert "roads" in result["filename"]
-
-
-
-
-# EDGE CASES
-@patch("services.shapefile_reader.gpd.read_file")
-def test_2_read_single_feature_shapefile(mock_read):
-   """Test 2 (Edge): Shapefile with only a single feature"""
-   mock_gdf = Mock()
-   mock_gdf.__len__.return_value = 1
-   mock_read.return_value = mock_gdf
-
-
-   z = make_zip({"single.shp": "x", "single.shx": "x", "single.dbf": "x", "single.prj": "x"})
-   reader = ShapefileReader()
-   result = reader.read_shapefile(z)
-
+@pytest.fixture(scope="module")
+def zip_factory():
+   """Helper: in-memory ZIPs, each built once per module and handed out as a fresh BytesIO"""
+   cache = {}
 
-   assert result["success"]
-   assert result["feature_count"] == 1
 
+   def make_zip(files):
+       key = tuple(sorted(files.items()))
+       if key not in cache:
+           cache[key] = _build_zip(files)
+       return io.BytesIO(cache[key])
 
 
-
-@patch("services.shapefile_reader.gpd.read_file")
-def test_3_read_boundary_projection(mock_read):
-   """Test 3 (Edge): Shapefile with edge-case projection like EPSG:3857"""
-   mock_gdf = Mock()
-   mock_gdf.__len__.return_value = 25
-   mock_gdf.crs = "EPSG:3857"
-   mock_read.return_value = mock_gdf
+   return make_zip
 
 
-   z = make_zip({"boundaries.shp": "x", "boundaries.shx": "x", "boundaries.dbf": "x", "boundaries.prj": "x"})
-   reader = ShapefileReader()
-   result = reader.read_shapefile(z)
 
 
-   assert result["success"]
-   assert result["crs"] == "EPSG:3857"
+def shapefile_parts(stem):
+   """The four files that make up a shapefile called stem"""
+   return {f"{stem}.{ext}": "x" for ext in ("shp", "shx", "dbf", "prj")}
 
 
 
 
-# INVALID CASES
+@pytest.mark.parametrize("files, feature_count, crs, side_effect, expected", [
+   # Test 1 (Normal): Successfully read a valid shapefile
+   (shapefile_parts("roads"), 100, None, None, {"filename": "roads"}),
+   # Test 2 (Edge): Shapefile with only a single feature
+   (shapefile_parts("single"), 1, None, None, {}),
+   # Test 3 (Edge): Shapefile with edge-case projection like EPSG:3857
+   (shapefile_parts("boundaries"), 25, "EPSG:3857", None, {"crs": "EPSG:3857"}),
+   # Test 4 (Invalid): Shapefile that is corrupted or unreadable
+   (shapefile_parts("broken"), None, None, OSError("Corrupted shapefile"), {"error": "Corrupted"}),
+   # Test 5 (Invalid): Provided file is not a shapefile (.csv or missing components)
+   ({"data.csv": "id,lat,lon\n1,0,0"}, None, None, ValueError("Unsupported file format"), {"error": "Unsupported"}),
+], ids=["valid", "single_feature", "boundary_projection", "corrupted", "invalid_format"])
 @patch("services.shapefile_reader.gpd.read_file")
-def test_4_read_corrupted_shapefile(mock_read):
-   """Test 4 (Invalid): Shapefile that is corrupted or unreadable"""
-   mock_read.side_effect = OSError("Corrupted shapefile")
+def test_read_shapefile(mock_read, zip_factory, files, feature_count, crs, side_effect, expected):
+   """Tests 1-5: Read normal, edge-case and invalid shapefiles"""
+   if side_effect is not None:
+       mock_read.side_effect = side_effect
+   else:
+       # Mock geopandas returning a GeoDataFrame-like object
+       mock_gdf = Mock()
+       mock_gdf.__len__ = Mock(return_value=feature_count)
+       if crs is not None:
+           mock_gdf.crs = crs
+       mock_read.return_value = mock_gdf
 
 
-   z = make_zip({"broken.shp": "x", "broken.shx": "x", "broken.dbf": "x", "broken.prj": "x"})
    reader = ShapefileReader()
-   result = reader.read_shapefile(z)
-
-
-   assert not result["success"]
-   assert "Corrupted" in result["error"]
-
-
-
-
-@patch("services.shapefile_reader.gpd.read_file")
-def test_5_read_invalid_format(mock_read):
-   """Test 5 (Invalid): Provided file is not a shapefile (.csv or missing components)"""
-   mock_read.side_effect = ValueError("Unsupported file format")
-
-
-   z = make_zip({"data.csv": "id,lat,lon\n1,0,0"})
-   reader = ShapefileReader()
-   result = reader.read_shapefile(z)
-
-
-   assert not result["success"]
-   assert "Unsupported" in result["error"]
\ No newline at end of file
+   result = reader.read_shapefile(zip_factory(files))
+
+
+   assert result["success"] == (side_effect is None)
+   if side_effect is None:
+       assert result["feature_count"] == feature_count
+   if "filename" in expected:
+       assert expected["filename"] in result["filename"]
+   if "crs" in expected:
+       assert result["crs"] == expected["crs"]
+   if "error" in expected:
+       assert expected["error"] in result["error"]
@@ -5,6 +5,7 @@ Test script to verify environment variables are loaded correctly
 
 import os
 import sys
+from importlib.util import find_spec
 from dotenv import load_dotenv
 
 # Add the current directory to the path so we can import from accounts
@@ -45,20 +46,24 @@ def test_environment_variables():
     
     return all_good
 
+def _installed(package):
+    """Check a package is importable without importing it (firebase_admin is slow to load)"""
+    return find_spec(package) is not None
+
 def test_imports():
     """Test if required packages can be imported"""
     print("\nTesting Package Imports")
     print("=" * 40)
     
+    # Module names, not distribution names (python-dotenv installs 'dotenv')
     packages = ['firebase_admin', 'requests', 'dotenv']
     all_good = True
     
     for package in packages:
-        try:
-            __import__(package)
+        if _installed(package):
             print(f"{package}: Available")
-        except ImportError as e:
-            print(f"{package}: {e}")
+        else:
+            print(f"{package}: Not installed")
             all_good = False
     
     return all_good
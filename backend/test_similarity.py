@@ -7,17 +7,20 @@ sys.path.insert(0, os.path.dirname(__file__))
 
 from matching.profile_matching import normalize_interests, get_profile_vector
 import math
+import numpy as np
 
 def calculate_cosine_similarity(vec1, vec2):
     """Calculate cosine similarity between two vectors."""
-    # Get all unique keys
-    all_keys = set(vec1.keys()) | set(vec2.keys())
+    # Only shared keys contribute to the dot product
+    keys = vec1.keys() & vec2.keys()
+    if not keys:
+        return 0.0
     
-    # Calculate dot product
-    dot_product = sum(vec1.get(k, 0) * vec2.get(k, 0) for k in all_keys)
+    a = np.fromiter((vec1[k] for k in keys), dtype=np.float64, count=len(keys))
+    b = np.fromiter((vec2[k] for k in keys), dtype=np.float64, count=len(keys))
     
     # For unit-normalized vectors, dot product = cosine similarity
-    return dot_product
+    return float(a @ b)
 
 # Test case: Two users with identical interests
 interests1 = ["hiking", "camping", "photography"]
@@ -5,9 +5,20 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(__file__))
 
-from matching.profile_matching import normalize_interests
+from matching.profile_matching import normalize_interests as _normalize_interests
+from functools import lru_cache
+from types import MappingProxyType
 import math
 
+@lru_cache(maxsize=1024)
+def _normalized(interests):
+    return MappingProxyType(_normalize_interests(list(interests)))
+
+def normalize_interests(interests):
+    """Memoized normalize_interests; the result is read-only since it is shared between calls."""
+    # Keyed on the raw list so duplicates/casing still go through the real normalization
+    return _normalized(tuple(interests))
+
 # Test: What if there are duplicate interests?
 print("Test: Duplicate interests")
 interests_dup = ["hiking", "hiking", "camping", "camping", "photography"]
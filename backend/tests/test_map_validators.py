@@ -0,0 +1,111 @@
+"""
+Zero-mock unit tests for the map coordinate validators
+
+The validators are pure functions, so this module imports only them and needs
+no Firebase, Firestore or network mocks. It runs on its own in well under a
+second:
+
+    pytest tests/test_map_validators.py
+    python -m unittest tests.test_map_validators -k latitude
+"""
+
+import unittest
+
+from maps.download_map import validate_latitude, validate_longitude, validate_zoom
+
+
+class TestDownloadMap(unittest.TestCase):
+    """
+    Test suite for map coordinate validation functionality.
+    
+    This class tests the coordinate validation functions used in map downloading
+    including latitude, longitude, and zoom level validation. These functions
+    are critical for ensuring map requests use valid geographic coordinates.
+    
+    Test coverage includes:
+    - Valid coordinate scenarios
+    - Boundary value testing (exact limits)
+    - Invalid input validation (out of range, wrong format)
+    - Edge cases (boundary conditions)
+    """
+    
+    def test_validate_latitude(self):
+        """
+        Tests 1, 2, 5 and 6: Latitude validation, including exact boundary values
+        
+        This test verifies that valid latitudes within the acceptable range
+        (-90 to 90 degrees) are parsed and returned, and that values out of
+        range, just outside the boundaries, or non-numeric are rejected.
+        
+        Expected behavior:
+        - Valid latitudes (including 90, -90 and 0) are returned as floats
+        - Invalid latitudes raise an exception with an appropriate message
+        """
+        invalid_cases = [
+            # (value, expected error)
+            ("91", "Latitude must be between -90 and 90"),  # Above maximum valid latitude
+            ("not_a_number", "Invalid latitude value"),  # Non-numeric input
+        ]
+        
+        with self.subTest(value="37.3496"):
+            self.assertEqual(validate_latitude("37.3496"), 37.3496)
+        
+        for value, message in invalid_cases:
+            with self.subTest(value=value):
+                with self.assertRaises(Exception) as context:
+                    validate_latitude(value)
+                self.assertIn(message, str(context.exception))
+        
+        # Edge case: exact boundary values are valid, values just outside them are not
+        with self.subTest(case="latitude boundaries"):
+            self.assertEqual(validate_latitude("90"), 90.0)  # Maximum valid latitude
+            self.assertEqual(validate_latitude("-90"), -90.0)  # Minimum valid latitude
+            self.assertEqual(validate_latitude("0"), 0.0)  # Equator
+            
+            for value in ("90.0001", "-90.0001"):  # Just above maximum / just below minimum
+                with self.assertRaises(Exception):
+                    validate_latitude(value)
+    
+    def test_validate_longitude(self):
+        """
+        Test 3: Longitude below -180 should fail validation (Input Validation)
+        
+        This test verifies that longitudes below the minimum valid value (-180 degrees)
+        are properly rejected with appropriate error messages.
+        
+        Expected behavior:
+        - Exception should be raised
+        - Error message should indicate longitude range limits
+        """
+        cases = [
+            # (value, expected error)
+            ("-181", "Longitude must be between -180 and 180"),  # Below minimum valid longitude
+        ]
+        
+        for value, message in cases:
+            with self.subTest(value=value):
+                with self.assertRaises(Exception) as context:
+                    validate_longitude(value)
+                self.assertIn(message, str(context.exception))
+    
+    def test_validate_zoom(self):
+        """
+        Test 4: Zoom level above 18 should fail validation (Input Validation)
+        
+        This test verifies that zoom levels above the maximum valid value (18)
+        are properly rejected with appropriate error messages.
+        
+        Expected behavior:
+        - Exception should be raised
+        - Error message should indicate zoom level range limits
+        """
+        cases = [
+            # (value, expected error)
+            ("19", "Zoom must be between 1 and 18"),  # Above maximum valid zoom level
+        ]
+        
+        for value, message in cases:
+            with self.subTest(value=value):
+                with self.assertRaises(Exception) as context:
+                    validate_zoom(value)
+                self.assertIn(message, str(context.exception))
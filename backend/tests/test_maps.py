@@ -8,6 +8,7 @@ import pytest
 import sys
 import os
 from unittest.mock import Mock, patch, MagicMock
+import io
 import json
 
 # Add the parent directory to the path so we can import from maps
@@ -209,29 +210,30 @@ class TestArgumentParsing:
 class TestDataFetching:
     """Test data fetching functions"""
     
-    @patch('maps.download_map.requests.post')
+    @patch('maps.download_map._SESSION.post')
     def test_fetch_osm_data_success(self, mock_post):
         """Test successful OSM data fetching"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "type": "FeatureCollection",
-            "features": [
+        overpass_body = {
+            "elements": [
                 {
-                    "type": "Feature",
-                    "properties": {
+                    "type": "way",
+                    "tags": {
+                        "highway": "path",
                         "name": "Test Trail",
                         "sac_scale": "hiking",
                         "surface": "dirt",
                         "network": "local"
                     },
-                    "geometry": {
-                        "type": "LineString",
-                        "coordinates": [[-121.9390, 37.3496], [-121.9380, 37.3506]]
-                    }
+                    "geometry": [
+                        {"lat": 37.3496, "lon": -121.9390},
+                        {"lat": 37.3506, "lon": -121.9380}
+                    ]
                 }
             ]
         }
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.raw = io.BytesIO(json.dumps(overpass_body).encode())
         mock_post.return_value = mock_response
         
         result = fetch_osm_data(37.3496, -121.9390, 10)
@@ -240,7 +242,37 @@ class TestDataFetching:
         assert len(result["features"]) == 1
         assert result["features"][0]["properties"]["name"] == "Test Trail"
     
-    @patch('maps.download_map.requests.post')
+    @patch('maps.download_map.OVERPASS_PARALLEL_TILES', True)
+    @patch('maps.download_map._SESSION.post')
+    def test_fetch_osm_data_parallel_tiles_dedup(self, mock_post):
+        """Test tiled fetching merges ways returned by several tiles once"""
+        overpass_body = json.dumps({
+            "elements": [
+                {
+                    "type": "way",
+                    "id": 42,
+                    "tags": {"highway": "path", "name": "Boundary Trail"},
+                    "geometry": [
+                        {"lat": 37.3496, "lon": -121.9390},
+                        {"lat": 37.3506, "lon": -121.9380}
+                    ]
+                }
+            ]
+        }).encode()
+
+        def tile_response(*args, **kwargs):
+            response = MagicMock()
+            response.raw = io.BytesIO(overpass_body)
+            return response
+        mock_post.side_effect = tile_response
+
+        result = fetch_osm_data(37.3496, -121.9390, 10)
+
+        assert mock_post.call_count == 4  # 2x2 grid
+        assert len(result["features"]) == 1
+        assert result["features"][0]["id"] == "way/42"
+
+    @patch('maps.download_map._SESSION.post')
     def test_fetch_osm_data_network_error(self, mock_post):
         """Test OSM data fetching with network error"""
         mock_post.side_effect = Exception("Network error")
@@ -250,7 +282,7 @@ class TestDataFetching:
         assert result["type"] == "FeatureCollection"
         assert result["features"] == []
     
-    @patch('maps.download_map.requests.get')
+    @patch('maps.download_map._SESSION.get')
     def test_fetch_trailheads_data_success(self, mock_get):
         """Test successful trailheads data fetching"""
         mock_response = Mock()
@@ -283,7 +315,7 @@ class TestDataFetching:
         assert len(result["features"]) == 1
         assert result["features"][0]["properties"]["NAME"] == "Test Trailhead"
     
-    @patch('maps.download_map.requests.get')
+    @patch('maps.download_map._SESSION.get')
     def test_fetch_trailheads_data_network_error(self, mock_get):
         """Test trailheads data fetching with network error"""
         mock_get.side_effect = Exception("Network error")
@@ -369,11 +401,8 @@ class TestMapBuilding:
 class TestTrailheadMarkers:
     """Test trailhead marker creation"""
     
-    @patch('maps.download_map.folium')
-    def test_create_trailhead_marker(self, mock_folium):
+    def test_create_trailhead_marker(self):
         """Test single trailhead marker creation"""
-        mock_cluster = Mock()
-        
         trailhead = {
             'lat': 37.3496,
             'lon': -121.9390,
@@ -387,16 +416,14 @@ class TestTrailheadMarkers:
             }
         }
         
-        create_trailhead_marker(trailhead, mock_cluster)
+        row = create_trailhead_marker(trailhead)
         
-        # Verify marker was added to cluster
-        mock_cluster.add_to.assert_called()
+        # Verify the row carries position, tooltip, icon and popup
+        assert row[:5] == [37.3496, -121.9390, 'Test Trailhead', 'green', 'hiking']
+        assert row[5] == {"addr": "123 Test St, Test City, CA, 12345", "source": "USGS"}
     
-    @patch('maps.download_map.folium')
-    def test_create_grouped_trailhead_marker(self, mock_folium):
+    def test_create_grouped_trailhead_marker(self):
         """Test grouped trailhead marker creation"""
-        mock_cluster = Mock()
-        
         trailheads = [
             {
                 'lat': 37.3496,
@@ -410,10 +437,13 @@ class TestTrailheadMarkers:
             }
         ]
         
-        create_grouped_trailhead_marker(trailheads, mock_cluster)
+        row = create_grouped_trailhead_marker(trailheads)
         
-        # Verify grouped marker was added to cluster
-        mock_cluster.add_to.assert_called()
+        # Verify grouped marker sits at the group center
+        assert row[0] == pytest.approx(37.3498)
+        assert row[1] == pytest.approx(-121.93875)
+        assert row[2:5] == ['Trailheads (2)', 'darkgreen', 'users']
+        assert row[5] == {"trailheads": [["Trailhead 1", "123 Test St"], ["Trailhead 2", "456 Test Ave"]]}
     
     @patch('maps.download_map.folium')
     def test_create_enhanced_trailhead_markers_empty(self, mock_folium):
@@ -426,12 +456,12 @@ class TestTrailheadMarkers:
         # Should not add any markers
         mock_map.add_to.assert_not_called()
     
-    @patch('maps.download_map.folium')
-    def test_create_enhanced_trailhead_markers_single(self, mock_folium):
+    @patch('maps.download_map.FastMarkerCluster')
+    def test_create_enhanced_trailhead_markers_single(self, mock_fast_cluster):
         """Test enhanced trailhead markers with single trailhead"""
         mock_map = Mock()
         mock_cluster = Mock()
-        mock_folium.MarkerCluster.return_value = mock_cluster
+        mock_fast_cluster.return_value = mock_cluster
         
         data = {
             "type": "FeatureCollection",
@@ -453,7 +483,10 @@ class TestTrailheadMarkers:
         create_enhanced_trailhead_markers(data, mock_map)
         
         # Verify cluster was created and added to map
-        mock_folium.MarkerCluster.assert_called_once()
+        mock_fast_cluster.assert_called_once()
+        rows = mock_fast_cluster.call_args.kwargs["data"]
+        assert len(rows) == 1
+        assert rows[0][:3] == [37.3496, -121.9390, "Test Trailhead"]
         mock_cluster.add_to.assert_called_with(mock_map)
 
 
@@ -465,7 +498,7 @@ class TestIntegrationScenarios:
     @patch('maps.download_map.build_map')
     @patch('maps.download_map.parse_arguments')
     def test_main_function_success(self, mock_parse_args, mock_build_map, 
-                                 mock_fetch_trailheads, mock_fetch_osm):
+                                 mock_fetch_trailheads, mock_fetch_osm, tmp_path):
         """Test successful main function execution"""
         # Mock command line arguments
         mock_args = Mock()
@@ -487,8 +520,9 @@ class TestIntegrationScenarios:
         mock_map = Mock()
         mock_build_map.return_value = mock_map
         
-        # Mock map saving
-        with patch.object(mock_map, 'save') as mock_save:
+        # Mock map saving (render cache kept out of the working tree)
+        with patch.object(mock_map, 'save') as mock_save, \
+             patch('maps.download_map.MAP_CACHE_DIR', str(tmp_path / "mapcache")):
             main()
             
             # Verify data was fetched
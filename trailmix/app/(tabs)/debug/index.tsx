@@ -11,7 +11,7 @@ import {
 } from 'react-native';
 import AsyncStorage from '@react-native-async-storage/async-storage';
 import { auth } from '@/src/lib/firebase';
-import { getUserProfile, updateUserProfile, UserProfile, UserStatus } from '@/src/lib/userService';
+import { getUserProfile, updateUserProfile, markProfilesDirty, UserProfile, UserStatus } from '@/src/lib/userService';
 import { endpoints } from '@/src/constants/api';
 import { clearAllSavedMaps } from '@/src/lib/mapStorage';
 
@@ -158,6 +158,7 @@ export default function DebugScreen() {
       
       const userRef = doc(db, 'users', user.uid);
       await updateDoc(userRef, { status: newStatus });
+      await markProfilesDirty();
 
       Alert.alert('Success', `Status updated to ${newStatus}!`);
       await loadProfile(); // Reload profile
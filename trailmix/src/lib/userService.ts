@@ -50,6 +50,20 @@ export interface UserProfile {
   achievements?: string[];
 }
 
+/**
+ * Bump the profile change marker after a users write, so the backend
+ * matching index rebuilds on its next check. Best effort: never throws,
+ * since the users write itself already succeeded
+ */
+export const markProfilesDirty = async (): Promise<void> => {
+  try {
+    await setDoc(doc(db, 'meta', 'profiles_dirty_at'), { updated_at: serverTimestamp() });
+  } catch (error) {
+    // The backend index's max age still picks the write up
+    console.warn('Could not update profile change marker:', error);
+  }
+};
+
 /**
  * Create a new user profile in Firestore
  */
@@ -77,6 +91,7 @@ export const createUserProfile = async (
     };
 
     await setDoc(userRef, userProfile);
+    await markProfilesDirty();
     console.log('User profile created successfully:', user.uid);
   } catch (error) {
     console.error('Error creating user profile:', error);
@@ -120,6 +135,7 @@ export const updateLastLogin = async (uid: string): Promise<void> => {
         interests: [],
         profileDescription: ''
       });
+      await markProfilesDirty();
       console.log('User profile created during login for:', uid);
     }
   } catch (error) {
@@ -214,6 +230,7 @@ export const updateUserProfile = async (
     }
     
     await updateDoc(userRef, firestoreUpdates);
+    await markProfilesDirty();
     console.log('User profile updated for:', uid);
   } catch (error) {
     console.error('Error updating user profile:', error);